@@ -8,6 +8,9 @@ setup(
     packages = find_namespace_packages(
         include = ["vdeveloper_api.*"]
     ),
+    package_data = {
+        "vdeveloper_api.velkozz_benchmarks": ["fixtures/indeed/*.html"]
+    },
     install_requires = [
         "pandas", 
         "bonobo",
@@ -15,8 +18,13 @@ setup(
         "requests",
         "beautifulsoup4",
         "pytz",
-        "google-api-python-client"
+        "google-api-python-client>=2.0"
     ],
+    extras_require = {
+        "fast-parsing": ["lxml"],
+        "arrow": ["pyarrow>=14"],
+        "mirror": ["duckdb", "pyarrow>=14"]
+    },
     license = 'MIT',
     long_description=open('README.md').read()   
     )
\ No newline at end of file
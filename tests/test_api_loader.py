@@ -0,0 +1,95 @@
+from vdeveloper_api.velkozz_pipelines.utils import api_loader
+from vdeveloper_api.velkozz_pipelines.utils.api_loader import AsyncAPILoader
+
+class FakeResponse(object):
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+
+class FakeSession(object):
+    """A session that answers POST requests w/ a fixed sequence of responses or errors."""
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.payloads = []
+
+    def post(self, endpoint, json=None):
+        self.payloads.append(json)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        pass
+
+class FakeRateLimiter(object):
+    """A rate limiter that never blocks and records every rate it is set to."""
+    def __init__(self):
+        self.rates = []
+
+    def acquire(self, tokens=1):
+        return 0.0
+
+    def set_rate(self, rate, per=1.0):
+        self.rates.append(rate)
+
+def _loader(responses, monkeypatch, **kwargs):
+    """Builds a single worker loader w/ a fake session whose retry delays are recorded, not slept."""
+    logged = []
+    loader = AsyncAPILoader("token", max_workers=1, logger=logged.append, **kwargs)
+    loader.session = FakeSession(responses)
+    loader.rate_limiter = FakeRateLimiter()
+    loader.logged = logged
+    loader.sleeps = []
+    monkeypatch.setattr(api_loader.time, "sleep", loader.sleeps.append)
+
+    return loader
+
+def test_throttled_request_is_retried_after_retry_after(monkeypatch):
+    loader = _loader([FakeResponse(429, {"Retry-After": "3"}), FakeResponse(201)], monkeypatch, requests_per_second=4)
+    written = []
+
+    loader.submit("http://velkozz.test/api/", [{"id": 1}], on_success=written.append)
+
+    assert loader.close() == 1
+    assert loader.sleeps == [3.0] and len(written) == 1
+    # The 429 halves the rate and the sucessful retry raises it additively:
+    assert loader.rate_limiter.rates == [2.0, 3.0]
+
+def test_rate_stays_within_its_bounds(monkeypatch):
+    loader = _loader(
+        [FakeResponse(503), FakeResponse(503), FakeResponse(201)], monkeypatch,
+        requests_per_second=1, min_rate=0.5, max_rate=1.2)
+
+    loader.submit("http://velkozz.test/api/", [{"id": 1}])
+
+    assert loader.close() == 1
+    assert loader.rate_limiter.rates == [0.5, 0.5, 1.2]
+    # Without a Retry-After header the retries back off exponentially:
+    assert loader.sleeps == [1, 2]
+
+def test_payload_is_dropped_after_max_retries(monkeypatch):
+    loader = _loader([ConnectionError("refused"), FakeResponse(500)], monkeypatch, max_retries=1)
+
+    loader.submit("http://velkozz.test/api/", [{"id": 1}], on_success=lambda response: None)
+
+    assert loader.close() == 0
+    assert len(loader.session.payloads) == 2
+    assert "dropped" in loader.logged[-1]
+
+def test_rejected_payload_is_not_retried(monkeypatch):
+    loader = _loader([FakeResponse(400)], monkeypatch)
+
+    loader.submit("http://velkozz.test/api/", [{"id": 1}])
+
+    assert loader.close() == 0
+    assert loader.sleeps == [] and loader.rate_limiter.rates == []
+
+def test_failing_callback_is_logged_not_raised(monkeypatch):
+    loader = _loader([FakeResponse(201)], monkeypatch)
+
+    loader.submit("http://velkozz.test/api/", [{"id": 1}], on_success=lambda response: 1 / 0)
+
+    assert loader.close() == 1
+    assert "on_success callback" in loader.logged[-1]
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from vdeveloper_api.velkozz_pipelines.geography_pipelines import country_summary_pipelines
+from vdeveloper_api.velkozz_pipelines.geography_pipelines.country_summary_pipelines import CountrySummaryPipeline
+from vdeveloper_api.velkozz_pipelines.utils.state_store import JSONStateStore
+
+COUNTRIES = [
+    {"cca3": "CAN", "name": {"common": "Canada"}, "population": 38005238},
+    {"cca3": "FRA", "name": {"common": "France"}, "population": 67391582}]
+
+class FakeResponse(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+def _pipeline(country_hashes_path=None):
+    """Builds a pipeline w/o making requests or executing the bonobo graph."""
+    pipeline = CountrySummaryPipeline.__new__(CountrySummaryPipeline)
+    pipeline.logger = mock.Mock()
+    pipeline.token = "token"
+    pipeline.country_summary_endpoint = "http://velkozz.test/geography_api/countries/summary/"
+    pipeline.country_hashes = JSONStateStore(country_hashes_path) if country_hashes_path is not None else None
+
+    return pipeline
+
+def _run(pipeline, countries, monkeypatch, status_code=201):
+    """Runs the diff and load steps of the pipeline and returns the payloads that were posted."""
+    posted_payloads = []
+
+    def post(endpoint, headers=None, json=None):
+        posted_payloads.append(json)
+        return FakeResponse(status_code)
+
+    monkeypatch.setattr(country_summary_pipelines.requests, "post", post)
+    for changed_countries in pipeline.diff_country_data(countries):
+        pipeline.load_country_data(changed_countries)
+
+    return posted_payloads
+
+def test_every_country_is_written_wo_a_hash_store(monkeypatch):
+    pipeline = _pipeline()
+
+    assert _run(pipeline, COUNTRIES, monkeypatch) == [COUNTRIES]
+    assert _run(pipeline, COUNTRIES, monkeypatch) == [COUNTRIES]
+
+def test_only_changed_countries_are_written(tmp_path, monkeypatch):
+    country_hashes_path = str(tmp_path / "country_hashes.json")
+
+    assert _run(_pipeline(country_hashes_path), COUNTRIES, monkeypatch) == [COUNTRIES]
+
+    # The hashes outlive the pipeline so a later run makes no POST request if nothing changed:
+    assert _run(_pipeline(country_hashes_path), COUNTRIES, monkeypatch) == []
+
+    changed_countries = [COUNTRIES[0], dict(COUNTRIES[1], population=67400000)]
+    assert _run(_pipeline(country_hashes_path), changed_countries, monkeypatch) == [[changed_countries[1]]]
+
+def test_hashes_are_only_stored_after_a_sucessful_write(tmp_path, monkeypatch):
+    pipeline = _pipeline(str(tmp_path / "country_hashes.json"))
+
+    assert _run(pipeline, COUNTRIES, monkeypatch, status_code=500) == [COUNTRIES]
+    assert _run(pipeline, COUNTRIES, monkeypatch) == [COUNTRIES]
+
+def test_countries_w_string_names_are_keyed_by_name(tmp_path, monkeypatch):
+    countries = [{"name": "Canada", "population": 38005238}, {"name": "France", "population": 67391582}]
+    pipeline = _pipeline(str(tmp_path / "country_hashes.json"))
+
+    assert _run(pipeline, countries, monkeypatch) == [countries]
+    assert sorted(pipeline.country_hashes.get("country_summary_hashes")) == ["Canada", "France"]
+    assert _run(pipeline, countries, monkeypatch) == []
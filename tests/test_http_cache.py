@@ -0,0 +1,58 @@
+import pytest
+import requests
+
+from vdeveloper_api.velkozz_pipelines.utils.http_cache import HTTPCache
+
+class FakeSession(object):
+    """A session that serves a single resource w/ an ETag and records the request headers."""
+    def __init__(self, content=b"<html>v1</html>", etag='"v1"'):
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = "utf-8"
+        if (headers or {}).get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = self.etag
+            response._content = self.content
+
+        return response
+
+def test_cached_url_is_revalidated_w_etag(tmp_path):
+    session = FakeSession()
+    cache = HTTPCache(str(tmp_path), session=session)
+
+    first = cache.get("https://example.com/page")
+    second = cache.get("https://example.com/page")
+
+    assert not first.from_cache and first.content == b"<html>v1</html>"
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert second.not_modified and second.from_cache
+    assert second.content == b"<html>v1</html>" and second.status_code == 200
+
+def test_changed_resource_replaces_the_cached_body(tmp_path):
+    session = FakeSession()
+    cache = HTTPCache(str(tmp_path), session=session)
+    cache.get("https://example.com/page")
+
+    session.content, session.etag = b"<html>v2</html>", '"v2"'
+    response = cache.get("https://example.com/page")
+
+    assert not response.not_modified and response.content == b"<html>v2</html>"
+    assert cache.get("https://example.com/page").not_modified
+
+def test_offline_cache_serves_only_cached_urls(tmp_path):
+    HTTPCache(str(tmp_path), session=FakeSession()).get("https://example.com/page")
+    offline_cache = HTTPCache(str(tmp_path), offline=True, session=None)
+
+    assert offline_cache.get("https://example.com/page").content == b"<html>v1</html>"
+    with pytest.raises(LookupError):
+        offline_cache.get("https://example.com/other")
@@ -0,0 +1,93 @@
+import gzip
+import json
+
+import httplib2
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from vdeveloper_api.velkozz_pipelines.utils.http_cassette import HTTPCassette
+
+SECRETS = ["secret-api-token", "secret-access-token", "secret-refresh-token", "secret-session", "secret-api-key"]
+
+def _response(request, status_code, content, headers):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "OK"
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    response._content = content
+    response.url = request.url
+    response.request = request
+
+    return response
+
+@pytest.fixture
+def fake_transport(monkeypatch):
+    """Serves every request from a fixed set of responses instead of the network and records
+    the urls that reached the transport.
+    """
+    sent_urls = []
+
+    def send(adapter, request, **kwargs):
+        sent_urls.append(request.url)
+        if request.url.endswith("/api-token-auth/"):
+            return _response(request, 200, json.dumps({"token": "secret-api-token"}).encode("utf-8"), {
+                "Content-Type": "application/json", "Set-Cookie": "sessionid=secret-session"})
+        if request.url.endswith("/oauth/"):
+            body = {"access_token": "secret-access-token", "refresh_token": "secret-refresh-token", "expires_in": 3600}
+            return _response(request, 200, gzip.compress(json.dumps(body).encode("utf-8")), {"Content-Type": "application/json"})
+
+        return _response(request, 200, b"<html>Listings</html>", {"Content-Type": "text/html", "Authorization": "Token secret-api-token"})
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    monkeypatch.setattr(httplib2.Http, "request", lambda http, uri, method="GET", body=None, headers=None, *args, **kwargs: (
+        httplib2.Response({"status": "200", "etag": '"etag-1"', "set-cookie": "NID=secret-session"}), b'{"items": []}'))
+
+    return sent_urls
+
+def _run_requests():
+    auth_response = requests.post(
+        "http://velkozz.test/api-token-auth/", data={"username": "velkozz", "password": "velkozz"},
+        headers={"Cookie": "csrftoken=secret-session"})
+    oauth_response = requests.get("http://velkozz.test/oauth/", headers={"Authorization": "Token secret-api-token"})
+    listings_response = requests.get("http://velkozz.test/listings/?key=secret-api-key&page=2")
+    youtube_response = httplib2.Http().request("https://youtube.test/channels?key=secret-api-key&id=a")
+
+    return auth_response, oauth_response, listings_response, youtube_response
+
+def test_secrets_are_not_recorded(tmp_path, fake_transport):
+    cassette_path = str(tmp_path / "run.cassette.json.gz")
+
+    with HTTPCassette(cassette_path, mode="record"):
+        auth_response = _run_requests()[0]
+
+    # The pipeline sees the real response while recording:
+    assert auth_response.json() == {"token": "secret-api-token"}
+
+    with open(cassette_path, "rb") as cassette_file:
+        cassette = gzip.decompress(cassette_file.read()).decode("utf-8")
+    recorded_content = "".join(
+        requests.utils.unquote(json.dumps(interaction)) for interaction in json.loads(cassette)["interactions"])
+
+    for secret in SECRETS:
+        assert secret not in cassette and secret not in recorded_content
+    for header in ["Set-Cookie", "set-cookie", "Authorization"]:
+        assert header not in cassette
+
+def test_recorded_responses_are_replayed_offline(tmp_path, fake_transport):
+    cassette_path = str(tmp_path / "run.cassette.json.gz")
+    with HTTPCassette(cassette_path, mode="record"):
+        _run_requests()
+    del fake_transport[:]
+
+    with HTTPCassette(cassette_path, mode="replay"):
+        auth_response, oauth_response, listings_response, (youtube_response, youtube_content) = _run_requests()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get("http://velkozz.test/not-recorded/")
+
+    assert fake_transport == []
+    assert auth_response.json() == {"token": "REDACTED"}
+    assert oauth_response.json() == {"access_token": "REDACTED", "refresh_token": "REDACTED", "expires_in": 3600}
+    assert listings_response.text == "<html>Listings</html>" and b"".join(listings_response.iter_content(4)) == b"<html>Listings</html>"
+    assert youtube_response.status == 200 and youtube_response["etag"] == '"etag-1"' and youtube_content == b'{"items": []}'
@@ -0,0 +1,146 @@
+import itertools
+import threading
+import time
+from unittest import mock
+
+from vdeveloper_api.velkozz_benchmarks.indeed_parsing import load_fixtures
+from vdeveloper_api.velkozz_pipelines.social_media_pipelines.indeed_pipelines import IndeedJobListingsPipeline, parse_indeed_page
+
+def _indeed_page(listing_ids, next_href=None):
+    """Builds a minimal indeed search results page w/ a listing card for every id."""
+    cards = "".join(
+        f'<div class="jobsearch-SerpJobCard unifiedRow row result" id="{listing_id}">'
+        f'<h2 class="title"><a href="/rc/clk?jk={listing_id}">\nDeveloper\n</a></h2>'
+        f'<span class="company">\nVelkozz\n</span><span class="location">\nToronto, ON\n</span>'
+        f'<div class="summary"><ul><li>Build things.</li></ul></div><span class="date">Today</span></div>'
+        for listing_id in listing_ids)
+    next_link = f'<a href="{next_href}" aria-label="Next">Next</a>' if next_href is not None else ""
+
+    return f"<html><body><div id=\"resultsCol\">{cards}</div>{next_link}</body></html>"
+
+class FakeResponse(object):
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+class FakeSession(object):
+    """A session that serves indeed pages by url and records the requested urls."""
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+        self.fetched = {url: threading.Event() for url in pages}
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        self.fetched[url].set()
+        return FakeResponse(self.pages[url])
+
+FIRST_PAGE_URL = "https://ca.indeed.com/jobs?q=developer&l=Ontario"
+
+def _paginated_pages(num_pages):
+    pages = {}
+    for page_num in range(num_pages):
+        url = FIRST_PAGE_URL if page_num == 0 else f"{FIRST_PAGE_URL}&start={page_num * 10}"
+        next_href = f"/jobs?q=developer&l=Ontario&start={(page_num + 1) * 10}" if page_num + 1 < num_pages else None
+        pages[url] = _indeed_page([f"p{page_num}_a", f"p{page_num}_b"], next_href)
+
+    return pages
+
+def _pipeline(session, max_pages=10, search_queries=(("developer", "Ontario"),)):
+    """Builds a pipeline w/o making requests or executing the bonobo graph."""
+    pipeline = IndeedJobListingsPipeline.__new__(IndeedJobListingsPipeline)
+    pipeline.logger = mock.Mock()
+    pipeline.seen_index = None
+    pipeline.http_cache = None
+    pipeline.session = session
+    pipeline.base_indeed_url = "https://ca.indeed.com"
+    pipeline.max_pages = max_pages
+    pipeline.search_queries = list(search_queries)
+    pipeline.requests_per_minute = 60000
+    pipeline.host_rate_limiters = {}
+    pipeline.rate_limiter_lock = threading.Lock()
+    pipeline.max_workers = 4
+    pipeline.load_batch_size = 100
+    pipeline.page_queue_size = 8
+    pipeline.html_parser = "html.parser"
+    pipeline.use_strainer = True
+    pipeline.parse_executor = None
+
+    return pipeline
+
+def test_crawl_follows_next_links_up_to_max_pages():
+    session = FakeSession(_paginated_pages(5))
+    pipeline = _pipeline(session, max_pages=3)
+
+    pages = list(pipeline._crawl_indeed_query("developer", "Ontario"))
+
+    assert [[listing["id"] for listing in page] for page in pages] == [
+        ["p0_a", "p0_b"], ["p1_a", "p1_b"], ["p2_a", "p2_b"]]
+    assert session.requested == list(session.pages)[:3]
+
+def test_next_page_is_prefetched_while_the_current_page_is_parsed():
+    session = FakeSession(_paginated_pages(2))
+    pipeline = _pipeline(session)
+    second_page_url = list(session.pages)[1]
+    parse_page = pipeline._parse_indeed_page
+    prefetched_during_parse = []
+
+    def parse_and_wait_for_prefetch(page_html, indeed_url):
+        if indeed_url == FIRST_PAGE_URL:
+            prefetched_during_parse.append(session.fetched[second_page_url].wait(timeout=5))
+        return parse_page(page_html, indeed_url)
+
+    pipeline._parse_indeed_page = parse_and_wait_for_prefetch
+
+    assert len(list(pipeline._crawl_indeed_query("developer", "Ontario"))) == 2
+    assert prefetched_during_parse == [True]
+
+def test_queries_are_crawled_and_batched():
+    pages = _paginated_pages(1)
+    pages["https://ca.indeed.com/jobs?q=analyst&l=Ontario"] = _indeed_page(["q2_a"])
+    pipeline = _pipeline(FakeSession(pages), search_queries=[("developer", "Ontario"), ("analyst", "Ontario")])
+    pipeline.load_batch_size = 2
+
+    batches = list(pipeline.recursively_extract_and_transform_listings())
+
+    assert sorted(listing["id"] for batch in batches for listing in batch) == ["p0_a", "p0_b", "q2_a"]
+    assert all(len(batch) <= 3 for batch in batches)
+
+def test_strained_parse_matches_the_full_parse_on_saved_pages():
+    pages = load_fixtures()
+    assert len(pages) > 0
+
+    for page_html in pages:
+        jobs, next_page_href = parse_indeed_page(page_html, "html.parser", use_strainer=True)
+
+        assert (jobs, next_page_href) == parse_indeed_page(page_html, "html.parser", use_strainer=False)
+        assert len(jobs) == 15 and all(job["id"] and job["title"] for job in jobs)
+
+    # Only the last saved page has no link to a next page:
+    assert [parse_indeed_page(page_html)[1] is None for page_html in pages] == [False] * (len(pages) - 1) + [True]
+
+def test_page_queue_bounds_crawls_ahead_of_the_load_step():
+    produced_pages = []
+
+    def crawl_forever(job_type, search_area):
+        for page_num in itertools.count():
+            produced_pages.append(page_num)
+            yield [{"id": str(page_num)}]
+
+    pipeline = _pipeline(FakeSession({}))
+    pipeline._crawl_indeed_query = crawl_forever
+    pipeline.page_queue_size = 2
+    pipeline.load_batch_size = 1
+
+    batches = pipeline.recursively_extract_and_transform_listings()
+    assert next(batches) == [{"id": "0"}]
+    time.sleep(0.2)
+
+    # One page consumed, two queued and the crawl blocked on putting the next one:
+    assert len(produced_pages) <= 4
+
+    # Closing the generator early releases the blocked crawl so the pool shuts down:
+    closer = threading.Thread(target=batches.close)
+    closer.start()
+    closer.join(timeout=5)
+    assert not closer.is_alive()
@@ -0,0 +1,57 @@
+import pytest
+import requests
+
+from vdeveloper_api.velkozz_benchmarks.mock_api_server import MockVelkozzAPIServer
+
+@pytest.fixture
+def server():
+    with MockVelkozzAPIServer(num_records=25, page_size=10) as server:
+        yield server
+
+def _get(server, path, token=None, **params):
+    return requests.get(
+        f"{server.url}{path}",
+        headers={"Authorization": f"Token {token or server.token}"},
+        params=params, timeout=5)
+
+def test_token_auth_only_accepts_known_users(server):
+    assert requests.post(f"{server.url}/api-token-auth/", data={"username": "velkozz", "password": "velkozz"}, timeout=5).json() == {"token": server.token}
+    assert requests.post(f"{server.url}/api-token-auth/", data={"username": "velkozz", "password": "wrong"}, timeout=5).status_code == 400
+
+def test_requests_w_an_invalid_token_are_rejected(server):
+    assert _get(server, "/news_api/news_articles/", token="invalid").status_code == 401
+    assert _get(server, "/unknown_api/").status_code == 404
+
+def test_get_responses_are_paginated(server):
+    pages = [_get(server, "/social_media_api/reddit/top_posts/").json()]
+    while pages[-1]["next"] is not None:
+        pages.append(requests.get(pages[-1]["next"], headers={"Authorization": f"Token {server.token}"}, timeout=5).json())
+
+    assert [len(page["results"]) for page in pages] == [10, 10, 5]
+    assert [record["id"] for page in pages for record in page["results"]] == [
+        record["id"] for record in server.get_records("/social_media_api/reddit/top_posts")]
+    assert pages[0]["count"] == 25 and pages[0]["previous"] is None
+
+def test_page_size_and_fields_query_params(server):
+    page = _get(server, "/social_media_api/reddit/top_posts/", page_size=30, fields="id,title").json()
+
+    assert len(page["results"]) == 25 and page["next"] is None
+    assert set(page["results"][0]) == {"id", "title"}
+
+def test_records_are_served_from_the_detail_route(server):
+    record = server.get_records("/social_media_api/reddit/top_posts")[3]
+
+    assert _get(server, f"/social_media_api/reddit/top_posts/{record['id']}/").json() == record
+    assert _get(server, "/social_media_api/reddit/top_posts/missing/").status_code == 404
+
+def test_post_payloads_are_recorded(server):
+    response = requests.post(
+        f"{server.url}/geography_api/countries/summary/",
+        headers={"Authorization": f"Token {server.token}"},
+        json=[{"cca3": "CAN"}, {"cca3": "FRA"}], timeout=5)
+
+    assert response.status_code == 201 and response.json() == {"created": 2}
+    assert server.received["/geography_api/countries/summary"] == [[{"cca3": "CAN"}, {"cca3": "FRA"}]]
+
+    server.reset()
+    assert server.received == {} and server.request_counts == {}
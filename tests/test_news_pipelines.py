@@ -0,0 +1,223 @@
+import signal
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+import newspaper
+import pytest
+
+from vdeveloper_api.velkozz_pipelines.news_articles_pipelines.newspaper3k_pipelines import NewsArticlesPipeline, extract_article_features
+from vdeveloper_api.velkozz_pipelines.utils.seen_index import SeenIDIndex
+
+class FakeArticle(object):
+    """A newspaper Article stand-in that "parses" the html it is given as the article text."""
+    parse_seconds = 0
+
+    def __init__(self, url):
+        self.url = url
+
+    def download(self, input_html=None):
+        self.html = input_html
+
+    def parse(self):
+        time.sleep(self.parse_seconds)
+        self.title = f"Title of {self.url}"
+        self.authors = ["Author"]
+        self.publish_date = datetime(2021, 6, 1)
+        self.text = self.html
+        self.meta_keywords = []
+
+    def nlp(self):
+        self.keywords = ["keyword"]
+
+class SlowArticle(FakeArticle):
+    parse_seconds = 5
+
+class SourceArticle(object):
+    def __init__(self, url, html):
+        self.url = url
+        self.html = html
+
+class FakeSource(object):
+    def __init__(self, organization, articles):
+        self.organization = organization
+        self.articles = articles
+
+class FakeExecutor(object):
+    """A process pool stand-in that resolves the futures of the urls it was given results for."""
+    def __init__(self, results):
+        self.results = results
+
+    def submit(self, function, article_url, *args):
+        future = Future()
+        if article_url in self.results:
+            future.set_result(self.results[article_url])
+        return future
+
+def _pipeline(parse_executor=None):
+    """Builds a pipeline w/o reading a config file or executing the bonobo graph."""
+    pipeline = NewsArticlesPipeline.__new__(NewsArticlesPipeline)
+    pipeline.logger = mock.Mock()
+    pipeline.seen_index = None
+    pipeline.parse_executor = parse_executor
+    pipeline.article_timeout = 0.05
+    pipeline.revalidate_seconds = None
+    pipeline.article_hashes = {}
+
+    return pipeline
+
+def test_article_features_are_extracted(monkeypatch):
+    monkeypatch.setattr(newspaper, "Article", FakeArticle)
+
+    features = extract_article_features("https://news.test/a", "Article text", "News")
+
+    assert features["article_text"] == "Article text" and features["source"] == "News"
+    assert features["published_date"] == "2021-06-01"
+
+@pytest.mark.skipif(not hasattr(signal, "SIGALRM"), reason="The article timeout requires SIGALRM")
+def test_article_timeout_interrupts_parsing_in_the_main_thread(monkeypatch):
+    monkeypatch.setattr(newspaper, "Article", SlowArticle)
+
+    start = time.monotonic()
+    assert extract_article_features("https://news.test/a", "Article text", "News", timeout=1) is None
+    assert time.monotonic() - start < 3
+
+def test_timed_out_pool_articles_are_dropped():
+    parsed_article = {"article_url": "https://news.test/a", "title": "A", "article_text": "Text"}
+    pipeline = _pipeline(FakeExecutor({"https://news.test/a": parsed_article}))
+    source = FakeSource("News", [
+        SourceArticle("https://news.test/a", "<html>a</html>"),
+        SourceArticle("https://news.test/stuck", "<html>stuck</html>"),
+        SourceArticle("https://news.test/not-downloaded", None)])
+
+    assert next(pipeline.transform_news_sources(source)) == [parsed_article]
+
+def test_articles_are_parsed_serially_wo_a_pool(monkeypatch):
+    monkeypatch.setattr(newspaper, "Article", FakeArticle)
+    source = FakeSource("News", [SourceArticle("https://news.test/a", "Article text")])
+
+    articles = next(_pipeline().transform_news_sources(source))
+
+    assert [article["article_url"] for article in articles] == ["https://news.test/a"]
+
+class FakeConfig(object):
+    browser_user_agent = "velkozz-test"
+    request_timeout = 7
+
+class FakeNewspaperSource(object):
+    """A newspaper Source stand-in whose articles are set before it is built."""
+    articles = []
+
+    def __init__(self, url, memoize_articles=True):
+        self.url = url
+        self.config = FakeConfig()
+        self.articles = [SourceArticle(article.url, None) for article in FakeNewspaperSource.articles]
+        for article in self.articles:
+            article.download = lambda input_html=None, article=article: setattr(article, "html", input_html)
+
+class FakeResponse(object):
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+class FakeAPILoader(object):
+    """An async loader stand-in that writes every payload immediately."""
+    def submit(self, endpoint, payload, on_success=None):
+        on_success(FakeResponse(""))
+
+def test_seen_articles_are_not_downloaded(tmp_path, monkeypatch):
+    FakeNewspaperSource.articles = [SourceArticle("https://news.test/seen", None), SourceArticle("https://news.test/new", None)]
+    monkeypatch.setattr(newspaper, "Source", FakeNewspaperSource)
+
+    pipeline = _pipeline()
+    pipeline.seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    pipeline.seen_index.mark_seen("news_articles", ["https://news.test/seen"])
+    pipeline._NewsArticlesPipeline__build_source = lambda newspaper, download_executor: None
+    downloaded_urls = []
+    pipeline.http_get = lambda url, **kwargs: downloaded_urls.append(url) or FakeResponse(f"<html>{url}</html>")
+
+    with ThreadPoolExecutor(max_workers=2) as download_executor:
+        source = pipeline._NewsArticlesPipeline__create_source_obj({"News": "https://news.test"}, download_executor)
+
+    assert [article.url for article in source.articles] == ["https://news.test/new"]
+    assert downloaded_urls == ["https://news.test/new"] and source.articles[0].html
+
+def test_unchanged_revalidated_articles_are_dropped(tmp_path):
+    pipeline = _pipeline()
+    pipeline.seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    pipeline.api_loader = FakeAPILoader()
+    pipeline.velkozz_news_endpoint = "http://velkozz.test/news_api/news_articles/"
+    article = {"article_url": "https://news.test/a", "title": "A", "article_text": "Text"}
+
+    # The first load persists the content hash of the article:
+    pipeline.load_listings_to_api(pipeline._NewsArticlesPipeline__drop_unchanged_articles([article]))
+    assert pipeline.seen_index.get_values("news_article_hashes", ["https://news.test/a"])["https://news.test/a"] is not None
+
+    assert pipeline._NewsArticlesPipeline__drop_unchanged_articles([dict(article)]) == []
+    changed_article = dict(article, article_text="Updated text")
+    assert pipeline._NewsArticlesPipeline__drop_unchanged_articles([changed_article]) == [changed_article]
+
+class FakeSourcePage(object):
+    def __init__(self, url):
+        self.url = url
+
+class FakeUnbuiltSource(object):
+    """A newspaper Source stand-in that records the steps of its build."""
+    def __init__(self, url):
+        self.url = url
+        self.config = FakeConfig()
+
+    def parse(self):
+        self.parsed_html = self.html
+
+    def set_categories(self):
+        self.categories = [FakeSourcePage(f"{self.url}/world"), FakeSourcePage(f"{self.url}/missing")]
+
+    def parse_categories(self):
+        self.parsed_categories = [category.url for category in self.categories]
+
+    def set_feeds(self):
+        self.feeds = [FakeSourcePage(f"{self.url}/rss")]
+
+    def generate_articles(self):
+        self.articles = []
+
+def test_source_pages_are_downloaded_through_the_shared_pool():
+    pipeline = _pipeline()
+    requested_urls = []
+
+    def http_get(url, **kwargs):
+        requested_urls.append((url, kwargs["headers"]["User-Agent"], kwargs["timeout"]))
+        return FakeResponse(f"<html>{url}</html>", status_code=404 if url.endswith("/missing") else 200)
+
+    pipeline.http_get = http_get
+    source = FakeUnbuiltSource("https://news.test")
+
+    with ThreadPoolExecutor(max_workers=2) as download_executor:
+        pipeline._NewsArticlesPipeline__build_source(source, download_executor)
+
+    assert sorted(url for url, _, _ in requested_urls) == [
+        "https://news.test", "https://news.test/missing", "https://news.test/rss", "https://news.test/world"]
+    assert {(user_agent, timeout) for _, user_agent, timeout in requested_urls} == {("velkozz-test", 7)}
+    # Category pages that failed to download are dropped before they are parsed:
+    assert source.parsed_categories == ["https://news.test/world"]
+    assert [feed.rss for feed in source.feeds] == ["<html>https://news.test/rss</html>"]
+
+def test_sources_are_yielded_as_they_are_built():
+    pipeline = _pipeline()
+    pipeline.config_params = {"NewsSites": [{"Slow": "https://slow.test"}, {"Fast": "https://fast.test"}, {"Broken": "https://broken.test"}]}
+    pipeline.max_connections = 2
+    pipeline.source_build_workers = 3
+
+    def create_source(news_source_dict, download_executor):
+        source_name, source_url = list(news_source_dict.items())[0]
+        if source_name == "Broken":
+            raise ValueError("unreachable")
+        if source_name == "Slow":
+            time.sleep(0.2)
+        return FakeSource(source_name, [])
+
+    pipeline._NewsArticlesPipeline__create_source_obj = create_source
+
+    assert [source.organization for source in pipeline.extract_news_sources()] == ["Fast", "Slow"]
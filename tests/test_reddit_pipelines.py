@@ -0,0 +1,184 @@
+from unittest import mock
+
+import pytest
+
+from vdeveloper_api.velkozz_pipelines.social_media_pipelines import reddit_pipelines
+from vdeveloper_api.velkozz_pipelines.social_media_pipelines.reddit_pipelines import RedditContentPipeline
+from vdeveloper_api.velkozz_pipelines.utils.seen_index import SeenIDIndex
+from vdeveloper_api.velkozz_pipelines.utils.state_store import JSONStateStore
+
+class FakeRateLimiter(object):
+    """A rate limiter that never blocks and counts the tokens acquired."""
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self, tokens=1):
+        self.acquired += tokens
+        return 0.0
+
+class FakeAuthor(object):
+    def __init__(self, name):
+        self.name = name
+        self.is_gold = False
+        self.is_mod = False
+        self.has_verified_email = True
+        self.created_utc = 1500000000.0
+        self.comment_karma = 10
+
+class FakeSubreddit(object):
+    """A praw subreddit stand-in that serves a fixed daily top listing."""
+    def __init__(self, display_name, posts=(), error=None):
+        self.display_name = display_name
+        self.posts = list(posts)
+        self.error = error
+
+    def top(self, time_filter):
+        if self.error is not None:
+            raise self.error
+        return iter(self.posts)
+
+    def __str__(self):
+        return self.display_name
+
+class FakeStreamSubreddit(object):
+    """A praw multi-subreddit stand-in whose submission stream yields a fixed sequence."""
+    def __init__(self, stream_items):
+        self.stream = self
+        self.stream_items = stream_items
+
+    def submissions(self, pause_after=None):
+        return iter(self.stream_items)
+
+class FakePost(object):
+    def __init__(self, post_id, subreddit_name="learnpython", created_utc=1618430400.0):
+        self.id = post_id
+        self.title = f"Post {post_id}"
+        self.selftext = ""
+        self.upvote_ratio = 0.9
+        self.score = 1
+        self.num_comments = 0
+        self.created_utc = created_utc
+        self.stickied = False
+        self.over_18 = False
+        self.spoiler = False
+        self.permalink = f"/r/{subreddit_name}/{post_id}"
+        self.author = FakeAuthor("author")
+        self.subreddit = FakeSubreddit(subreddit_name)
+
+class FakeResponse(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+def _pipeline(subreddits, cursor_path=None):
+    """Builds a pipeline w/o connecting to reddit or executing the bonobo graph."""
+    pipeline = RedditContentPipeline.__new__(RedditContentPipeline)
+    pipeline.logger = mock.Mock()
+    pipeline.seen_index = None
+    pipeline.token = "token"
+    pipeline.query_con = mock.Mock(reddit_endpoint="http://velkozz.test/social_media_api/reddit")
+    pipeline.subreddits = subreddits
+    pipeline.subreddit = subreddits[0]
+    pipeline.max_workers = 4
+    pipeline.load_batch_size = 500
+    pipeline.reddit_rate_limiter = FakeRateLimiter()
+
+    pipeline.stream = cursor_path is not None
+    pipeline.stream_batch_size = 2
+    pipeline.stream_batch_seconds = 60
+    pipeline.stream_cursor = JSONStateStore(cursor_path) if cursor_path is not None else None
+    pipeline.stream_cursor_key = "+".join(sorted(subreddit.display_name for subreddit in subreddits))
+    pipeline.stream_cursor_frozen = False
+
+    return pipeline
+
+def test_multi_subreddit_listings_are_merged():
+    pipeline = _pipeline([
+        FakeSubreddit("learnpython", [FakePost("a"), FakePost("b")]),
+        FakeSubreddit("stocks", [FakePost("c", "stocks")]),
+        FakeSubreddit("private", error=RuntimeError("403"))])
+
+    posts_dict = next(pipeline.extract_daily_top_posts())
+
+    assert sorted(posts_dict) == ["a", "b", "c"]
+    assert posts_dict["c"]["subreddit"] == "stocks"
+    # Every listing request is counted against the shared budget, a failing subreddit is skipped:
+    assert pipeline.reddit_rate_limiter.acquired == 3
+
+def test_single_subreddit_posts_are_not_throttled():
+    pipeline = _pipeline([FakeSubreddit("learnpython")])
+    posts = {"a": pipeline._build_post_content_dict(FakePost("a"), "learnpython")}
+
+    unique_posts = next(pipeline.transform_posts(posts))
+
+    assert [post["id"] for post in unique_posts] == ["a"]
+    assert unique_posts[0]["author"] == "author"
+    assert pipeline.reddit_rate_limiter.acquired == 0
+
+def test_multi_subreddit_author_lookups_are_throttled():
+    pipeline = _pipeline([FakeSubreddit("learnpython"), FakeSubreddit("stocks")])
+    posts = {post_id: pipeline._build_post_content_dict(FakePost(post_id), "learnpython") for post_id in ["a", "b", "c"]}
+
+    unique_posts = next(pipeline.transform_posts(posts))
+
+    assert sorted(post["id"] for post in unique_posts) == ["a", "b", "c"]
+    assert pipeline.reddit_rate_limiter.acquired == 3
+
+def test_pipeline_requires_a_subreddit():
+    with pytest.raises(ValueError):
+        RedditContentPipeline([], LOGGER_HOST="localhost", LOGGER_URL="/log", VELKOZZ_API_URL="http://localhost:8000")
+
+def test_stream_skips_posts_behind_the_cursor(tmp_path):
+    pipeline = _pipeline([FakeSubreddit("learnpython")], str(tmp_path / "cursor.json"))
+    pipeline.stream_cursor.set("learnpython", {"created_utc": 100.0, "ids": ["b"]})
+    pipeline.reddit = mock.Mock()
+    pipeline.reddit.subreddit.return_value = FakeStreamSubreddit([
+        FakePost("a", created_utc=99.0), FakePost("b", created_utc=100.0), None,
+        FakePost("c", created_utc=100.0), FakePost("d", created_utc=101.0), FakePost("e", created_utc=102.0)])
+
+    # The trailing post waits for its micro-batch to fill or its window to expire:
+    assert [sorted(batch) for batch in pipeline.stream_submissions()] == [["c", "d"]]
+
+def test_loaded_micro_batches_advance_the_cursor(tmp_path, monkeypatch):
+    pipeline = _pipeline([FakeSubreddit("learnpython")], str(tmp_path / "cursor.json"))
+    monkeypatch.setattr(reddit_pipelines.requests, "post", lambda *args, **kwargs: FakeResponse(201))
+
+    pipeline.load_posts([
+        {"id": "a", "created_on": pipeline._format_datetime(100.0)},
+        {"id": "b", "created_on": pipeline._format_datetime(100.0)}])
+
+    assert pipeline.stream_cursor.get("learnpython") == {"created_utc": 100.0, "ids": ["a", "b"]}
+    assert JSONStateStore(str(tmp_path / "cursor.json")).get("learnpython")["ids"] == ["a", "b"]
+
+def test_failed_micro_batch_freezes_the_cursor(tmp_path, monkeypatch):
+    pipeline = _pipeline([FakeSubreddit("learnpython")], str(tmp_path / "cursor.json"))
+    status_codes = iter([500, 201])
+    monkeypatch.setattr(reddit_pipelines.requests, "post", lambda *args, **kwargs: FakeResponse(next(status_codes)))
+
+    pipeline.load_posts([{"id": "a", "created_on": pipeline._format_datetime(100.0)}])
+    pipeline.load_posts([{"id": "b", "created_on": pipeline._format_datetime(200.0)}])
+
+    # The cursor must not move past the failed post, even once a later micro-batch loads:
+    assert pipeline.stream_cursor_frozen
+    assert pipeline.stream_cursor.get("learnpython") is None
+
+def test_seen_posts_are_dropped_before_author_lookups(tmp_path):
+    pipeline = _pipeline([FakeSubreddit("learnpython"), FakeSubreddit("stocks")])
+    pipeline.seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    pipeline.seen_index.mark_seen("reddit_posts", ["a"])
+    posts = {post_id: pipeline._build_post_content_dict(FakePost(post_id), "learnpython") for post_id in ["a", "b"]}
+
+    unique_posts = next(pipeline.transform_posts(posts))
+
+    assert [post["id"] for post in unique_posts] == ["b"]
+    assert pipeline.reddit_rate_limiter.acquired == 1
+
+def test_only_loaded_posts_are_marked_seen(tmp_path, monkeypatch):
+    pipeline = _pipeline([FakeSubreddit("learnpython")])
+    pipeline.seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    pipeline.load_batch_size = 1
+    status_codes = iter([201, 500])
+    monkeypatch.setattr(reddit_pipelines.requests, "post", lambda *args, **kwargs: FakeResponse(next(status_codes)))
+
+    pipeline.load_posts([{"id": "a"}, {"id": "b"}])
+
+    assert pipeline.seen_index.filter_unseen("reddit_posts", ["a", "b"]) == ["b"]
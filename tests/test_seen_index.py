@@ -0,0 +1,45 @@
+import time
+
+from vdeveloper_api.velkozz_pipelines.utils.seen_index import SeenIDIndex
+
+def test_marked_keys_are_filtered_in_order(tmp_path):
+    seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    seen_index.mark_seen("reddit_posts", ["b", "d"])
+
+    assert seen_index.filter_unseen("reddit_posts", ["a", "b", "c", "d"]) == ["a", "c"]
+
+def test_namespaces_are_independent(tmp_path):
+    seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    seen_index.mark_seen("reddit_posts", ["1"])
+
+    assert seen_index.filter_unseen("news_articles", ["1"]) == ["1"]
+    assert seen_index.filter_unseen("reddit_posts", ["1"]) == []
+
+def test_keys_expire_after_ttl(tmp_path, monkeypatch):
+    seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"), ttl=60)
+    seen_index.mark_seen("reddit_posts", ["old"])
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    seen_index.mark_seen("reddit_posts", ["new"])
+
+    assert seen_index.filter_unseen("reddit_posts", ["old", "new"]) == ["old"]
+    assert seen_index.prune() == 1
+
+def test_max_age_narrows_the_ttl(tmp_path, monkeypatch):
+    seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"), ttl=None)
+    seen_index.mark_seen("news_articles", ["url"])
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+
+    assert seen_index.filter_unseen("news_articles", ["url"]) == []
+    assert seen_index.filter_unseen("news_articles", ["url"], max_age=5) == ["url"]
+
+def test_values_are_stored_and_persisted(tmp_path):
+    path = str(tmp_path / "seen.sqlite")
+    seen_index = SeenIDIndex(path)
+    seen_index.mark_seen("news_articles", {"https://example.com/a": "hash1", "https://example.com/b": "hash2"})
+    seen_index.close()
+
+    assert SeenIDIndex(path).get_values("news_articles", ["https://example.com/a", "https://example.com/c"]) == {"https://example.com/a": "hash1"}
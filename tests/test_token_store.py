@@ -0,0 +1,53 @@
+import os
+import stat
+import threading
+
+from vdeveloper_api.velkozz_pywrapper.query_api.token_store import TokenStore
+
+def test_persisted_tokens_are_owner_only(tmp_path):
+    path = tmp_path / "tokens" / "tokens.json"
+    TokenStore(str(path)).set("http://localhost:8000/", "user", "token1")
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert TokenStore(str(path)).get("http://localhost:8000", "user") == "token1"
+
+def test_concurrent_callers_share_a_single_fetch():
+    token_store = TokenStore()
+    fetches = []
+    barrier = threading.Barrier(8)
+
+    def fetch_token():
+        fetches.append(1)
+        return "token1"
+
+    def get_token(results):
+        barrier.wait()
+        results.append(token_store.get_or_fetch("http://localhost:8000", "user", fetch_token))
+
+    results = []
+    threads = [threading.Thread(target=get_token, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["token1"] * 8 and len(fetches) == 1
+
+def test_refresh_only_replaces_the_stale_token():
+    token_store = TokenStore()
+    token_store.set("http://localhost:8000", "user", "stale")
+    new_tokens = iter(["fresh", "unexpected"])
+
+    assert token_store.refresh("http://localhost:8000", "user", "stale", lambda: next(new_tokens)) == "fresh"
+    # A second caller that saw the same stale token reuses the refreshed token:
+    assert token_store.refresh("http://localhost:8000", "user", "stale", lambda: next(new_tokens)) == "fresh"
+
+def test_invalidate_keeps_an_already_refreshed_token():
+    token_store = TokenStore()
+    token_store.set("http://localhost:8000", "user", "fresh")
+
+    token_store.invalidate("http://localhost:8000", "user", token="stale")
+    assert token_store.get("http://localhost:8000", "user") == "fresh"
+
+    token_store.invalidate("http://localhost:8000", "user")
+    assert token_store.get("http://localhost:8000", "user") is None
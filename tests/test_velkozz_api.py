@@ -0,0 +1,78 @@
+import pytest
+
+from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI, _project_records, _with_index_column
+
+class FakeResponse(object):
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+def _page(results, next_url=None):
+    return {"count": None, "next": next_url, "previous": None, "results": results}
+
+@pytest.fixture
+def api():
+    return VelkozzAPI(url="http://velkozz.test", token="token")
+
+def test_flat_array_is_a_single_page(api):
+    assert list(api._iter_pages(FakeResponse([{"id": 1}, {"id": 2}]))) == [[{"id": 1}, {"id": 2}]]
+
+def test_next_links_are_followed(api, monkeypatch):
+    pages = {
+        "http://velkozz.test/posts/?page=2": FakeResponse(_page([{"id": 2}], "http://velkozz.test/posts/?page=3")),
+        "http://velkozz.test/posts/?page=3": FakeResponse(_page([{"id": 3}]))}
+    requested = []
+
+    def get(endpoint, params=None, columns=None):
+        requested.append(endpoint)
+        return pages[endpoint]
+
+    monkeypatch.setattr(api, "_get", get)
+    first_page = FakeResponse(_page([{"id": 1}], "http://velkozz.test/posts/?page=2"))
+
+    assert list(api._iter_pages(first_page)) == [[{"id": 1}], [{"id": 2}], [{"id": 3}]]
+    assert requested == list(pages)
+    assert api._get_records(FakeResponse(_page([{"id": 1}], "http://velkozz.test/posts/?page=2"))) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+def test_failed_page_raises(api, monkeypatch):
+    monkeypatch.setattr(api, "_get", lambda endpoint, params=None, columns=None: FakeResponse({}, status_code=500))
+
+    with pytest.raises(ValueError):
+        list(api._iter_pages(FakeResponse(_page([{"id": 1}], "http://velkozz.test/posts/?page=2"))))
+
+def test_pages_are_projected_to_the_requested_columns(api):
+    records = [{"id": 1, "title": "a", "content": "long"}, {"id": 2, "title": "b"}]
+
+    assert list(api._iter_pages(FakeResponse(_page(records)), ["id", "content"])) == [[{"id": 1, "content": "long"}, {"id": 2}]]
+
+def test_project_records():
+    records = [{"id": 1, "title": "a", "content": "long"}]
+
+    assert _project_records(records, None) is records
+    assert _project_records(records, ["title", "missing"]) == [{"title": "a"}]
+
+def test_with_index_column():
+    assert _with_index_column(None, "id") is None
+    assert _with_index_column(["title"], "id") == ["id", "title"]
+    assert _with_index_column(["title", "id"], "id") == ["title", "id"]
+
+def test_wsb_ticker_counts_sends_the_date_params(api, monkeypatch):
+    requested = []
+
+    def get(endpoint, params=None, columns=None):
+        requested.append(params)
+        return FakeResponse([{"day": "2021-03-24", "ticker_count": "{'GME': 31}"}])
+
+    monkeypatch.setattr(api, "_get", get)
+    api.get_wsb_ticker_counts(start_date="2021-03-23", end_date="2021-03-25")
+
+    assert requested == [{"Start-Date": "2021-03-23", "End-Date": "2021-03-25"}]
+
+def test_empty_records_build_an_empty_indexed_frame(api):
+    records_df = api._build_frame([], index_column="id")
+
+    assert records_df.empty
+    assert records_df.index.name == "id"
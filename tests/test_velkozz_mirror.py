@@ -0,0 +1,100 @@
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from vdeveloper_api.velkozz_pywrapper.api_utils.arrow_utils import records_to_arrow_table
+from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_mirror import VelkozzMirror
+
+class FakeVelkozzAPI(object):
+    """A stand-in query API that serves the records set on it and records the query kwargs."""
+    def __init__(self):
+        self.listings = []
+        self.index_comps = {}
+        self.calls = []
+
+    def get_indeed_job_listings(self, output_format=None, **kwargs):
+        self.calls.append(kwargs)
+        return records_to_arrow_table(self.listings)
+
+    def get_index_comp_data(self, market_index, output_format=None, **kwargs):
+        return records_to_arrow_table(self.index_comps[market_index])
+
+    def get_wsb_ticker_counts(self, output_format=None, **kwargs):
+        # A failed request returns None instead of a table:
+        return None
+
+    def get_news_articles(self, output_format=None, **kwargs):
+        return "Error w/ Constructing Dataframe with Error: 500"
+
+def _listing(listing_id, date_posted, title="Developer"):
+    return {"id": listing_id, "url": f"/listings/{listing_id}", "title": title, "company": "Velkozz", "date_posted": date_posted}
+
+@pytest.fixture
+def mirror(tmp_path):
+    api = FakeVelkozzAPI()
+    with VelkozzMirror(str(tmp_path / "mirror.duckdb"), api=api) as mirror:
+        yield mirror
+
+def test_sync_records_the_watermark(mirror):
+    mirror.api.listings = [_listing("a", "2021-06-01"), _listing("b", "2021-06-03")]
+
+    assert mirror.sync(["indeed_listings"]) == {"indeed_listings": {"": 2}}
+    assert mirror.get_watermark("indeed_listings") == "2021-06-03"
+    assert mirror.api.calls[0] == {}
+
+def test_incremental_sync_upserts_from_the_watermark(mirror):
+    mirror.api.listings = [_listing("a", "2021-06-01"), _listing("b", "2021-06-03")]
+    mirror.sync(["indeed_listings"])
+
+    # The watermark day is queried again, updated records replace the mirrored ones:
+    mirror.api.listings = [_listing("b", "2021-06-03", title="Senior Developer"), _listing("c", "2021-06-04")]
+    mirror.sync(["indeed_listings"])
+
+    assert mirror.api.calls[1] == {"start_date": "2021-06-03"}
+    assert mirror.get_watermark("indeed_listings") == "2021-06-04"
+
+    listings_df = mirror.query("SELECT id, title FROM indeed_listings ORDER BY id")
+    assert listings_df["id"].tolist() == ["a", "b", "c"]
+    assert listings_df["title"].tolist() == ["Developer", "Senior Developer", "Developer"]
+
+def test_empty_sync_keeps_the_watermark(mirror):
+    mirror.api.listings = [_listing("a", "2021-06-01")]
+    mirror.sync(["indeed_listings"])
+
+    mirror.api.listings = []
+    assert mirror.sync(["indeed_listings"]) == {"indeed_listings": {"": 0}}
+    assert mirror.get_watermark("indeed_listings") == "2021-06-01"
+
+def test_full_refresh_ignores_the_watermark(mirror):
+    mirror.api.listings = [_listing("a", "2021-06-01")]
+    mirror.sync(["indeed_listings"])
+    mirror.sync(["indeed_listings"], full_refresh=True)
+
+    assert mirror.api.calls[1] == {}
+    assert mirror.query("SELECT count(*) AS n FROM indeed_listings")["n"][0] == 1
+
+def test_undated_partitions_are_replaced(mirror):
+    mirror.api.index_comps = {
+        "spy": [{"symbol": "AAPL", "security_name": "Apple"}, {"symbol": "MSFT", "security_name": "Microsoft"}],
+        "djia": [{"symbol": "AAPL", "security_name": "Apple"}]}
+    mirror.sync(["index_composition"], partitions={"index_composition": ["spy", "djia"]})
+
+    mirror.api.index_comps["spy"] = [{"symbol": "NVDA", "security_name": "Nvidia"}]
+    mirror.sync(["index_composition"], partitions={"index_composition": ["spy"]})
+
+    comps_df = mirror.query("SELECT market_index, symbol FROM index_composition ORDER BY market_index, symbol")
+    assert list(zip(comps_df["market_index"], comps_df["symbol"])) == [("djia", "AAPL"), ("spy", "NVDA")]
+    assert mirror.get_watermark("index_composition", "spy") is None
+
+def test_partitioned_dataset_requires_partitions(mirror):
+    with pytest.raises(ValueError):
+        mirror.sync(["reddit_posts"])
+
+def test_failed_queries_raise_and_keep_the_watermark(mirror):
+    with pytest.raises(ValueError, match="returned None"):
+        mirror.sync(["wsb_ticker_mentions"])
+    with pytest.raises(ValueError, match="Error w/ Constructing Dataframe"):
+        mirror.sync(["news_articles"])
+
+    assert mirror.get_watermark("wsb_ticker_mentions") is None
@@ -0,0 +1,169 @@
+import os
+import shutil
+from unittest import mock
+
+import googleapiclient
+import httplib2
+from googleapiclient.errors import HttpError
+
+from vdeveloper_api.velkozz_pipelines.social_media_pipelines import youtube_pipelines
+from vdeveloper_api.velkozz_pipelines.social_media_pipelines.youtube_pipelines import DailyYoutubeChannelStatsPipeline, get_youtube_client
+from vdeveloper_api.velkozz_pipelines.utils.quota import QuotaAccountant
+from vdeveloper_api.velkozz_pipelines.utils.seen_index import SeenIDIndex
+
+def _channel_item(channel_id):
+    return {"id": channel_id, "statistics": {"viewCount": "10", "subscriberCount": "2", "videoCount": "1"}}
+
+def _pipeline(channel_id, channel_priority=None, quota_budget=None):
+    """Builds a pipeline w/o building a youtube client or executing the bonobo graph."""
+    pipeline = DailyYoutubeChannelStatsPipeline.__new__(DailyYoutubeChannelStatsPipeline)
+    pipeline.logger = mock.Mock()
+    pipeline.seen_index = None
+    pipeline.channel_id = channel_id
+    pipeline.channel_name = None
+    pipeline.max_workers = 4
+    pipeline.channel_priority = channel_priority or {}
+    pipeline.quota = QuotaAccountant(quota_budget)
+    pipeline.quota_cost = 1
+    pipeline.not_modified_cost = 0
+
+    return pipeline
+
+def _record_requests(pipeline):
+    """Replaces the channels().list call w/ one that records the requested chunks."""
+    requested_chunks = []
+
+    def request_channel_stats(channel_ids):
+        requested_chunks.append(list(channel_ids))
+        return {"items": [_channel_item(channel_id) for channel_id in channel_ids]}
+
+    pipeline._request_channel_stats = request_channel_stats
+
+    return requested_chunks
+
+def test_channel_ids_are_requested_in_chunks_of_fifty():
+    channel_ids = [f"channel_{i:03d}" for i in range(120)]
+    pipeline = _pipeline(channel_ids)
+    requested_chunks = _record_requests(pipeline)
+
+    channel_items = next(pipeline.extract_channel_stats())
+
+    assert sorted(len(chunk) for chunk in requested_chunks) == [20, 50, 50]
+    assert sorted(item["id"] for item in channel_items) == channel_ids
+    assert pipeline.quota.spent == 3
+
+def test_single_channel_id_is_requested_on_its_own():
+    pipeline = _pipeline("UCmEu9Y8nodUV0jvsR9NYLJA")
+    requested_chunks = _record_requests(pipeline)
+
+    assert [item["id"] for item in next(pipeline.extract_channel_stats())] == ["UCmEu9Y8nodUV0jvsR9NYLJA"]
+    assert requested_chunks == [["UCmEu9Y8nodUV0jvsR9NYLJA"]]
+
+def test_failed_chunks_are_skipped():
+    pipeline = _pipeline([f"channel_{i:03d}" for i in range(60)])
+    pipeline._request_channel_stats = lambda channel_ids: None if "channel_000" in channel_ids else {
+        "items": [_channel_item(channel_id) for channel_id in channel_ids]}
+
+    assert len(next(pipeline.extract_channel_stats())) == 10
+
+def test_every_channel_gets_its_own_payload_row():
+    pipeline = _pipeline(["a", "b"])
+    pipeline.channel_name = {"a": "Channel A"}
+
+    payload = next(pipeline.transform_channel_stats([_channel_item("a"), _channel_item("b")]))
+
+    assert [(row["channel_id"], row["channel_name"]) for row in payload] == [("a", "Channel A"), ("b", None)]
+    assert payload[0]["viewCount"] == "10"
+
+def _refuse_network(*args, **kwargs):
+    raise AssertionError("The youtube client must be built w/o network requests")
+
+def test_youtube_client_is_built_once_per_key_wo_network(monkeypatch):
+    monkeypatch.setattr(youtube_pipelines, "_youtube_clients", {})
+    monkeypatch.setattr(httplib2.Http, "request", _refuse_network)
+
+    youtube_client = get_youtube_client("test api key")
+
+    assert get_youtube_client("test api key") is youtube_client
+    assert get_youtube_client("other api key") is not youtube_client
+    assert hasattr(youtube_client, "channels")
+
+def test_youtube_client_is_built_from_a_saved_discovery_document(tmp_path, monkeypatch):
+    monkeypatch.setattr(youtube_pipelines, "_youtube_clients", {})
+    monkeypatch.setattr(httplib2.Http, "request", _refuse_network)
+    discovery_document_path = str(tmp_path / "youtube.v3.json")
+    shutil.copy(
+        os.path.join(os.path.dirname(googleapiclient.__file__), "discovery_cache", "documents", "youtube.v3.json"),
+        discovery_document_path)
+
+    youtube_client = get_youtube_client("test api key", discovery_document_path)
+
+    assert get_youtube_client("test api key", discovery_document_path) is youtube_client
+    assert get_youtube_client("test api key") is not youtube_client
+    request = youtube_client.channels().list(part="statistics", id="a,b", maxResults=2)
+    assert "key=test+api+key" in request.uri and "id=a%2Cb" in request.uri
+
+def test_channels_are_requested_in_priority_order_within_the_quota_budget():
+    channel_ids = [f"channel_{i:03d}" for i in range(120)]
+    pipeline = _pipeline(channel_ids, channel_priority={"channel_119": 10, "channel_118": 5}, quota_budget=2)
+    pipeline.max_workers = 1
+    requested_chunks = _record_requests(pipeline)
+
+    channel_items = next(pipeline.extract_channel_stats())
+
+    assert requested_chunks[0][:3] == ["channel_119", "channel_118", "channel_000"]
+    assert len(requested_chunks) == 2 and len(channel_items) == 100
+    assert pipeline.quota.spent == 2
+    # The lowest priority chunk that did not fit the budget is deferred to the next run:
+    assert "Deferred 20 channels" in pipeline.logger.warning.call_args[0][0]
+
+class FakeChannelsRequest(object):
+    """A channels().list request stand-in that answers 304 if its If-None-Match header matches."""
+    def __init__(self, api, channel_ids):
+        self.api = api
+        self.channel_ids = channel_ids
+        self.headers = {}
+        self.postproc = lambda resp, content: content
+
+    def execute(self, http=None):
+        self.api.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.api.etag:
+            raise HttpError(httplib2.Response({"status": 304}), b"")
+
+        return self.postproc({"etag": self.api.etag}, {"items": [self.api.channel_items[channel_id] for channel_id in self.channel_ids]})
+
+class FakeYoutubeAPI(object):
+    def __init__(self, channel_items, etag):
+        self.channel_items = channel_items
+        self.etag = etag
+        self.requests = []
+
+    def channels(self):
+        return self
+
+    def list(self, part, id, maxResults):
+        return FakeChannelsRequest(self, id.split(","))
+
+def test_unmodified_channels_are_served_from_the_seen_index(tmp_path):
+    pipeline = _pipeline(["a", "b"], quota_budget=10)
+    pipeline.seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    pipeline.youtube_api_obj = FakeYoutubeAPI({"a": _channel_item("a"), "b": _channel_item("b")}, '"etag-1"')
+
+    assert pipeline.quota.reserve(1) and pipeline._request_channel_stats(["a", "b"])["items"][0]["id"] == "a"
+    assert pipeline.quota.reserve(1) and pipeline._request_channel_stats(["a", "b"]) == {"items": [_channel_item("a"), _channel_item("b")]}
+
+    assert pipeline.youtube_api_obj.requests == [{}, {"If-None-Match": '"etag-1"'}]
+    # The units reserved for the 304 response are refunded:
+    assert pipeline.quota.spent == 1
+
+def test_modified_channels_are_downloaded_again(tmp_path):
+    pipeline = _pipeline(["a"])
+    pipeline.seen_index = SeenIDIndex(str(tmp_path / "seen.sqlite"))
+    pipeline.youtube_api_obj = FakeYoutubeAPI({"a": _channel_item("a")}, '"etag-1"')
+    pipeline._request_channel_stats(["a"])
+
+    pipeline.youtube_api_obj.etag = '"etag-2"'
+    pipeline.youtube_api_obj.channel_items["a"] = dict(_channel_item("a"), statistics={"viewCount": "11"})
+
+    assert pipeline._request_channel_stats(["a"])["items"][0]["statistics"] == {"viewCount": "11"}
+    assert pipeline.seen_index.get_values("youtube_etags", ["a"]) == {"a": '"etag-2"'}
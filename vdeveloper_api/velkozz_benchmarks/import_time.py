@@ -0,0 +1,124 @@
+# Importing native packages:
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# The modules whose import time is guarded by the benchmark:
+DEFAULT_MODULES = [
+    "vdeveloper_api.velkozz_pipelines.core_objects",
+    "vdeveloper_api.velkozz_pipelines.social_media_pipelines.reddit_pipelines",
+    "vdeveloper_api.velkozz_pipelines.social_media_pipelines.indeed_pipelines",
+    "vdeveloper_api.velkozz_pipelines.social_media_pipelines.youtube_pipelines",
+    "vdeveloper_api.velkozz_pipelines.news_articles_pipelines.newspaper3k_pipelines",
+    "vdeveloper_api.velkozz_pipelines.geography_pipelines.country_summary_pipelines",
+    "vdeveloper_api.velkozz_pipelines.structured_quant_data_pipelines.reddit_quant_pipeline",
+    "vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api"]
+
+def parse_importtime(stderr):
+    """Function parses the output of the python -X importtime flag.
+
+    Each line of the output has the form "import time: <self us> | <cumulative us> | <name>"
+    where the name is indented by two spaces for every level of nesting.
+
+    Args:
+        stderr (str): The stderr of a python process run w/ -X importtime.
+
+    Returns:
+        list: A list of (name, depth, self us, cumulative us) tuples in the order they were printed.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    return imports
+
+def measure_import_time(module_name, repeat=5, top=5):
+    """Function measures the time it takes to import a module in a fresh interpreter.
+
+    Args:
+        module_name (str): The dotted name of the module to import.
+
+        repeat (int, optional): The number of fresh interpreters the import is timed in. The
+            fastest import is reported.
+
+        top (int, optional): The number of heaviest external imports that are reported.
+
+    Returns:
+        dict: The cumulative import time of the module in ms and its heaviest external imports.
+    """
+    best_imports = None
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+            capture_output=True, text=True, env=os.environ.copy())
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Importing {module_name} failed:\n{process.stderr.splitlines()[-1]}")
+
+        imports = parse_importtime(process.stderr)
+        if best_imports is None or sum(i[2] for i in imports) < sum(i[2] for i in best_imports):
+            best_imports = imports
+
+    module_us = next(cumulative_us for name, _, _, cumulative_us in best_imports if name == module_name)
+
+    # The heaviest imports are the external modules imported directly by a vdeveloper_api module:
+    direct_imports = []
+    for i, (name, depth, _, cumulative_us) in enumerate(best_imports):
+        parent = next((imp[0] for imp in best_imports[i + 1:] if imp[1] < depth), None)
+        if parent is not None and parent.startswith("vdeveloper_api") and not name.startswith("vdeveloper_api"):
+            direct_imports.append((name, cumulative_us / 1000))
+
+    return {
+        "ms": module_us / 1000,
+        "heaviest": sorted(direct_imports, key=lambda imp: imp[1], reverse=True)[:top]}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the import time of the velkozz pipeline modules.")
+    arg_parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to time. Defaults to every pipeline module.")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--baseline", default=None, help="JSON file of {module: ms} to compare against.")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write the measured times to --baseline and exit.")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown vs the baseline before failing.")
+    args = arg_parser.parse_args()
+
+    if args.save_baseline and args.baseline is None:
+        arg_parser.error("--save-baseline requires --baseline")
+
+    results = {module_name: measure_import_time(module_name, args.repeat) for module_name in args.modules}
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump({module_name: result["ms"] for module_name, result in results.items()}, baseline_file, indent=4)
+        return
+
+    baseline = {}
+    if args.baseline is not None:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    regressions = []
+    for module_name, result in results.items():
+        heaviest = ", ".join(f"{name} {ms:.1f}ms" for name, ms in result["heaviest"])
+        comparison = ""
+
+        if module_name in baseline:
+            ratio = result["ms"] / baseline[module_name] if baseline[module_name] else float("inf")
+            comparison = f" baseline={baseline[module_name]:.1f}ms ({ratio:.2f}x)"
+            if ratio > 1 + args.tolerance:
+                regressions.append(module_name)
+
+        print(f"{module_name}: {result['ms']:.1f}ms{comparison}\n    heaviest: {heaviest}")
+
+    if regressions:
+        print(f"Import time regressed beyond {args.tolerance:.0%} for: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
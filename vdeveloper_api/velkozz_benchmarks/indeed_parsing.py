@@ -0,0 +1,147 @@
+# Importing native packages:
+import argparse
+import glob
+import importlib.util
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Importing the indeed page parsing function being benchmarked:
+from vdeveloper_api.velkozz_pipelines.social_media_pipelines.indeed_pipelines import parse_indeed_page
+
+# Saved and anonymised indeed search results pages used as the default benchmark input:
+INDEED_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "indeed")
+
+def build_indeed_page_fixture(num_cards=15, padding_blocks=300, seed=0):
+    """Function builds a synthetic indeed search results page with the same markup
+    structure that is parsed by the IndeedJobListingsPipeline.
+
+    Real indeed pages contain a large amount of markup (navigation, scripts, filters, ads)
+    outside of the listing cards. This is simulated by padding blocks so that the cost of
+    building the full tree vs a strained tree is representative.
+
+    Args:
+        num_cards (int, optional): The number of "jobsearch-SerpJobCard" listing cards on the page.
+
+        padding_blocks (int, optional): The number of unrelated markup blocks on the page.
+
+        seed (int, optional): The random seed used to generate the listing content.
+
+    Returns:
+        str: The html of the synthetic page.
+    """
+    rng = random.Random(seed)
+    post_dates = ["Just posted", "Today", "1 day ago", "5 days ago", "30+ days ago"]
+
+    padding = "".join(
+        f'<div class="filter-block-{i}"><ul><li><a href="/jobs?filter={i}">Filter {i}</a></li>'
+        f'<li><span class="count">{rng.randint(1, 999)}</span></li></ul><p>{"lorem ipsum " * 10}</p></div>'
+        for i in range(padding_blocks))
+
+    cards = "".join(
+        f'<div class="jobsearch-SerpJobCard unifiedRow row result" id="p_{rng.getrandbits(64):016x}">'
+        f'<h2 class="title"><a href="/rc/clk?jk={i}">\nSoftware Developer {i}\n</a></h2>'
+        f'<div class="sjcl"><span class="company">\nCompany {rng.randint(1, 500)}\n</span>'
+        f'<span class="location">\nToronto, ON\n</span></div>'
+        f'<div class="summary"><ul><li>{"Build and maintain services. " * 5}</li></ul></div>'
+        f'<span class="date">{rng.choice(post_dates)}</span></div>'
+        for i in range(num_cards))
+
+    return (
+        f'<html><head><title>Jobs</title><script>{"var x = 1;" * 200}</script></head><body>'
+        f'<div id="header">{padding}</div><div id="resultsCol">{cards}</div>'
+        f'<nav><a href="/jobs?q=software+developer&amp;start=10" aria-label="Next">Next</a></nav>'
+        f'</body></html>')
+
+def load_fixtures(fixtures_dir=INDEED_FIXTURES_DIR):
+    """Function reads every saved .html indeed page fixture in a directory. Defaults to the
+    saved pages shipped w/ the benchmarks, which keep the markup of real indeed search results
+    pages (scripts, facets, pagination, sponsored cards) w/ anonymised listing content.
+
+    Returns:
+        list: The html of each saved page.
+    """
+    pages = []
+    for fixture_path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        with open(fixture_path, "r", encoding="utf-8") as fixture_file:
+            pages.append(fixture_file.read())
+
+    return pages
+
+def benchmark_parsing(pages, parser, use_strainer, processes=0, repeat=3):
+    """Function times parsing every page with a specific parser configuration.
+
+    Args:
+        pages (list): The html of the pages to parse.
+
+        parser (str): The bs4 parser backend.
+
+        use_strainer (bool): Whether to restrict the tree w/ the SoupStrainer.
+
+        processes (int, optional): The number of processes used to parse the pages. 0 parses
+            the pages serially in the calling process.
+
+        repeat (int, optional): The number of timed repetitions. The best time is reported.
+
+    Returns:
+        dict: The best wall clock time in seconds, the time per page and the number of listings parsed.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        if processes > 0:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(
+                    parse_indeed_page, pages, [parser] * len(pages), [use_strainer] * len(pages)))
+        else:
+            results = [parse_indeed_page(page, parser, use_strainer) for page in pages]
+
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "seconds": min(timings),
+        "seconds_per_page": min(timings) / max(len(pages), 1),
+        "listings": sum(len(jobs) for jobs, _ in results)}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the Indeed listing page parsing modes.")
+    arg_parser.add_argument("--fixtures-dir", default=INDEED_FIXTURES_DIR, help="Directory of saved indeed .html pages. Defaults to the bundled fixtures.")
+    arg_parser.add_argument("--synthetic", action="store_true", help="Parse generated synthetic pages instead of the saved fixtures.")
+    arg_parser.add_argument("--pages", type=int, default=20, help="Number of synthetic pages to generate.")
+    arg_parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Number of processes for the process pool mode.")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    if args.synthetic:
+        pages = [build_indeed_page_fixture(seed=page_num) for page_num in range(args.pages)]
+    else:
+        pages = load_fixtures(args.fixtures_dir)
+
+    if len(pages) < 1:
+        arg_parser.error(f"No .html fixtures found in {args.fixtures_dir}")
+
+    # The baseline configuration is the original full html.parser tree:
+    configurations = [
+        ("html.parser", False, 0),
+        ("html.parser", True, 0)]
+
+    if importlib.util.find_spec("lxml") is not None:
+        configurations.extend([("lxml", False, 0), ("lxml", True, 0)])
+
+    configurations.append((configurations[-1][0], True, args.processes))
+
+    baseline_seconds = None
+    print(f"Parsing {len(pages)} indeed pages")
+    for parser, use_strainer, processes in configurations:
+        result = benchmark_parsing(pages, parser, use_strainer, processes, args.repeat)
+        baseline_seconds = baseline_seconds or result["seconds"]
+
+        print(
+            f"parser={parser:<12} strainer={str(use_strainer):<5} processes={processes:<3} "
+            f"{result['seconds']:.3f}s ({result['seconds_per_page'] * 1000:.2f} ms/page, "
+            f"{baseline_seconds / result['seconds']:.1f}x) listings={result['listings']}")
+
+if __name__ == "__main__":
+    main()
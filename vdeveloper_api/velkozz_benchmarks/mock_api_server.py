@@ -0,0 +1,379 @@
+# Importing native packages:
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+def _days(num_records, rng):
+    """Generates num_records datetimes counting back one day at a time from a fixed date."""
+    end_date = datetime(2021, 6, 1)
+    return [end_date - timedelta(days=i, seconds=rng.randint(0, 86399)) for i in range(num_records)]
+
+def build_reddit_posts(num_records, rng):
+    """Function builds synthetic records of the social_media_api/reddit/top_posts endpoint."""
+    return [
+        {
+            "id": f"p{i:07d}",
+            "url": f"/social_media_api/reddit/top_posts/p{i:07d}",
+            "subreddit": rng.choice(["wallstreetbets", "investing", "stocks"]),
+            "title": f"{rng.choice(['GME', 'AMC', 'TSLA', 'PLTR'])} to the moon {i}",
+            "content": "Lorem ipsum dolor sit amet. " * rng.randint(1, 20),
+            "upvote_ratio": round(rng.random(), 2),
+            "score": rng.randint(0, 50000),
+            "num_comments": rng.randint(0, 5000),
+            "created_on": day.strftime("%Y-%m-%dT%H:%M:%S.%f+0000"),
+            "stickied": False,
+            "over_18": False,
+            "spoiler": False,
+            "link": f"/r/wallstreetbets/comments/p{i:07d}",
+            "author_name": f"user_{rng.randint(0, 9999)}",
+            "author_id": f"a{rng.randint(0, 9999)}"
+        }
+        for i, day in enumerate(_days(num_records, rng))]
+
+def build_indeed_listings(num_records, rng):
+    """Function builds synthetic records of the social_media_api/jobs/indeed/listings endpoint."""
+    return [
+        {
+            "id": f"p_{rng.getrandbits(64):016x}",
+            "url": f"/social_media_api/jobs/indeed/listings/{i}",
+            "title": f"Software Developer {i}",
+            "company": f"Company {rng.randint(1, 500)}",
+            "location": rng.choice(["Toronto, ON", "New York, NY", "Remote"]),
+            "summary": "Build and maintain services. " * 5,
+            "date_posted": day.strftime("%Y-%m-%d")
+        }
+        for i, day in enumerate(_days(num_records, rng))]
+
+def build_youtube_channel_stats(num_records, rng):
+    """Function builds synthetic records of the social_media_api/youtube/channel_daily endpoint."""
+    return [
+        {
+            "url": f"/social_media_api/youtube/channel_daily/{i}",
+            "date_extracted": day.strftime("%Y-%m-%d"),
+            "channel_id": "UCmEu9Y8nodUV0jvsR9NYLJA",
+            "channel_name": "IWDominate",
+            "viewCount": 100000000 - i * rng.randint(1000, 5000),
+            "subscriberCount": 1000000 - i * rng.randint(10, 50),
+            "videoCount": 1000 - i // 7
+        }
+        for i, day in enumerate(_days(num_records, rng))]
+
+def build_index_comp(num_records, rng):
+    """Function builds synthetic records of the finance_api/market_index/<index>comp endpoints."""
+    return [
+        {
+            "url": f"/finance_api/market_index/{i}",
+            "symbol": "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(1, 4))),
+            "security_name": f"Security {i}",
+            "gics_sector": rng.choice(["Information Technology", "Financials", "Energy"])
+        }
+        for i in range(num_records)]
+
+def build_wsb_ticker_counts(num_records, rng):
+    """Function builds synthetic records of the finance_api/structured_quant/wsb_ticker_mentions endpoint."""
+    tickers = ["GME", "AMC", "TSLA", "PLTR", "BB", "NOK", "UWMC", "FUBO"]
+    return [
+        {
+            "day": day.strftime("%Y-%m-%d"),
+            "ticker_count": str({ticker: rng.randint(1, 50) for ticker in rng.sample(tickers, rng.randint(1, len(tickers)))})
+        }
+        for day in _days(num_records, rng)]
+
+def build_news_articles(num_records, rng):
+    """Function builds synthetic records of the news_api/news_articles endpoint."""
+    return [
+        {
+            "title": f"Markets rally on earnings {i}",
+            "authors": str([f"Author {rng.randint(1, 100)}"]),
+            "published_date": day.strftime("%Y-%m-%d"),
+            "article_text": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * rng.randint(10, 100),
+            "meta_keywords": str(["markets", "earnings"]),
+            "nlp_keywords": str(["rally", "earnings", "stocks"]),
+            "article_url": f"https://news.example.com/articles/{i}",
+            "source": rng.choice(["CNN", "Reuters", "Bloomberg"]),
+            "timestamp": str(day)
+        }
+        for i, day in enumerate(_days(num_records, rng))]
+
+def build_country_summaries(num_records, rng):
+    """Function builds synthetic records of the geography_api/countries/summary endpoint."""
+    return [
+        {
+            "cca3": "".join(chr(65 + (i // 26 ** k) % 26) for k in (2, 1, 0)),
+            "name": {"common": f"Country {i}", "official": f"Republic of Country {i}"},
+            "region": rng.choice(["Americas", "Europe", "Asia", "Africa", "Oceania"]),
+            "population": rng.randint(10000, 100000000)
+        }
+        for i in range(num_records)]
+
+# The endpoints implemented by the server mapped to the function building their synthetic records:
+MOCK_ENDPOINTS = {
+    "/social_media_api/reddit/top_posts": build_reddit_posts,
+    "/social_media_api/jobs/indeed/listings": build_indeed_listings,
+    "/social_media_api/youtube/channel_daily": build_youtube_channel_stats,
+    "/finance_api/market_index/spycomp": build_index_comp,
+    "/finance_api/market_index/djiacomp": build_index_comp,
+    "/finance_api/market_index/nysecomp": build_index_comp,
+    "/finance_api/market_index/nasdaqcomp": build_index_comp,
+    "/finance_api/structured_quant/wsb_ticker_mentions": build_wsb_ticker_counts,
+    "/news_api/news_articles": build_news_articles,
+    "/geography_api/countries/summary": build_country_summaries}
+
+class MockVelkozzAPIServer(object):
+    """A local stand-in for the Velkozz Web API used to benchmark the VelkozzAPI query client
+    and the pipeline loaders end-to-end without a live backend.
+
+    The server implements the token auth endpoint and the GET and POST methods of every
+    endpoint in MOCK_ENDPOINTS. GET requests return num_records synthetic records (query
+    filters are accepted but not applied) and POST requests record their JSON payloads in
+    the received dict so the written data can be inspected after a run. Every request is
+    delayed by the configured latency to simulate a remote server.
+
+    If a page_size is provided GET responses are paginated in the Django REST Framework
+    page number format, {"count", "next", "previous", "results"}, w/ the page and page_size
+    query params selecting the page.
+
+    A comma separated fields query param limits the fields of the returned records, and
+    records w/ an id can be requested individually from the <endpoint>/<id> detail route.
+
+    Example:
+        with MockVelkozzAPIServer(num_records=10000, latency=0.05) as server:
+            api = VelkozzAPI(url=server.url, username="velkozz", password="velkozz")
+            api.get_subreddit_data("wallstreetbets")
+            server.received["/social_media_api/reddit/top_posts"] # The POSTed payloads.
+
+    Arguments:
+        host (str, optional): The interface the server binds to. Defaults to "127.0.0.1".
+
+        port (int, optional): The port the server binds to. Defaults to 0, a free port.
+
+        num_records (int, optional): The number of synthetic records returned by each GET endpoint.
+
+        latency (float, optional): The number of seconds every request is delayed by. Defaults to 0.
+
+        token (str, optional): The auth token issued by and accepted by the server.
+
+        users (dict, optional): The {username: password} accounts accepted by the token auth endpoint.
+
+        seed (int, optional): The random seed used to generate the synthetic records.
+
+        page_size (int|None, optional): The default number of records per page. Defaults to None,
+            every record is returned in a single JSON array.
+
+    """
+    def __init__(self, host="127.0.0.1", port=0, num_records=100, latency=0.0, token="mock-velkozz-token", users=None, seed=0, page_size=None):
+
+        self.num_records = num_records
+        self.latency = latency
+        self.token = token
+        self.users = users if users is not None else {"velkozz": "velkozz"}
+        self.seed = seed
+        self.page_size = page_size
+
+        self.received = defaultdict(list)
+        self.request_counts = defaultdict(int)
+        self._records = {}
+        self._records_by_id = {}
+        self._responses = {}
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._build_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Method starts serving requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Method stops the server and closes its socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self):
+        """Method clears the recorded POST payloads and request counts."""
+        with self._lock:
+            self.received.clear()
+            self.request_counts.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_records(self, path):
+        """Method returns the synthetic records of an endpoint, building them on first use."""
+        with self._lock:
+            return self._get_endpoint_records(path)
+
+    def _get_endpoint_records(self, path):
+        """Method builds the synthetic records of an endpoint once. Must be called w/ the lock held."""
+        if path not in self._records:
+            rng = random.Random(f"{self.seed}{path}")
+            self._records[path] = MOCK_ENDPOINTS[path](self.num_records, rng)
+
+        return self._records[path]
+
+    def _get_response_body(self, path, query=None):
+        """Method returns the serialized synthetic records of an endpoint, or the page of them
+        selected by the query params. Each response is serialized once so that the cost of
+        generating it is not part of the measured latency.
+        """
+        query = {name: values[0] for name, values in (query or {}).items()}
+        page_size = int(query.get("page_size", self.page_size)) if self.page_size is not None else None
+        page_num = int(query.get("page", 1))
+        fields = query["fields"].split(",") if query.get("fields") else None
+
+        with self._lock:
+            cache_key = (path, page_size, page_num, query.get("fields"))
+            if cache_key not in self._responses:
+                if path in MOCK_ENDPOINTS:
+                    records = self._get_endpoint_records(path)
+                else:
+                    endpoint, record_id = path.rsplit("/", 1)
+                    if endpoint not in self._records_by_id:
+                        self._records_by_id[endpoint] = {record.get("id"): record for record in self._get_endpoint_records(endpoint)}
+
+                    if record_id not in self._records_by_id[endpoint]:
+                        return None
+                    records = [self._records_by_id[endpoint][record_id]]
+
+                if fields is not None:
+                    records = [{field: record[field] for field in fields if field in record} for record in records]
+
+                if path not in MOCK_ENDPOINTS:
+                    body = records[0]
+                elif page_size is None:
+                    body = records
+                else:
+                    def page_url(num):
+                        return f"{self.url}{path}/?{urlencode(dict(query, page=num, page_size=page_size))}"
+
+                    body = {
+                        "count": len(records),
+                        "next": page_url(page_num + 1) if page_num * page_size < len(records) else None,
+                        "previous": page_url(page_num - 1) if page_num > 1 else None,
+                        "results": records[(page_num - 1) * page_size:page_num * page_size]}
+
+                self._responses[cache_key] = json.dumps(body).encode("utf-8")
+
+            return self._responses[cache_key]
+
+    def _build_handler(self):
+        server = self
+
+        class MockVelkozzAPIHandler(BaseHTTPRequestHandler):
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self._start_request(allow_detail=True)
+                if path is None:
+                    return
+
+                body = server._get_response_body(path, parse_qs(urlparse(self.path).query))
+                if body is None:
+                    return self._send(404, b'{"detail": "Not found."}')
+
+                self._send(200, body)
+
+            def do_POST(self):
+                if urlparse(self.path).path.rstrip("/") == "/api-token-auth":
+                    return self._authenticate()
+
+                path = self._start_request()
+                if path is None:
+                    return
+
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                except ValueError:
+                    return self._send(400, b'{"detail": "Invalid JSON payload"}')
+
+                with server._lock:
+                    server.received[path].append(payload)
+
+                num_created = len(payload) if isinstance(payload, list) else 1
+                self._send(201, json.dumps({"created": num_created}).encode("utf-8"))
+
+            def _start_request(self, allow_detail=False):
+                """Method applies the latency, checks the auth token and resolves the endpoint
+                of a request. Returns None if an error response has been sent.
+                """
+                time.sleep(server.latency)
+                path = urlparse(self.path).path.rstrip("/")
+
+                with server._lock:
+                    server.request_counts[path] += 1
+
+                if self.headers.get("Authorization") != f"Token {server.token}":
+                    self._send(401, b'{"detail": "Invalid token."}')
+                    return None
+
+                if path not in MOCK_ENDPOINTS and not (allow_detail and path.rsplit("/", 1)[0] in MOCK_ENDPOINTS):
+                    self._send(404, b'{"detail": "Not found."}')
+                    return None
+
+                return path
+
+            def _authenticate(self):
+                time.sleep(server.latency)
+                with server._lock:
+                    server.request_counts["/api-token-auth"] += 1
+
+                form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+                username, password = form.get("username", [None])[0], form.get("password", [None])[0]
+
+                if username in server.users and server.users[username] == password:
+                    self._send(200, json.dumps({"token": server.token}).encode("utf-8"))
+                else:
+                    self._send(400, b'{"non_field_errors": ["Unable to log in with provided credentials."]}')
+
+            def _send(self, status_code, body):
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return MockVelkozzAPIHandler
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run a local mock Velkozz Web API serving synthetic data.")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8000)
+    arg_parser.add_argument("--records", type=int, default=100, help="Number of synthetic records per GET endpoint.")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds every request is delayed by.")
+    arg_parser.add_argument("--token", default="mock-velkozz-token")
+    arg_parser.add_argument("--page-size", type=int, default=None, help="Paginate GET responses w/ this many records per page.")
+    args = arg_parser.parse_args()
+
+    server = MockVelkozzAPIServer(args.host, args.port, args.records, args.latency, args.token, page_size=args.page_size)
+    print(f"Serving mock Velkozz API at {server.url} w/ token {server.token}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        for path, payloads in server.received.items():
+            print(f"{path}: {len(payloads)} POST requests received")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Importing native packages:
+import argparse
+import cProfile
+import importlib
+import json
+import pstats
+import time
+
+# Importing the HTTP record/replay harness:
+from vdeveloper_api.velkozz_pipelines.utils.http_cassette import HTTPCassette
+
+def run_pipeline(pipeline_path, pipeline_kwargs, cassette_path, mode="replay", latency=None, profile_path=None):
+    """Function constructs (and thereby executes) a pipeline while recording or replaying
+    all of its outbound HTTP requests w/ an HTTPCassette.
+
+    Args:
+        pipeline_path (str): The dotted path of the pipeline class, relative to
+            vdeveloper_api.velkozz_pipelines (eg: "social_media_pipelines.reddit_pipelines.RedditContentPipeline").
+
+        pipeline_kwargs (dict): The kwargs the pipeline is constructed with.
+
+        cassette_path (str): The path of the cassette file.
+
+        mode (str, optional): Either "record" or "replay". Defaults to "replay".
+
+        latency (float|str|None, optional): The latency added to replayed responses. See HTTPCassette.
+
+        profile_path (str|None, optional): If provided the run is profiled w/ cProfile and the stats
+            are written to this path.
+
+    Returns:
+        dict: The wall clock time of the run and the number of recorded or replayed HTTP interactions.
+    """
+    module_path, class_name = f"vdeveloper_api.velkozz_pipelines.{pipeline_path}".rsplit(".", 1)
+    pipeline_class = getattr(importlib.import_module(module_path), class_name)
+
+    profiler = cProfile.Profile() if profile_path is not None else None
+
+    with HTTPCassette(cassette_path, mode=mode, latency=latency) as cassette:
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+
+        pipeline_class(**pipeline_kwargs)
+
+        if profiler is not None:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+
+    if profiler is not None:
+        profiler.dump_stats(profile_path)
+
+    if mode == "replay":
+        num_interactions = sum(1 for interaction in cassette.interactions if interaction["used"])
+    else:
+        num_interactions = len(cassette.interactions)
+
+    return {"seconds": seconds, "interactions": num_interactions}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Record or replay the HTTP traffic of a pipeline run.")
+    arg_parser.add_argument("pipeline", help="Pipeline class path, eg: social_media_pipelines.reddit_pipelines.RedditContentPipeline")
+    arg_parser.add_argument("cassette", help="Path of the .json.gz cassette file.")
+    arg_parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    arg_parser.add_argument("--kwargs", default=None, help="JSON file of the pipeline kwargs.")
+    arg_parser.add_argument("--latency", default=None, help="Seconds added to every replayed response, or 'recorded'.")
+    arg_parser.add_argument("--profile", default=None, help="Write cProfile stats of the run to this path.")
+    args = arg_parser.parse_args()
+
+    pipeline_kwargs = {}
+    if args.kwargs is not None:
+        with open(args.kwargs, "r") as kwargs_file:
+            pipeline_kwargs = json.load(kwargs_file)
+
+    latency = args.latency if args.latency in (None, "recorded") else float(args.latency)
+    result = run_pipeline(args.pipeline, pipeline_kwargs, args.cassette, args.mode, latency, args.profile)
+
+    print(f"{args.mode} {args.pipeline}: {result['seconds']:.3f}s, {result['interactions']} HTTP interactions")
+
+    if args.profile is not None:
+        pstats.Stats(args.profile).sort_stats("cumulative").print_stats(25)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# Importing native packages:
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+# Importing the synthetic data generators and the benchmarked modules:
+from vdeveloper_api.velkozz_benchmarks.indeed_parsing import build_indeed_page_fixture
+from vdeveloper_api.velkozz_benchmarks.mock_api_server import MockVelkozzAPIServer, build_reddit_posts, build_news_articles
+
+# Tickers mentioned in the synthetic reddit post titles:
+BENCHMARK_TICKERS = [["GME", "AMC", "TSLA", "PLTR"], ["BB", "NOK"]]
+
+def build_wsb_posts_df(num_records, seed=0):
+    """Function builds a synthetic wallstreetbets posts dataframe in the format returned by
+    VelkozzAPI.get_subreddit_data().
+    """
+    import pandas as pd
+
+    posts_df = pd.DataFrame(build_reddit_posts(num_records, random.Random(seed)))
+    posts_df.set_index("id", inplace=True)
+    posts_df.drop(["url"], axis=1, inplace=True)
+
+    return posts_df
+
+def build_praw_post_dicts(num_records, seed=0):
+    """Function builds synthetic {post_id: post_dict} records in the format passed to
+    RedditContentPipeline._transform_post_content_lst, w/ stand-in praw Redditor authors.
+    """
+    rng = random.Random(seed)
+    return {
+        post["id"]: dict(post, author=SimpleNamespace(
+            name=post["author_name"],
+            is_gold=rng.random() < 0.1,
+            is_mod=rng.random() < 0.01,
+            has_verified_email=True,
+            created_utc=1500000000.0 + rng.randint(0, 10**8),
+            comment_karma=rng.randint(0, 10**5)))
+        for post in build_reddit_posts(num_records, rng)}
+
+def build_article_html(num_records, seed=0):
+    """Function builds the html of synthetic news articles as (url, html) tuples."""
+    return [
+        (article["article_url"],
+         f'<html><head><title>{article["title"]}</title><meta name="keywords" content="markets,earnings">'
+         f'<meta property="article:published_time" content="{article["published_date"]}"></head>'
+         f'<body><article><h1>{article["title"]}</h1><p class="byline">By {article["authors"]}</p>'
+         f'{"".join(f"<p>{sentence}</p>" for sentence in article["article_text"].split(". "))}</article></body></html>')
+        for article in build_news_articles(num_records, random.Random(seed))]
+
+class _NullLogger(object):
+    """A pipeline logger that discards every message so logging is not benchmarked."""
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+# <------ Benchmark cases ------>
+# Each case maps a size to a (setup, run) pair. setup(size) builds the inputs outside of the
+# timed region and run(inputs) performs the benchmarked work. Cases that need a resource
+# cleaned up return a teardown function as the last element of their inputs.
+
+def _setup_wsb_ticker_counts(size):
+    from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
+
+    server = MockVelkozzAPIServer(num_records=size).start()
+    server.get_records("/finance_api/structured_quant/wsb_ticker_mentions")
+    return VelkozzAPI(url=server.url, token=server.token), server.stop
+
+def _run_wsb_ticker_counts(inputs):
+    return inputs[0].get_wsb_ticker_counts()
+
+def _setup_news_articles_query(size):
+    from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
+
+    server = MockVelkozzAPIServer(num_records=size).start()
+    server.get_records("/news_api/news_articles")
+    return VelkozzAPI(url=server.url, token=server.token), server.stop
+
+def _run_news_articles_query(inputs):
+    return inputs[0].get_news_articles()
+
+def _run_news_articles_metadata_query(inputs):
+    return inputs[0].get_news_articles(columns=["published_date", "source"])
+
+def _setup_build_wsb_ticker_freq(size):
+    return build_wsb_posts_df(size), None
+
+def _run_build_wsb_ticker_freq(inputs):
+    from vdeveloper_api.velkozz_pywrapper.api_utils.quant_data_utils.social_media_utils import build_wsb_ticker_freq
+    return build_wsb_ticker_freq(inputs[0], *BENCHMARK_TICKERS)
+
+def _setup_reddit_transform(size):
+    from vdeveloper_api.velkozz_pipelines.social_media_pipelines.reddit_pipelines import RedditContentPipeline
+
+    # The pipeline executes on construction so the transform method is bound to a bare instance:
+    pipeline = RedditContentPipeline.__new__(RedditContentPipeline)
+    pipeline.logger = _NullLogger()
+    return pipeline, build_praw_post_dicts(size), None
+
+def _run_reddit_transform(inputs):
+    pipeline, post_dicts = inputs[0], inputs[1]
+    return [pipeline._transform_post_content_lst(post_id, dict(post_dict)) for post_id, post_dict in post_dicts.items()]
+
+def _setup_indeed_parsing(size):
+    from vdeveloper_api.velkozz_pipelines.social_media_pipelines.indeed_pipelines import DEFAULT_INDEED_HTML_PARSER
+
+    # Each synthetic page contains 15 listings:
+    pages = [build_indeed_page_fixture(seed=page_num) for page_num in range(max(1, size // 15))]
+    return pages, DEFAULT_INDEED_HTML_PARSER, None
+
+def _run_indeed_parsing(inputs):
+    from vdeveloper_api.velkozz_pipelines.social_media_pipelines.indeed_pipelines import parse_indeed_page
+    return [listing for page in inputs[0] for listing in parse_indeed_page(page, inputs[1])[0]]
+
+def _setup_news_transform(size):
+    return build_article_html(size), None
+
+def _run_news_transform(inputs):
+    from vdeveloper_api.velkozz_pipelines.news_articles_pipelines.newspaper3k_pipelines import extract_article_features
+    return [extract_article_features(url, html, "Benchmark") for url, html in inputs[0]]
+
+BENCHMARK_CASES = {
+    "get_wsb_ticker_counts": (_setup_wsb_ticker_counts, _run_wsb_ticker_counts, [1000, 10000]),
+    "get_news_articles": (_setup_news_articles_query, _run_news_articles_query, [1000, 10000]),
+    "get_news_articles_metadata": (_setup_news_articles_query, _run_news_articles_metadata_query, [1000, 10000]),
+    "build_wsb_ticker_freq": (_setup_build_wsb_ticker_freq, _run_build_wsb_ticker_freq, [1000, 10000, 100000]),
+    "reddit_transform_post_content": (_setup_reddit_transform, _run_reddit_transform, [1000, 10000, 100000]),
+    "indeed_page_parsing": (_setup_indeed_parsing, _run_indeed_parsing, [1000, 10000]),
+    "news_article_transform": (_setup_news_transform, _run_news_transform, [100, 1000])}
+
+def run_case(name, size, repeat=3):
+    """Function times a benchmark case at a specific size.
+
+    The wall clock time is the best of repeat runs. The peak memory is measured w/ tracemalloc
+    in a separate run so that tracing does not inflate the timings.
+
+    Returns:
+        dict: The seconds, the peak traced memory in MB and the number of (non None) results of 
+            the case, or the error raised by the case.
+    """
+    setup, run, _ = BENCHMARK_CASES[name]
+    inputs = setup(size)
+    teardown = inputs[-1]
+
+    try:
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            results = run(inputs)
+            timings.append(time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        run(inputs)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    except Exception as e:
+        tracemalloc.stop()
+        return {"error": f"{type(e).__name__}: {e}"}
+
+    finally:
+        if teardown is not None:
+            teardown()
+
+    return {
+        "seconds": min(timings),
+        "peak_mb": peak_bytes / 2**20,
+        "results": sum(1 for result in results if result is not None) if isinstance(results, list) else len(results)}
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Function returns the keys of the results that are slower or use more memory than the
+    baseline by more than the tolerance.
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline or "error" in result or "error" in baseline[key]:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if baseline[key][metric] and result[metric] / baseline[key][metric] > 1 + tolerance:
+                regressions.append(f"{key} {metric}")
+
+    return regressions
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the query API and pipeline transforms on synthetic data.")
+    arg_parser.add_argument("cases", nargs="*", default=list(BENCHMARK_CASES), help="Benchmark cases to run. Defaults to every case.")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=None, help="Number of synthetic records (1k-10M) overriding each case's default sizes.")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--baseline", default=None, help="JSON file of saved results to compare against.")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline.")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression vs the baseline before failing.")
+    args = arg_parser.parse_args()
+
+    if args.save_baseline and args.baseline is None:
+        arg_parser.error("--save-baseline requires --baseline")
+
+    baseline = {}
+    if args.baseline is not None and not args.save_baseline:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+
+    results = {}
+    for name in args.cases:
+        for size in args.sizes or BENCHMARK_CASES[name][2]:
+            key = f"{name}[{size}]"
+            result = results[key] = run_case(name, size, args.repeat)
+
+            if "error" in result:
+                print(f"{key:<40} ERROR {result['error']}")
+                continue
+
+            comparison = ""
+            if key in baseline and "error" not in baseline[key]:
+                comparison = (
+                    f" ({result['seconds'] / baseline[key]['seconds']:.2f}x time, "
+                    f"{result['peak_mb'] / max(baseline[key]['peak_mb'], 1e-9):.2f}x memory vs baseline)")
+
+            print(f"{key:<40} {result['seconds']:>9.3f}s {result['peak_mb']:>9.1f}MB peak  results={result['results']}{comparison}")
+
+    if args.save_baseline:
+        baseline_results = {"created_at": str(datetime.now()), "python": sys.version.split()[0], "results": results}
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(baseline_results, baseline_file, indent=4)
+        return
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,26 @@
 # Importing external packages:
 import requests
-import bonobo
 import os
 
 # Importing Logging packages:
 import logging
 from logging.handlers import HTTPHandler
 
+# Importing internal modules:
+from vdeveloper_api.velkozz_pipelines.utils.seen_index import SeenIDIndex
+from vdeveloper_api.velkozz_pipelines.utils.http_cache import HTTPCache
+
+def _parse_bool(value):
+    """Function parses a boolean config value that may be passed as a string (eg: from an env variable)."""
+    if isinstance(value, str):
+        if value.strip().lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.strip().lower() in ("", "0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Invalid boolean config value: {value}")
+
+    return bool(value)
+
 class VelkozzAPI(object):
 
     def __init__(self, token, **kwargs):
@@ -32,10 +46,31 @@ class Pipeline(object):
     The methods that can but do not need to be overwritten:
     - build_graph()
     - get_services()
+
+    If a SEEN_INDEX_PATH is configured the pipeline opens a persistent SeenIDIndex that 
+    inherited pipelines use through the filter_unseen() and mark_seen() methods to drop
+    records that have already been written to the Web API before they are loaded.
+
+    If a HTTP_CACHE_DIR is configured the http_get() method used by scraping pipelines 
+    serves requests through a shared on-disk HTTPCache w/ conditional GET revalidation.
     
     Arguments:
         kwargs (dict): The key word arguments used to configure inherited pipeline objects. 
-            
+
+        SEEN_INDEX_PATH (str, optional): The path to the SQLite seen-ID index. Searched for in 
+            the env variables if not in kwargs. Deduplication is disabled if not found.
+
+        SEEN_INDEX_TTL (int, optional): The number of seconds an id is remembered by the 
+            seen-ID index. Defaults to 30 days.
+
+        HTTP_CACHE_DIR (str, optional): The directory of the on-disk HTTP response cache. Searched 
+            for in the env variables if not in kwargs. Caching is disabled if not found.
+
+        HTTP_CACHE_MAX_BYTES (int, optional): The size bound of the HTTP cache. Defaults to 512MB.
+
+        HTTP_CACHE_OFFLINE (bool|str, optional): Serve only cached responses w/o making requests. 
+            Searched for in the env variables if not in kwargs. Strings such as "true", "1" or 
+            "yes" enable it and "false", "0" or "no" disable it. Defaults to False.
     
     """
     def __init__(self, **kwargs):
@@ -59,6 +94,24 @@ class Pipeline(object):
         self.token = kwargs.get("token")
         self.web_api_url = kwargs["VELKOZZ_API_URL"] if "VELKOZZ_API_URL" in kwargs else os.environ['VELKOZZ_API_URL']
 
+        # Opening the seen-ID deduplication index if configured:
+        seen_index_path = kwargs.get("SEEN_INDEX_PATH", os.environ.get("SEEN_INDEX_PATH"))
+        if seen_index_path is not None:
+            self.seen_index = SeenIDIndex(seen_index_path, ttl=int(kwargs.get("SEEN_INDEX_TTL", 60*60*24*30)))
+            self.seen_index.prune()
+        else:
+            self.seen_index = None
+
+        # Opening the shared HTTP response cache if configured:
+        http_cache_dir = kwargs.get("HTTP_CACHE_DIR", os.environ.get("HTTP_CACHE_DIR"))
+        if http_cache_dir is not None:
+            self.http_cache = HTTPCache(
+                http_cache_dir, 
+                max_bytes=int(kwargs.get("HTTP_CACHE_MAX_BYTES", 512*1024*1024)),
+                offline=_parse_bool(kwargs.get("HTTP_CACHE_OFFLINE", os.environ.get("HTTP_CACHE_OFFLINE", False))))
+        else:
+            self.http_cache = None
+
     # <------Base Bonobo ETL Methods------->
     def extract(self):
         pass
@@ -71,6 +124,8 @@ class Pipeline(object):
 
     def build_graph(self, **options):
 
+        import bonobo
+
         # Building the Graph:
         self.graph = bonobo.Graph()    
         self.graph.add_chain(
@@ -82,9 +137,82 @@ class Pipeline(object):
 
     def get_services(self, **options):
         return {}
+
+    # <------HTTP Request Methods------->
+    def http_get(self, url, session=None, **kwargs):
+        """Method makes a GET request for pipeline-side fetches (scraped pages, external
+        datasets). The request is served through the HTTP cache if one is configured.
+
+        Args:
+            url (str): The url being requested.
+
+            session (requests.Session|None, optional): The session used to make the request.
+
+            kwargs: The params, headers and timeout of the request.
+
+        Returns:
+            requests.Response|CachedResponse: The response of the request.
+
+        """
+        if self.http_cache is not None:
+            return self.http_cache.get(url, session=session, **kwargs)
+
+        return (session or requests).get(url, **kwargs)
+
+    # <------Seen-ID Deduplication Methods------->
+    def filter_unseen(self, namespace, records, key, max_age=None):
+        """Method drops the records whose id has already been written to the Web API
+        according to the seen-ID index. If no index is configured all records are returned.
+
+        Args:
+            namespace (str): The seen-ID index namespace of the pipeline.
+
+            records (list|dict): A list of record dicts or a dict of records keyed by id.
+
+            key (str|None): The key of the id field in each record dict. Ignored if records 
+                is a dict keyed by id.
+
+            max_age (int|None, optional): Only ids marked within the last max_age seconds are 
+                considered seen. Defaults to the ttl of the index.
+
+        Returns:
+            list|dict: The unseen records in the same container type as the input.
+
+        """
+        if self.seen_index is None:
+            return records
+
+        if isinstance(records, dict):
+            unseen_keys = set(self.seen_index.filter_unseen(namespace, records.keys(), max_age))
+            unseen_records = {record_id: record for record_id, record in records.items() if str(record_id) in unseen_keys}
+        else:
+            unseen_keys = set(self.seen_index.filter_unseen(namespace, [record[key] for record in records], max_age))
+            unseen_records = [record for record in records if str(record[key]) in unseen_keys]
+
+        self.logger.info(f"Seen-ID index dropped {len(records) - len(unseen_records)} of {len(records)} {namespace} records", "seen_index", "pipeline", 200)
+
+        return unseen_records
+
+    def mark_seen(self, namespace, records, key):
+        """Method adds the ids of records that were sucessfully written to the Web API 
+        to the seen-ID index. Does nothing if no index is configured.
+
+        Args:
+            namespace (str): The seen-ID index namespace of the pipeline.
+
+            records (list): The list of record dicts that were written.
+
+            key (str): The key of the id field in each record dict.
+
+        """
+        if self.seen_index is None:
+            return
+
+        self.seen_index.mark_seen(namespace, [record[key] for record in records])
         
     # Executon method:
     def execute_pipeline(self):
+        import bonobo
         
         self.bonobo_parser = bonobo.get_argument_parser()
         with bonobo.parse_args(self.bonobo_parser) as options:
@@ -1,20 +1,15 @@
-# Importing Data Manipulation packages:
-import pandas as pd
-import bonobo
+# Importing native packages:
+import hashlib
+import json
 import os
-from datetime import date, timedelta, datetime, time
-import pytz
+
+# Importing external packages:
 import requests
-import bs4
-from newspaper import Article, Source
-from newspaper import news_pool
-import time
-import re
-import yaml
 
 # Importing internal modules:
 from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline
 from vdeveloper_api.velkozz_pipelines.utils import logger
+from vdeveloper_api.velkozz_pipelines.utils.state_store import JSONStateStore
 
 class CountrySummaryPipeline(Pipeline):
     """A Pipeline that writes summary information about all countries from 
@@ -24,6 +19,20 @@ class CountrySummaryPipeline(Pipeline):
     is ingestible by the REST API. This is a pipeline object that is designed to write
     'descrete/static' data. It is not expected to run frequently as the data that
     needs to be ingested is not expected to change rapidly.
+
+    If a country hash store is configured (COUNTRY_HASHES_PATH) a content hash of every 
+    country that has been written is stored in a JSON state file. Unlike the seen-ID index 
+    the hashes never expire, as the dataset changes so rarely that every hash would outlive 
+    the SEEN_INDEX_TTL. Each run diffs the fetched countries against the stored hashes and 
+    only the added or changed countries are written. No POST request is made if no country 
+    has changed. If an HTTP cache is configured (HTTP_CACHE_DIR) the REST Countries dataset 
+    is fetched w/ a conditional GET.
+
+    Arguments:
+        COUNTRY_HASHES_PATH (str, optional): The path to the JSON file that stores the content
+            hash of every written country. Can also be set as an environment variable. If not 
+            set every country is written on every run.
+
     """
     def __init__(self, **kwargs):
 
@@ -36,26 +45,75 @@ class CountrySummaryPipeline(Pipeline):
         self.logger.info(f"Initalized REST_Countries Pipeline with Url: {self.rest_countries_url}" , "geography", "pipeline", 200)
 
         self.country_summary_endpoint = f"{self.web_api_url}/geography_api/countries/summary/"
+
+        # Opening the non-expiring store of written country hashes if configured:
+        country_hashes_path = kwargs.get("COUNTRY_HASHES_PATH", os.environ.get("COUNTRY_HASHES_PATH"))
+        self.country_hashes = JSONStateStore(country_hashes_path) if country_hashes_path is not None else None
+
         self.execute_pipeline()
 
     def extract_country_data_from_API(self):
         """The extract method makes a GET request to the REST Countries 
         external site and passes the response JSON package to the loading
-        method.
+        method. The request is served through the pipeline HTTP cache if one
+        is configured.
         """
         # Making the GET request to the REST Country site:
-        country_response = requests.get(self.rest_countries_url)
+        country_response = self.http_get(self.rest_countries_url)
         
         if country_response.status_code < 301:
-            self.logger.info(f"Made request to REST Countries and extracted {len(country_response.json())} w/ Status Code: {country_response.status_code}", "geography", "pipeline", 200)            
-            yield country_response.json()
+            countries = country_response.json()
+            self.logger.info(f"Made request to REST Countries and extracted {len(countries)} w/ Status Code: {country_response.status_code}. Not Modified: {getattr(country_response, 'not_modified', False)}", "geography", "pipeline", 200)            
+            yield countries
         else:
             self.logger.warning(f"REST Countries GET request returned status code {country_response.status_code}. Exiting Pipeline w/o writing data.", "geography", "pipeline", 301)
             return
 
+    def diff_country_data(self, *args):
+        """Method compares the content hash of every extracted country against the hash
+        stored in the country hash store when the country was last written and passes only 
+        the added or changed countries to the loading method.
+
+        Yields:
+            list: The countries that have been added or changed since the last sucessful load.
+        """
+        # Unpacking country data:
+        countries = args[0]
+
+        country_hashes = {self._get_country_key(country): self._hash_country(country) for country in countries}
+
+        if self.country_hashes is None:
+            changed_countries = countries
+        else:
+            stored_hashes = self.country_hashes.get("country_summary_hashes", {})
+            changed_countries = [
+                country for country in countries 
+                if stored_hashes.get(self._get_country_key(country)) != country_hashes[self._get_country_key(country)]]
+
+        if len(changed_countries) < 1:
+            self.logger.info(f"None of the {len(countries)} countries have changed since the last run. Exiting Pipeline w/o writing data", "geography", "pipeline", 200)
+            return
+
+        self.logger.info(f"{len(changed_countries)} of {len(countries)} countries have been added or changed since the last run", "geography", "pipeline", 200)
+        yield changed_countries
+
+    def _get_country_key(self, country):
+        """Method returns the ISO 3166-1 alpha-3 code of a country, falling back to its common name."""
+        if country.get("cca3"):
+            return country["cca3"]
+
+        # Older versions of the REST Countries API return the name as a plain string:
+        country_name = country.get("name")
+        return country_name.get("common") if isinstance(country_name, dict) else country_name
+
+    def _hash_country(self, country):
+        """Method returns the sha256 hash of the canonical JSON serialization of a country."""
+        return hashlib.sha256(json.dumps(country, sort_keys=True).encode("utf-8")).hexdigest()
+
     def load_country_data(self, *args):
         """Method makes POST request to the Velkozz REST API to write country summary data
-        extracted via the extract_country_data_from_API method.
+        passed on by the diff_country_data method. The content hashes of the countries are 
+        stored in the country hash store once they have been sucessfully written.
         """
         # Unpacking country data:
         countries = args[0]
@@ -67,6 +125,11 @@ class CountrySummaryPipeline(Pipeline):
                 headers={"Authorization":f"Token {self.token}"},
                 json=countries)
             self.logger.info(f"Wrote {len(countries)} countries to {self.country_summary_endpoint} w/ Status Code: {velkozz_response.status_code}. Exiting Pipeline",  "geography", "pipeline", 200)
+
+            if velkozz_response.status_code < 301 and self.country_hashes is not None:
+                stored_hashes = dict(self.country_hashes.get("country_summary_hashes", {}))
+                stored_hashes.update({self._get_country_key(country): self._hash_country(country) for country in countries})
+                self.country_hashes.set("country_summary_hashes", stored_hashes)
         except Exception as e:
             self.logger.error(f"Error in making POST requests to the Velkozz API. Endpoint: {self.country_summary_endpoint}, Exited Pipeline w/o writing data w/ Error: {e}","geography", "pipeline", 400)
 
@@ -74,17 +137,24 @@ class CountrySummaryPipeline(Pipeline):
         """The method that is used to construct a Bonobo ETL pipeline
         DAG that schedules the Pipelines ETL methods:
 
+        - Extraction: extract_country_data_from_API
+        - Transform: diff_country_data
+        - Loading: load_country_data
+
         Returns: 
             bonobo.Graph: The Bonobo Graph that is declared as an instance
                 parameter and that will be executed by the self.execute_pipeline method.
         
         """
+        import bonobo
+
         # Building the Graph:
         self.graph = bonobo.Graph()    
 
         # Creating the main method chain for the graph:
         self.graph.add_chain(
             self.extract_country_data_from_API,
+            self.diff_country_data,
             self.load_country_data)
 
         return self.graph
@@ -1,26 +1,151 @@
-# Importing Data Manipulation packages:
-import pandas as pd
-import bonobo
+# Importing native packages:
 import os
-from datetime import date, timedelta, datetime, time
-import pytz
-import requests
-import bs4
-from newspaper import Article, Source
-from newspaper import news_pool
-import time
-import re
-import yaml
+from datetime import datetime
+import signal
+import threading
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError, as_completed
 
 # Importing internal modules:
 from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline
 from vdeveloper_api.velkozz_pipelines.utils import logger
+from vdeveloper_api.velkozz_pipelines.utils.api_loader import AsyncAPILoader
 
 # Importing Velkozz API:
 from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
 
+def _raise_article_timeout(signum, frame):
+    raise TimeoutError("Article parsing exceeded the per-article timeout")
+
+def extract_article_features(article_url, article_html, source_name, timeout=None):
+    """Function parses the raw html of a single article and performs newspaper3k's NLP 
+    on it, returning the dict of article features that is written to the REST API.
+
+    It is a module level function that only recieves and returns plain serializable 
+    objects (the raw html in and the feature dict out) so that it can be executed in a 
+    process pool. When called in the main thread of a process (as it is in a pool worker)
+    a SIGALRM based timeout interrupts the parsing of a pathological page. Signals can only
+    be handled by the main thread, so the timeout is not enforced when the function is called
+    from any other thread (eg: a bonobo node thread when the pipeline parses serially).
+
+    Args:
+        article_url (str): The url of the article.
+
+        article_html (str): The downloaded raw html of the article.
+
+        source_name (str): The name of the news source the article belongs to.
+
+        timeout (int|None, optional): The maximum number of seconds spent on the article.
+
+    Returns:
+        dict|None: The article features dict or None if the article could not be parsed.
+    """
+    from newspaper import Article
+
+    use_alarm = (
+        timeout is not None and hasattr(signal, "SIGALRM") 
+        and threading.current_thread() is threading.main_thread())
+
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_article_timeout)
+        signal.alarm(int(timeout))
+
+    try:
+        # Parsing and NLP on the article built from the already downloaded html:
+        article = Article(article_url)
+        article.download(input_html=article_html)
+        article.parse()
+        article.nlp()
+
+        return {
+                "title": article.title,
+                "authors": str(article.authors),
+                "published_date": _process_datetime_obj(article.publish_date),
+                "article_text": article.text,
+                "meta_keywords": str(article.meta_keywords),
+                "nlp_keywords": str(article.keywords),
+                "article_url": article.url,
+                "source": source_name,
+                "timestamp": str(datetime.now())    
+        }
+
+    except Exception:
+        return None
+
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+def _process_datetime_obj(datetime_obj):
+    """The function is a basic way to process datetime objects.
+
+    The function either returns a None type if there is no datetime
+    object. If the method is not None it formats the datetime object 
+    into the correct format for the REST API: YYYY-MM-DD and returns
+    that datetime object. 
+
+    It is meant to serve as a basic way to format datetime objects that
+    are extracted via the newspaper3k.Article() pipeline.
+    
+    Args:
+        datetime_obj (None | datetime): The value passed into the method
+            as the datetime to be formatted.
+
+    Return:
+        str|None: Either the formatted datetime object in the form of a string
+            or if no datetime is provided.
+
+    """
+    if datetime_obj is None:
+        return None
+
+    else:
+        return datetime_obj.strftime("%Y-%m-%d")
+
 class NewsArticlesPipeline(Pipeline):
-    """TODO: Add Documentation.
+    """The pipeline object that contains all the logic to construct an ETL pipeline
+    for extracting and ingesting news articles from the news sites listed in a YAML 
+    config file.
+
+    The pipeline uses newspaper3k to build a Source for every news site and download
+    its articles. Sources are built concurrently under a global connection budget and
+    each source is transformed as soon as its articles are downloaded. The CPU bound parsing and NLP of each article is fanned out to a 
+    process pool and the resulting article features are written to the REST API.
+
+    If the seen-ID index is configured (SEEN_INDEX_PATH) the pipeline crawls incrementally.
+    The urls of articles that were written to the REST API are persisted in the index and 
+    are dropped from each Source before its articles are downloaded, so only new articles are 
+    downloaded, parsed and posted. Once an article is older than NEWS_REVALIDATE_SECONDS it is
+    downloaded and parsed again and a hash of its content is compared to the persisted hash,
+    so only changed articles are re-posted. The index persists across process restarts and is 
+    pruned by age via SEEN_INDEX_TTL.
+
+    Arguments:
+        NEWS_SITE_CONFIG_PATH (str, optional): The path to the YAML config file. Defaults to 
+            "pipeline_config.yaml".
+
+        NEWS_PARSE_WORKERS (int, optional): The number of processes used to parse articles. 0 parses
+            the articles serially in the transform thread. Defaults to the number of CPUs.
+
+        NEWS_ARTICLE_TIMEOUT (int, optional): The maximum number of seconds spent parsing a single 
+            article before it is dropped. It is enforced by a SIGALRM in the pool worker parsing the 
+            article, so articles parsed serially (NEWS_PARSE_WORKERS=0) have no timeout. Defaults to 30.
+
+        NEWS_BUILD_WORKERS (int, optional): The number of sources built concurrently. Defaults to 4.
+
+        NEWS_MAX_CONNECTIONS (int, optional): The global number of concurrent page and article downloads
+            shared by all sources. Defaults to 16.
+
+        NEWS_LOAD_WORKERS (int, optional): The number of concurrent POST requests made by the async
+            loader. Defaults to 4.
+
+        NEWS_LOAD_REQUESTS_PER_SECOND (int|float, optional): The inital request rate of the async loader,
+            adapted to the responses of the REST API. Defaults to 5.
+
+        NEWS_REVALIDATE_SECONDS (int, optional): The age after which a loaded article is downloaded 
+            again to check it for changes. Defaults to never (the SEEN_INDEX_TTL).
+
+    The NEWS_* params can also be set in the YAML config file.
     """
 
     def __init__(self, **kwargs):
@@ -30,6 +155,7 @@ class NewsArticlesPipeline(Pipeline):
 
         self.config_file_path = kwargs.get("NEWS_SITE_CONFIG_PATH") if "NEWS_SITE_CONFIG_PATH" in kwargs else "pipeline_config.yaml"
         # Reading data from YAML config file:
+        import yaml
         try:
             yaml_raw = open(self.config_file_path, "r")
             self.config_params = yaml.safe_load(yaml_raw)
@@ -44,16 +170,51 @@ class NewsArticlesPipeline(Pipeline):
         self.query_con = VelkozzAPI(token=self.token, url=web_api_url)
         self.velkozz_news_endpoint = f'{self.query_con.news_endpoint}/news_articles/'
 
-        self.execute_pipeline()
+        # Article parsing process pool configuration:
+        parse_workers = int(kwargs.get("NEWS_PARSE_WORKERS", self.config_params.get("NEWS_PARSE_WORKERS", os.cpu_count())))
+        self.article_timeout = int(kwargs.get("NEWS_ARTICLE_TIMEOUT", self.config_params.get("NEWS_ARTICLE_TIMEOUT", 30)))
+        self.parse_executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+
+        if self.parse_executor is None:
+            logger.default_logger(f"NEWS_PARSE_WORKERS is 0, articles are parsed serially in the transform thread w/o the {self.article_timeout}s NEWS_ARTICLE_TIMEOUT")
+
+        # Source building and download concurrency configuration:
+        self.source_build_workers = int(kwargs.get("NEWS_BUILD_WORKERS", self.config_params.get("NEWS_BUILD_WORKERS", 4)))
+        self.max_connections = int(kwargs.get("NEWS_MAX_CONNECTIONS", self.config_params.get("NEWS_MAX_CONNECTIONS", 16)))
+
+        # Incremental crawling configuration, content hashes of parsed articles waiting to be loaded:
+        revalidate_seconds = kwargs.get("NEWS_REVALIDATE_SECONDS", self.config_params.get("NEWS_REVALIDATE_SECONDS"))
+        self.revalidate_seconds = int(revalidate_seconds) if revalidate_seconds is not None else None
+        self.article_hashes = {}
+
+        # Async REST API loader shared by every source, rate adapted to the API responses:
+        self.api_loader = AsyncAPILoader(
+            self.token,
+            max_workers=int(kwargs.get("NEWS_LOAD_WORKERS", self.config_params.get("NEWS_LOAD_WORKERS", 4))),
+            requests_per_second=float(kwargs.get("NEWS_LOAD_REQUESTS_PER_SECOND", self.config_params.get("NEWS_LOAD_REQUESTS_PER_SECOND", 5))),
+            logger=logger.default_logger)
+
+        try:
+            self.execute_pipeline()
+        finally:
+            if self.parse_executor is not None:
+                self.parse_executor.shutdown(cancel_futures=True)
+
+            # Blocking until every submitted source has been written:
+            loaded_sources = self.api_loader.close()
+            logger.default_logger(f"Async loader finished, {loaded_sources} sources written to the Velkozz Web API")
 
     def extract_news_sources(self):
         """Generator extracts the list of news website urls from the config file and
         uses newspaper3k to extract articles for each url.
 
-        The method iterates through each provided news site url and uses the built
-        in multi-threading to extract, and download articles. The array of now built
-        sources is then iterated over and the generator passes each Souce on to the
-        transformation method for article formatting and feature extraction
+        Every source is built concurrently in its own build thread (NEWS_BUILD_WORKERS). 
+        Articles whose url is in the seen-ID index are dropped from each source before the 
+        download. All page and article downloads of every source are made through a single
+        download thread pool whose size (NEWS_MAX_CONNECTIONS) is the global connection budget
+        of the extractor. As soon as a source has finished downloading its articles the 
+        generator passes it on to the transformation method for article formatting and feature 
+        extraction, without waiting for the remaining sources.
         
         Yields:
             tuple: A length 1 tuple containing a built newspaper Source() object. 
@@ -61,17 +222,24 @@ class NewsArticlesPipeline(Pipeline):
         """        
         # Extracting all of the news urls from the config file:
         news_urls = self.config_params["NewsSites"]
-        
-        # Building newspaper Source objects from each news url:
-        built_news_source =[
-            self.__create_source_obj(source_dict) for source_dict in news_urls]
-        
-        # Creating Pools for multi-threading download:
-        news_pool.set(built_news_source, threads_per_source=4)
-        news_pool.join()
-        
-        for source in built_news_source:
-            yield source
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as download_executor:
+            with ThreadPoolExecutor(max_workers=self.source_build_workers) as build_executor:
+
+                source_futures = [
+                    build_executor.submit(self.__create_source_obj, source_dict, download_executor) 
+                    for source_dict in news_urls]
+
+                # Yielding each source as soon as it has been built and downloaded:
+                for source_future in as_completed(source_futures):
+                    try:
+                        source = source_future.result()
+                    except Exception as e:
+                        logger.default_logger(f"Error building news source. Skipping source w/ Error: {e}")
+                        continue
+
+                    logger.default_logger(f"Built and downloaded {len(source.articles)} articles from {source.organization}")
+                    yield source
 
     def transform_news_sources(self, *args):
         """The generator function ingests a single built Source object and unpacks 
@@ -80,6 +248,12 @@ class NewsArticlesPipeline(Pipeline):
         Feature extraction is then performed on the article objects where key fields 
         as well as external meta-data are built into a python dict. This built python
         dict serves as the JSON object that is passed into the load method.
+
+        The parsing and NLP of the articles is fanned out to the process pool via the
+        extract_article_features function. Articles that exceed NEWS_ARTICLE_TIMEOUT in the pool
+        are dropped so a single pathological page cannot stall the whole source. Articles parsed
+        serially (no process pool) are not subject to the timeout. Revalidated
+        articles whose content hash has not changed are dropped before loading.
         
         Args:
             *args (tuple): A length 1 tuple containing a built Source() object.
@@ -90,37 +264,49 @@ class NewsArticlesPipeline(Pipeline):
         # Unpacking tuples:
         source = args[0]        
         source_name = args[0].organization
-    
-        articles = []    
-        # Iterating through the list of articles building the list of features dict:
-        for article in source.articles:
-            try:
-                # Parsing and NLP on articles:
-                article.parse()
-                article.nlp()
-
-                article_features = {
-                        "title": article.title,
-                        "authors": str(article.authors),
-                        "published_date": self.__process_datetime_obj(article.publish_date),
-                        "article_text": article.text,
-                        "meta_keywords": str(article.meta_keywords),
-                        "nlp_keywords": str(article.keywords),
-                        "article_url": article.url,
-                        "source": source_name,
-                        "timestamp": str(datetime.now())    
-                }
-                articles.append(article_features)
-
-            except:
-                pass
+
+        # Only the unseen or revalidated articles that were sucessfully downloaded can be parsed:
+        downloaded_articles = [article for article in source.articles if article.html]
+
+        if self.parse_executor is None:
+            articles = [
+                extract_article_features(article.url, article.html, source_name, self.article_timeout)
+                for article in downloaded_articles]
+
+        else:
+            # Fanning the articles out to the process pool, raw html in and feature dicts out:
+            article_futures = [
+                self.parse_executor.submit(extract_article_features, article.url, article.html, source_name, self.article_timeout)
+                for article in downloaded_articles]
+
+            articles = []
+            for article_future in article_futures:
+                try:
+                    # The worker enforces the timeout, the grace period covers pool scheduling: 
+                    articles.append(article_future.result(timeout=self.article_timeout * 2))
+                except TimeoutError:
+                    # cancel() only drops an article that is still queued. A running worker can't be stopped 
+                    # from here, it is interrupted by its own alarm and its result is discarded:
+                    if article_future.cancel():
+                        logger.default_logger(f"Article parsing for {source_name} timed out before it started. Dropping article.")
+                    else:
+                        logger.default_logger(f"Article parsing for {source_name} timed out in a running worker. Dropping article, the worker is released once its alarm fires.")
+                    articles.append(None)
+
+        # Dropping articles that could not be parsed:
+        articles = [article_features for article_features in articles if article_features is not None]
+        logger.default_logger(f"Parsed {len(articles)} of {len(downloaded_articles)} downloaded articles from {source_name}")
+
+        articles = self.__drop_unchanged_articles(articles)
 
         yield articles
 
     def load_listings_to_api(self, *args):
         """The method recieves the formatted JSON object from the
-        transformation method, attaches it to a payload and makes 
-        a POST request to the REST API.
+        transformation method, attaches it to a payload and submits
+        it to the AsyncAPILoader which makes the POST request to the REST 
+        API in the background. The method returns immediately so the 
+        transformation of the next source overlaps with the load of this one.
         
         Args: 
             args (tuple): The length 1 tuple containing the formatted
@@ -134,18 +320,18 @@ class NewsArticlesPipeline(Pipeline):
             logger.default_logger(f"Article Length:{len(articles_data)} Exiting w/o making a POST Request.")
             return
         
-        # Request object and attaching payload:
-        response = requests.post(
-            self.velkozz_news_endpoint,
-            headers={"Authorization":f"Token {self.token}"},
-            json=articles_data)
-        
-        logger.default_logger(f"Made POST request to Velkoz Web API <News Articles: Length {len(articles_data)}> w/ Status Code: {response.status_code}")
-        logger.default_logger(f"{response.text}")
+        # Nested function marking the articles as loaded once the POST request succeeds:
+        def mark_articles_loaded(response):
+            self.mark_seen("news_articles", articles_data, "article_url")
 
-        # Sleeping to avoid overloading the REST API (this is an issue with the multi-threading download):
-        time.sleep(10)
+            if self.seen_index is not None:
+                self.seen_index.mark_seen("news_article_hashes", {
+                    article["article_url"]: self.article_hashes.pop(article["article_url"], None) 
+                    for article in articles_data})
 
+        # Submitting the payload to the async loader so the next source is transformed while it is written:
+        self.api_loader.submit(self.velkozz_news_endpoint, articles_data, on_success=mark_articles_loaded)
+        logger.default_logger(f"Submitted <News Articles: Length {len(articles_data)}> to the async Velkozz Web API loader")
 
     def build_graph(self, **options):
         """The method that is used to construct a Bonobo ETL pipeline
@@ -156,6 +342,8 @@ class NewsArticlesPipeline(Pipeline):
                 parameter and that will be executed by the self.execute_pipeline method.
         
         """
+        import bonobo
+
         # Building the Graph:
         self.graph = bonobo.Graph()    
 
@@ -167,19 +355,24 @@ class NewsArticlesPipeline(Pipeline):
 
         return self.graph
 
-    def __create_source_obj(self, news_source_dict):
+    def __create_source_obj(self, news_source_dict, download_executor):
         """The method ingests a key value pair containing base information
         about news sources and returns a fully configured and built newspaper
         Source() object with custom fields that are used to provide metadata
-        for built Articles.
+        for built Articles. The articles of the source that have not already
+        been loaded are downloaded through the shared download pool.
         
         Args: 
             news_source_dict (dict): The Key-Value pair of news source info in 
                 the format {"Source Name": "Source Url"}
+
+            download_executor (ThreadPoolExecutor): The download pool shared by all sources.
                 
         Returns: 
             newspaper.Source: The fully built source from the input url.
         """
+        from newspaper import Source
+
         # Converting dict and unpacking params:
         source_info = list(news_source_dict.items())[0]
         source_name = source_info[0]
@@ -189,33 +382,103 @@ class NewsArticlesPipeline(Pipeline):
         newspaper = Source(source_url, memoize_articles=False)
         newspaper.organization = source_name 
         
-        newspaper.build()
+        self.__build_source(newspaper, download_executor)
+
+        # Dropping already loaded articles from the source before they are downloaded:
+        source_articles = {article.url: article for article in newspaper.articles}
+        newspaper.articles = list(self.filter_unseen("news_articles", source_articles, None, self.revalidate_seconds).values())
+
+        # Downloading the articles through the global connection budget:
+        list(download_executor.map(
+            lambda article: self.__download_article(article, newspaper.config), 
+            newspaper.articles))
         
         return newspaper
-    
-    def __process_datetime_obj(self, datetime_obj):
-        """The method is a basic way to process datetime objects.
 
-        The method either returns a None type if there is no datetime
-        object. If the method is not None it formats the datetime object 
-        into the correct format for the REST API: YYYY-MM-DD and returns
-        that datetime object. 
+    def __download_article(self, article, config):
+        """The method downloads the html of an article via the pipeline http_get method 
+        (through the HTTP cache if one is configured) and passes it to the Article object.
+        Failed downloads are logged and leave the article w/o html.
 
-        It is meant to serve as a basic way to format datetime objects that
-        are extracted via the newspaper3k.Article() pipeline.
-        
         Args:
-            datetime_obj (None | datetime): The value passed into the method
-                as the datetime to be formatted.
+            article (newspaper.Article): The article to download.
+
+            config (newspaper.Config): The config of the article's source.
+        """
+        try:
+            response = self.http_get(article.url, headers={"User-Agent": config.browser_user_agent}, timeout=config.request_timeout)
+            if response.status_code < 400:
+                article.download(input_html=response.text)
+        except Exception as e:
+            logger.default_logger(f"Error downloading article {article.url} w/ Error: {e}")
+
+    def __drop_unchanged_articles(self, articles):
+        """The method computes a content hash of the title and text of every parsed article
+        and drops the articles whose hash matches the hash persisted when the article was last
+        loaded. Unchanged articles are re-marked in the seen-ID index so they are not downloaded 
+        again until the next revalidation. Does nothing if no index is configured.
 
-        Return:
-            str|None: Either the formatted datetime object in the form of a string
-                or if no datetime is provided.
+        Args:
+            articles (list): The list of parsed article feature dicts.
 
+        Returns:
+            list: The new or changed article feature dicts.
         """
-        if datetime_obj is None:
-            return None
+        if self.seen_index is None:
+            return articles
 
-        else:
-            return datetime_obj.strftime("%Y-%m-%d")
+        content_hashes = {
+            article["article_url"]: hashlib.sha256(f"{article['title']}\n{article['article_text']}".encode("utf-8")).hexdigest()
+            for article in articles}
+        stored_hashes = self.seen_index.get_values("news_article_hashes", content_hashes.keys())
+
+        changed_articles = [article for article in articles if stored_hashes.get(article["article_url"]) != content_hashes[article["article_url"]]]
+        unchanged_urls = [url for url, content_hash in content_hashes.items() if stored_hashes.get(url) == content_hash]
+
+        self.seen_index.mark_seen("news_articles", unchanged_urls)
+        for article in changed_articles:
+            self.article_hashes[article["article_url"]] = content_hashes[article["article_url"]]
+
+        logger.default_logger(f"Dropped {len(unchanged_urls)} unchanged articles, {len(changed_articles)} new or changed articles to load")
+
+        return changed_articles
+
+    def __build_source(self, newspaper, download_executor):
+        """The method performs the same steps as newspaper.Source.build() but downloads
+        the homepage, category pages and feeds of the source via the pipeline http_get
+        method instead of newspaper's own network module. The category pages and feeds are
+        downloaded through the download pool shared by all sources so that they count against 
+        the global connection budget. If a HTTP cache is configured unchanged pages are served 
+        from the cache via conditional GET requests instead of being re-downloaded.
+
+        Args:
+            newspaper (newspaper.Source): The unbuilt Source object.
+
+            download_executor (ThreadPoolExecutor): The download pool shared by all sources.
+        """
+        headers = {"User-Agent": newspaper.config.browser_user_agent}
+
+        # Nested function that downloads a page, returning '' on failure like newspaper:
+        def download_html(url):
+            try:
+                response = self.http_get(url, headers=headers, timeout=newspaper.config.request_timeout)
+                return response.text if response.status_code < 400 else ""
+            except Exception as e:
+                logger.default_logger(f"Error downloading {url} w/ Error: {e}")
+                return ""
+
+        newspaper.html = download_html(newspaper.url)
+        newspaper.parse()
+
+        newspaper.set_categories()
+        for category, category_html in zip(newspaper.categories, download_executor.map(download_html, [c.url for c in newspaper.categories])):
+            category.html = category_html
+        newspaper.categories = [c for c in newspaper.categories if c.html]
+        newspaper.parse_categories()
+
+        newspaper.set_feeds()
+        for feed, feed_rss in zip(newspaper.feeds, download_executor.map(download_html, [f.url for f in newspaper.feeds])):
+            feed.rss = feed_rss
+        newspaper.feeds = [f for f in newspaper.feeds if f.rss]
 
+        newspaper.generate_articles()
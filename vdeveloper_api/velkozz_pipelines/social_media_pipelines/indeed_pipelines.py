@@ -1,33 +1,217 @@
-# Importing Data Manipulation packages:
-import pandas as pd
-import bonobo
+# Importing native packages:
 import os
-from datetime import date, timedelta, datetime
-import pytz
-import requests
-import bs4
-import time
+from datetime import timedelta, datetime
 import re
+import html
+import importlib.util
+import threading
+import itertools
+import queue
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Importing external packages:
+import requests
 
 # Importing internal modules:
-from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline
+from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline, _parse_bool
 from vdeveloper_api.velkozz_pipelines.utils import logger
+from vdeveloper_api.velkozz_pipelines.utils.rate_limiter import TokenBucket
 
 # Python API Wrappers:
-import praw
 from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
 
+# Determining the fastest avaliable bs4 parser backend:
+DEFAULT_INDEED_HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+def _is_listing_card_or_next_link(name, attrs):
+    """Function used as the bs4 parse filter that restricts the parsed tree to the
+    "jobsearch-SerpJobCard" listing cards and the "Next" page link. Only these elements
+    (and their children) are built into the tree which skips tree construction for the
+    rest of the page.
+    """
+    attrs = attrs or {}
+
+    if name == "div":
+        css_classes = attrs.get("class", "")
+        css_classes = css_classes.split() if isinstance(css_classes, str) else css_classes
+        return "jobsearch-SerpJobCard" in css_classes
+
+    return name == "a" and attrs.get("aria-label") == "Next"
+
+def _build_listing_strainer():
+    """Function builds the bs4 parse_only filter for listing pages.
+
+    Versions of bs4 before 4.13 call a SoupStrainer name function w/ the name and attributes
+    of each tag. Newer versions only pass the name, so an ElementFilter subclass that 
+    decides on tag creation from the name and attributes is used instead.
+    """
+    import bs4
+
+    if not hasattr(bs4, "ElementFilter"):
+        return bs4.SoupStrainer(_is_listing_card_or_next_link)
+
+    class ListingElementFilter(bs4.ElementFilter):
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return _is_listing_card_or_next_link(name, attrs)
+
+    return ListingElementFilter()
+
+def get_post_date(date_str):
+    """The function takes the text extracted from indeed.com's <span: 'date'>
+    and performs datetime calculations to determine the date that the
+    job listing was posted.
+    
+    Eg:
+        If the current date is 07/04/21 then the function is applied as follows: 
+        get_post_date("6 days ago") = 01/04/21.
+        
+    Args:
+        date_str (str): The string of text that represents the string extracted
+            from indeed.com's job post listings indicating how long ago a job 
+            was posted.
+
+    Returns:
+        datetime: The absoloute date that the job listing was posted in the format
+            dd/mm/yyyy
+            
+    """
+    # Determining current day:
+    today = datetime.today()
+
+    # Attempting to extract number of days referenced:
+    if re.search('\d+', date_str) and "day" in date_str:
+        date_str = date_str.replace("+", "")
+        
+        # Extracting numbers from date string:
+        day_num = [int(s) for s in date_str.split() if s.isdigit()][0]        
+        
+        # Performing calculation to determine post day:
+        post_date = today - timedelta(days=day_num)
+        
+        return post_date.strftime('%Y-%m-%d')
+    
+    else:
+        # Current day posted strings list:
+        current_day_strs = ["Just posted", "Today"]
+    
+        # Add logic for unqiue Date values ("just now, today, etc").
+        if date_str in current_day_strs:
+            return today.strftime('%Y-%m-%d')
+
+def parse_indeed_page(page_html, parser=DEFAULT_INDEED_HTML_PARSER, use_strainer=True):
+    """Function uses beautifulsoup to extract all relevant job listings information
+    from the html of an indeed page as well as the href of the "next" job listings page.
+
+    It is a module level function with no dependency on the pipeline instance so that
+    it can be pickled and executed in a process pool, off the thread fetching pages.
+
+    Args:
+        page_html (str): The html of the indeed page.
+
+        parser (str, optional): The bs4 parser backend. Defaults to "lxml" if it is installed
+            and to the pure-python "html.parser" otherwise.
+
+        use_strainer (bool, optional): Whether to restrict the parsed tree to the listing cards and 
+            the "Next" link via a bs4.SoupStrainer. Defaults to True.
+
+    Returns:
+        tuple: A two element tuple containing (a list of dicts w/ each dict being a job listing,
+            the href to the next indeed listings page or None).
+    """
+    import bs4
+
+    # Nested function for extracting company name from html object:
+    def get_company_name(listing_card_element):
+        """Method contains the logic for try-catching html extraction
+        exceptions to be used with inline list comprehension.
+        """
+        try:
+            company = listing_card_element.find("span", {"class":"company"}).text.strip('\n')
+        except:
+            company = None
+        return company
+    
+    def get_summary(listing_card_element):
+        """Method contains the logic for try-catching html extraction
+        exceptions to be used with inline list comprehension.
+        """
+        try:
+            summary = listing_card_element.find("div", {"class":"summary"}).ul.text.strip("\n")
+        except:
+            summary = None
+        return summary
+
+    parse_only = _build_listing_strainer() if use_strainer else None
+    soup = bs4.BeautifulSoup(page_html, parser, parse_only=parse_only)
+    listings = soup.find_all("div", {"class":"jobsearch-SerpJobCard"})
+
+    # Extracting the job postings data:
+    jobs = [
+        {
+            "id": listing_card["id"],
+            "title":listing_card.find("h2", {"class":"title"}).a.text.strip('\n'),
+            "company": get_company_name(listing_card),
+            "location":listing_card.find("span", {"class":"location"}).text.strip('\n'),
+            "summary":get_summary(listing_card),
+            "date_posted":get_post_date(listing_card.find("span", {"class":"date"}).text.strip("\n"))
+        }
+        for listing_card in listings]
+
+    # Extracting the href to the next indeed webpage:
+    next_anchor = soup.find("a", {"aria-label":"Next"})
+    next_page_href = next_anchor.get("href") if next_anchor is not None else None
+
+    return jobs, next_page_href
+
 class IndeedJobListingsPipeline(Pipeline):
     """The pipeline object that contains all the logic to construct an ETL pipeline
     for extrating and ingesting job postings from indeed.com.
 
-    The pipeline recursivley scrapes the indeed website for all job listings given a 
+    The pipeline iteratively scrapes the indeed website for all job listings given a 
     job title, location and maximum number of pages. Once it extracts the html content
     from the pages it parses the html for each individual job listing and extracts the
-    key information. This information is then seralized and posted to the REST API.
+    key information. This information is then seralized and posted to the REST API in
+    batches while the crawl is still running.
+
+    The job title and location can each be a list, in which case every job title x location 
+    query is crawled concurrently. All requests made to a host draw from a single per-host 
+    TokenBucket so the concurrent crawls share one politeness budget. While a page is being 
+    parsed the request for the next page is already made (prefetched) in the background.
 
     Example:
         test_pipeline = IndeedJobListingsPipeline("software developer", "Ontario", 10)
+        multi_pipeline = IndeedJobListingsPipeline(["software developer", "data analyst"], ["Ontario", "Quebec"], 10)
+
+    Arguments:
+        job_type (str|list): The job title search string(s).
+
+        search_area (str|list): The location search string(s).
+
+        max_pages (int): The maximum number of pages crawled for each query.
+
+        INDEED_REQUESTS_PER_MINUTE (int|float, optional): The request budget for each host shared
+            by all concurrent crawls. Defaults to 2, the pace of the previous fixed 30 second sleep.
+
+        INDEED_MAX_WORKERS (int, optional): The maximum number of queries crawled concurrently. 
+            Defaults to 4.
+
+        INDEED_LOAD_BATCH_SIZE (int, optional): The target number of listings written to the REST 
+            API in a single POST request. The listings of crawled pages are coalesced into 
+            batches of this size. Defaults to 100.
+
+        INDEED_PAGE_QUEUE_SIZE (int, optional): The maximum number of parsed pages buffered between
+            the crawls and the load step. Crawls block once it is full. Defaults to 2 * INDEED_MAX_WORKERS.
+
+        INDEED_HTML_PARSER (str, optional): The bs4 parser backend used to parse pages. Defaults 
+            to "lxml" if it is installed and to "html.parser" otherwise.
+
+        INDEED_USE_STRAINER (bool|str, optional): Restricts the parsed tree to the listing cards and the 
+            "Next" link. Strings such as "true" or "false" are parsed as booleans. Defaults to True.
+
+        INDEED_PARSE_PROCESSES (int, optional): The number of processes in the pool used to parse 
+            pages off the fetching threads. Defaults to 0, parsing pages in the fetching thread.
 
     """
     def __init__(self, job_type, search_area, max_pages, **kwargs):
@@ -45,6 +229,29 @@ class IndeedJobListingsPipeline(Pipeline):
         # Base Indeed URL (canadian):
         self.base_indeed_url = "https://ca.indeed.com"
 
+        # Building every job type x location search query:
+        job_types = [job_type] if isinstance(job_type, str) else list(job_type)
+        search_areas = [search_area] if isinstance(search_area, str) else list(search_area)
+        self.search_queries = list(itertools.product(job_types, search_areas))
+
+        # Crawler concurrency and politeness configuration:
+        self.requests_per_minute = float(kwargs.get("INDEED_REQUESTS_PER_MINUTE", 2))
+        self.max_workers = int(kwargs.get("INDEED_MAX_WORKERS", 4))
+        self.load_batch_size = int(kwargs.get("INDEED_LOAD_BATCH_SIZE", 100))
+        self.page_queue_size = int(kwargs.get("INDEED_PAGE_QUEUE_SIZE", 2 * self.max_workers))
+        self.host_rate_limiters = {}
+        self.rate_limiter_lock = threading.Lock()
+
+        # Html parsing configuration:
+        self.html_parser = kwargs.get("INDEED_HTML_PARSER", DEFAULT_INDEED_HTML_PARSER)
+        self.use_strainer = _parse_bool(kwargs.get("INDEED_USE_STRAINER", True))
+        parse_processes = int(kwargs.get("INDEED_PARSE_PROCESSES", 0))
+        self.parse_executor = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 0 else None
+
+        # Pooled HTTP session shared by all crawls:
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_10_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/39.0.2171.95 Safari/537.36'})
+
         # Velkozz Web API Configs:
         web_api_url = kwargs["VELKOZZ_API_URL"] if "VELKOZZ_API_URL" in kwargs else os.environ['VELKOZZ_API_URL']
 
@@ -54,34 +261,87 @@ class IndeedJobListingsPipeline(Pipeline):
         self.velkozz_indeed_endpoint = f"{self.query_con.jobs_endpoint}/indeed/listings/"
 
         # Execuring all of the ETL functions mapped in the graph:
-        self.execute_pipeline()
+        try:
+            self.execute_pipeline()
+        finally:
+            if self.parse_executor is not None:
+                self.parse_executor.shutdown()
 
     def recursively_extract_and_transform_listings(self):
         """
-        - Inital Indeed URL, built based on search params.
-        - Calls recursive method to extract job listings.
-        - Convert to json and write to REST API.
+        - Inital Indeed URLs, built based on every search query.
+        - Crawls each query concurrently via the iterative _crawl_indeed_query generator.
+        - Coalesces the listings of parsed pages into batches of INDEED_LOAD_BATCH_SIZE.
+        - Drops listings already present in the seen-ID index.
+        - Yields each batch to the load method as soon as it is full.
+
+        Each query is crawled in its own worker thread which puts every parsed page of listings
+        onto a shared queue. The generator consumes the queue while the crawls are running so
+        the first batch is written to the REST API as soon as enough pages have been parsed.
+        The queue holds at most INDEED_PAGE_QUEUE_SIZE pages, so the crawls block instead of 
+        running ahead when the load step falls behind and memory stays bounded by the queue 
+        and a single batch of listings. Any remaining listings are yielded once every crawl 
+        has finished.
         """
-        # Building indeed url based on search params:
-        built_indeed_url = f"{self.base_indeed_url}/jobs"
-
-        # Building the URL with params via Prepared Requests:
-        payload = {"q":self.job_type, "l":self.search_area}
-
-        url_req = requests.Request("GET", built_indeed_url, params=payload).prepare()
-
-        self.logger.info(f"Request made to {url_req.url}", "indeed", "pipeline", 200)
-
-        # Using recursive method to extract data via built url:
-        job_listings = self._extract_indeed_jobs(url_req.url, 0, self.max_pages)
-        
-        self.logger.info(f"Finished Extracting {len(job_listings)} from Indeed.ca from scraping {self.max_pages} Pages" , "indeed", "pipeline", 200)
-
-        yield job_listings
+        pages_queue = queue.Queue(maxsize=max(1, self.page_queue_size))
+        stop_crawls = threading.Event()
+        listings_batch = []
+        total_listings = 0
+
+        # Nested function that blocks until there is room on the queue, unless the crawls are stopped:
+        def put_page(page_listings):
+            while not stop_crawls.is_set():
+                try:
+                    pages_queue.put(page_listings, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        # Nested function that drains a single query crawl into the shared queue:
+        def crawl_to_queue(search_query):
+            try:
+                for page_listings in self._crawl_indeed_query(*search_query):
+                    if not put_page(page_listings):
+                        break
+            except Exception as e:
+                self.logger.error(f"Crawl of Indeed query {search_query} failed w/ Error: {e}", "indeed", "pipeline", 400)
+            finally:
+                put_page(None)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.search_queries)))) as executor:
+            for search_query in self.search_queries:
+                executor.submit(crawl_to_queue, search_query)
+
+            # Consuming pages until every crawl has put its None sentinel on the queue. If the 
+            # generator is closed early the blocked crawls are released so the pool can shut down: 
+            try:
+                finished_crawls = 0
+                while finished_crawls < len(self.search_queries):
+                    page_listings = pages_queue.get()
+                    if page_listings is None:
+                        finished_crawls += 1
+                        continue
+
+                    listings_batch.extend(page_listings)
+                    total_listings += len(page_listings)
+
+                    if len(listings_batch) >= self.load_batch_size:
+                        # Dropping listings that have already been written to the Web API:
+                        yield self.filter_unseen("indeed_listings", listings_batch, "id")
+                        listings_batch = []
+            finally:
+                stop_crawls.set()
+
+        if len(listings_batch) > 0:
+            yield self.filter_unseen("indeed_listings", listings_batch, "id")
+
+        self.logger.info(f"Finished Extracting {total_listings} from Indeed.ca from scraping {len(self.search_queries)} queries of up to {self.max_pages} Pages" , "indeed", "pipeline", 200)
         
     def load_listings_to_api(self, *args):
         """
-        Loading data as JSON and making POST request to REST API.
+        Loading a batch of listings as JSON and making POST request to REST API.
+        The method is called for every batch yielded by the extraction method.
         """
         # Unpackinig tuple:
         job_listings = args[0]
@@ -89,7 +349,7 @@ class IndeedJobListingsPipeline(Pipeline):
         # If the list of posts contains no entries end w/o making POST request:
         if len(job_listings) < 1:
             
-            self.logger.warning(f"No Data Recieved from recursive extraction method. Exiting w/o making POST request.", "indeed", "pipeline", 301)
+            self.logger.warning("No Data Recieved from extraction method. Exiting w/o making POST request.", "indeed", "pipeline", 301)
             return
 
         # Seralizing the lit of dicts to json format:
@@ -100,10 +360,12 @@ class IndeedJobListingsPipeline(Pipeline):
                 json=job_listings)
         except Exception as e:
             self.logger.error(f"Error in Making POST Request to the API. Exited w/ Error: {e}", "indeed", "pipeline", 400)
+            return
 
         if response.status_code > 301:
             self.logger.error(f"POST request to Velkozz Web API failed. Status Code {response.status_code}. Response: {response.text}", "indeed", "pipeline", 400)
         else:
+            self.mark_seen("indeed_listings", job_listings, "id")
             self.logger.info(f"Made POST request to Velkoz Web API <Indeed Jobs Listings: Length {len(job_listings)}> w/ Status Code: {response.status_code}", "indeed", "pipeline", 200)
 
     def build_graph(self, **options):
@@ -118,6 +380,8 @@ class IndeedJobListingsPipeline(Pipeline):
                 parameter and that will be executed by the self.execute_pipeline method.
         
         """
+        import bonobo
+
         # Building the Graph:
         self.graph = bonobo.Graph()    
 
@@ -130,45 +394,10 @@ class IndeedJobListingsPipeline(Pipeline):
 
     def _get_post_date(self, date_str):
         """The method takes the text extracted from indeed.com's <span: 'date'>
-        and performs datetime calculations to determine the date that the
-        job listing was posted.
-        
-        Eg:
-            If the current date is 07/04/21 then the function is applied as follows: 
-            get_post_date("6 days ago") = 01/04/21.
-            
-        Args:
-            date_str (str): The string of text that represents the string extracted
-                from indeed.com's job post listings indicating how long ago a job 
-                was posted.
-
-        Returns:
-            datetime: The absoloute date that the job listing was posted in the format
-                dd/mm/yyyy
-                
+        and determines the date that the job listing was posted. See the module
+        level get_post_date function.
         """
-        # Determining current day:
-        today = datetime.today()
-
-        # Attempting to extract number of days referenced:
-        if re.search('\d+', date_str) and "day" in date_str:
-            date_str = date_str.replace("+", "")
-            
-            # Extracting numbers from date string:
-            day_num = [int(s) for s in date_str.split() if s.isdigit()][0]        
-            
-            # Performing calculation to determine post day:
-            post_date = today - timedelta(days=day_num)
-            
-            return post_date.strftime('%Y-%m-%d')
-        
-        else:
-            # Current day posted strings list:
-            current_day_strs = ["Just posted", "Today"]
-        
-            # Add logic for unqiue Date values ("just now, today, etc").
-            if date_str in current_day_strs:
-                return today.strftime('%Y-%m-%d')
+        return get_post_date(date_str)
 
     def _get_listings_and_next_link(self, indeed_url):
         """Method uses requests and beautifulsoup to extract all relevant 
@@ -181,34 +410,30 @@ class IndeedJobListingsPipeline(Pipeline):
                 
         Returns:
             list: A two element list containing [a list of dicts w/ each dict being a job listing,
-                the full url to the next indeed listings page].
+                the full url to the next indeed listings page or None].
         """
-        # Nested function for extracting company name from html object:
-        def get_company_name(listing_card_element):
-            """Method contains the logic for try-catching html extraction
-            exceptions to be used with inline list comprehension.
-            """
-            try:
-                company = listing_card_element.find("span", {"class":"company"}).text.strip('\n')
-            except:
-                company = None
-            return company
-        
-        def get_summary(listing_card_element):
-            """Method contains the logic for try-catching html extraction
-            exceptions to be used with inline list comprehension.
-            """
-            try:
-                summary = listing_card_element.find("div", {"class":"summary"}).ul.text.strip("\n")
-            except:
-                summary = None
-            return summary
-        
-        # Adding Authorization Headers to the requests:
-        headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_10_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/39.0.2171.95 Safari/537.36'}
-        
+        page_html = self._fetch_indeed_page(indeed_url)
+        if page_html is None:
+            return [[], None]
+
+        return self._parse_indeed_page(page_html, indeed_url)
+
+    def _fetch_indeed_page(self, indeed_url):
+        """Method makes the rate limited GET request for an indeed page.
+
+        A token is acquired from the rate limiter of the url's host before the request 
+        is made, blocking until the shared politeness budget allows the request.
+
+        Args:
+            indeed_url (str): The url for the indeed page that is being requested.
+
+        Returns:
+            str|None: The html of the page or None if the request failed.
+        """
+        self._get_host_rate_limiter(indeed_url).acquire()
+
         try:
-            r = requests.get(indeed_url, headers=headers)
+            r = self.http_get(indeed_url, session=self.session)
         except Exception as e:
             self.logger.error(f"Error on Making HTTP Request to Indeed.ca w/ Error: {e}", "indeed", "pipeline", 400)
             return
@@ -218,79 +443,130 @@ class IndeedJobListingsPipeline(Pipeline):
         else:
             self.logger.info(f"Request made to Indeed.ca website returned a status code of {r.status_code} from url: {indeed_url}", "indeed", "pipeline", 301)
 
-        soup = bs4.BeautifulSoup(r.text, "html.parser")
-        listings = soup.find_all("div", {"class":"jobsearch-SerpJobCard"})
+        return r.text
+
+    def _get_host_rate_limiter(self, url):
+        """Method returns the TokenBucket shared by all requests made to the host
+        of a url, creating it on the first request to the host.
+        """
+        host = urlparse(url).netloc
+
+        with self.rate_limiter_lock:
+            if host not in self.host_rate_limiters:
+                self.host_rate_limiters[host] = TokenBucket(rate=self.requests_per_minute, per=60, capacity=1)
+
+            return self.host_rate_limiters[host]
+
+    def _parse_indeed_page(self, page_html, indeed_url):
+        """Method extracts all relevant job listings information from the html of an
+        indeed page as well as the link to the "next" job listings page via the module 
+        level parse_indeed_page function.
+
+        If a parsing process pool is configured the page is parsed in the pool so the 
+        CPU bound parsing does not hold the GIL of the fetching threads.
+
+        Args:
+            page_html (str): The html of the indeed page.
 
-        if len(listings) > 0:
-            self.logger.info(f"{len(listings)} Listings Found and Extracted from {indeed_url} w/ bs4",  "indeed", "pipeline", 200)
+            indeed_url (str): The url for the indeed page that was scraped.
+                
+        Returns:
+            list: A two element list containing [a list of dicts w/ each dict being a job listing,
+                the full url to the next indeed listings page or None].
+        """
+        if self.parse_executor is not None:
+            jobs, next_page_href = self.parse_executor.submit(
+                parse_indeed_page, page_html, self.html_parser, self.use_strainer).result()
         else:
-            self.logger.warning(f"{len(listings)} Listings Found and Extracted from {indeed_url} w/ bs4",  "indeed", "pipeline", 301)
-
-        # Extracting the job postings data:
-        jobs = [
-            {
-                "id": listing_card["id"],
-                "title":listing_card.find("h2", {"class":"title"}).a.text.strip('\n'),
-                "company": get_company_name(listing_card),
-                "location":listing_card.find("span", {"class":"location"}).text.strip('\n'),
-                "summary":get_summary(listing_card),
-                "date_posted":self._get_post_date(listing_card.find("span", {"class":"date"}).text.strip("\n"))
-            }
-            for listing_card in listings]
-        
-        # Extracting and Building the url to the next indeed webpage:
-        try:
-            next_page_href = soup.find("a", {"aria-label":"Next"})['href']
-            self.logger.info(f"URL Link for the next Indeed Page extracted",  "indeed", "pipeline", 200)
+            jobs, next_page_href = parse_indeed_page(page_html, self.html_parser, self.use_strainer)
 
-        except Exception as e:
-            self.logger.error(f"URL Link for the Next Indeed page not found. Being set as None w/ Error {e}",  "indeed", "pipeline", 400)
-            next_page_href = None
+        if len(jobs) > 0:
+            self.logger.info(f"{len(jobs)} Listings Found and Extracted from {indeed_url} w/ bs4",  "indeed", "pipeline", 200)
+        else:
+            self.logger.warning(f"{len(jobs)} Listings Found and Extracted from {indeed_url} w/ bs4",  "indeed", "pipeline", 301)
 
-        next_link_page = f"https://ca.indeed.com{next_page_href}"
+        # Building the url to the next indeed webpage:
+        if next_page_href is not None:
+            self.logger.info("URL Link for the next Indeed Page extracted",  "indeed", "pipeline", 200)
+            next_link_page = f"{self.base_indeed_url}{next_page_href}"
+        else:
+            self.logger.warning("URL Link for the Next Indeed page not found. Being set as None",  "indeed", "pipeline", 301)
+            next_link_page = None
 
         return [jobs, next_link_page]
 
-    def _extract_indeed_jobs(self, url, page_num, max_pages, job_listings=[]):
-        """This method recursivley performs requests to indeed.ca to
-        extract job listings for a specific job and area. 
-        
-        The method builds a url for indeed.ca based on the input 
-        params. It then performs get requests to the indeed url to
-        extract all job listings for the page. The method then extracts
-        the url for the "next" job listings page.
+    def _find_next_link(self, page_html):
+        """Method extracts the url of the "next" indeed page from raw html with a regex 
+        instead of a full html parse. It is used to start the request for the next page 
+        before the current page has been parsed.
+
+        Args:
+            page_html (str): The html of the indeed page.
+
+        Returns:
+            str|None: The full url to the next indeed listings page or None if not found.
+        """
+        next_anchor = re.search(r'<a\s[^>]*aria-label="Next"[^>]*>', page_html)
+        if next_anchor is None:
+            return None
+
+        next_href = re.search(r'href="([^"]+)"', next_anchor.group(0))
+        if next_href is None:
+            return None
+
+        return f"{self.base_indeed_url}{html.unescape(next_href.group(1))}"
+
+    def _crawl_indeed_query(self, job_type, search_area):
+        """Generator iteratively crawls up to max_pages indeed pages for a single
+        job type and location search query, yielding the job listings of each page.
         
-        This next url is then recursively passed into the same method that
-        continues extracting job listings from the new page. This process
-        recursivley continues for an arbitrary amount of time determined
-        by an input param.
+        The method builds a url for indeed.ca based on the input params and requests
+        the first page. For every page the url of the "next" page is extracted from the 
+        raw html and its request is submitted to a background thread before the current
+        page is parsed, so fetching the next page overlaps with parsing the current one. 
+        The fetch itself waits on the shared per-host rate limiter instead of a fixed sleep.
         
         Args: 
+            job_type (str): The job title search string.
+
+            search_area (str): The location search string.
         
-        Returns: list
+        Yields: 
+            list: The list of job listing dicts parsed from a single page.
 
         """
-        if page_num > max_pages:
-            # Print debug messages abount function execution:
-            self.logger.info(f"Recursive Web Scraping Exit Case, Returning {len(job_listings)} after scraping {page_num} pages", "indeed", "pipeline", 200)
-            return job_listings
-        
-        else:            
-            # Extracing all data from the indeed url: 
-            indeed_data = self._get_listings_and_next_link(url)
-            
-            # Adding job listings data to the list:
-            job_listings.extend(indeed_data[0])
-            
-            self.logger.info(f"Recursivley Web Scraping Indeed Page # {page_num}, extracted {len(indeed_data)} listings", "indeed", "pipeline", 200)
+        # Building the URL with params via Prepared Requests:
+        payload = {"q":job_type, "l":search_area}
+        indeed_url = requests.Request("GET", f"{self.base_indeed_url}/jobs", params=payload).prepare().url
+
+        self.logger.info(f"Request made to {indeed_url}", "indeed", "pipeline", 200)
+
+        with ThreadPoolExecutor(max_workers=1) as prefetch_executor:
+            page_future = prefetch_executor.submit(self._fetch_indeed_page, indeed_url)
+
+            for page_num in range(self.max_pages):
+                page_html = page_future.result()
+                if page_html is None:
+                    return
+
+                # Prefetching the next page while the current page is parsed:
+                next_url = self._find_next_link(page_html) if page_num + 1 < self.max_pages else None
+                if next_url is not None:
+                    page_future = prefetch_executor.submit(self._fetch_indeed_page, next_url)
+
+                page_listings, parsed_next_url = self._parse_indeed_page(page_html, indeed_url)
+                self.logger.info(f"Web Scraping Indeed Page # {page_num}, extracted {len(page_listings)} listings", "indeed", "pipeline", 200)
+
+                yield page_listings
 
-            # Second Exit Condition if no next url is found:
-            if indeed_data[1] is None: 
-                self.logger.info(f"No href link to next indeed page found, exit case reached. Returning {len(job_listings)}", "indeed", "pipeline", 301)
-                return job_listings
+                # Exit Condition if no next url is found:
+                if next_url is None:
+                    if parsed_next_url is None or page_num + 1 >= self.max_pages:
+                        self.logger.info(f"No href link to next indeed page found or max pages reached after page # {page_num}", "indeed", "pipeline", 301)
+                        return
 
-            # Waiting time to avoid throttling:
-            time.sleep(30)  
+                    # Falling back to the link found by the full parse if the regex missed it:
+                    next_url = parsed_next_url
+                    page_future = prefetch_executor.submit(self._fetch_indeed_page, next_url)
 
-            # Recursivley calling function:
-            return self._extract_indeed_jobs(indeed_data[1], page_num+1, max_pages, job_listings)
\ No newline at end of file
+                indeed_url = next_url
@@ -1,18 +1,21 @@
-# Importing Data Manipulation packages:
-import pandas as pd
-import bonobo
+# Importing native packages:
 import os
-from datetime import date, timedelta, datetime
+from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing external packages:
 import pytz
 import requests
-import logging
 
 # Importing internal modules:
-from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline
+from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline, _parse_bool
 from vdeveloper_api.velkozz_pipelines.utils import logger
+from vdeveloper_api.velkozz_pipelines.utils.rate_limiter import TokenBucket
+from vdeveloper_api.velkozz_pipelines.utils.batching import chunk_list
+from vdeveloper_api.velkozz_pipelines.utils.state_store import JSONStateStore
 
 # Python API Wrappers:
-import praw
 from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
 
     
@@ -30,14 +33,50 @@ class RedditContentPipeline(Pipeline):
     See graphviz plots of the bonobo graph for a structure outline of how data flows.
     Once again all credit goes to Bonobo and Pandas for the actual heavy lifting.
 
+    The pipeline can be given a list of subreddits instead of a single subreddit name. In 
+    this multi-subreddit mode a single authenticated praw instance is shared between all 
+    subreddits and the listings are extracted concurrently by a thread pool. The requests 
+    made to reddit are throttled by a shared TokenBucket so that the concurrent extraction 
+    stays within Reddit's rate limit budget. A single subreddit pipeline transforms its posts
+    sequentially w/o throttling, as the baseline pipeline did. The posts from every subreddit are merged and 
+    written to the Web API in batched POST requests.
+
+    When the STREAM param is set the pipeline runs in a continuous streaming mode instead 
+    of taking a single daily snapshot. New submissions are ingested from praw's submission 
+    stream as they are posted, micro-batched by count and by time window and each micro-batch
+    is written to the Web API through the same transform and load methods. A resume cursor is 
+    persisted after every successful load so that a restarted pipeline does not replay posts 
+    it has already written. Once a micro-batch fails to load the cursor is no longer advanced
+    for the rest of the run, so a restarted pipeline resumes from before the failed posts.
+
     Example:
-        test_pipeline = EDGARFilingsPipeline("test.sqlite", "learnpython")
+        test_pipeline = RedditContentPipeline("learnpython")
+        multi_pipeline = RedditContentPipeline(["learnpython", "wallstreetbets", "stocks"])
  
      Arguments:
-        dbpath (str): The relative or absoloute database URL pointing to
-            the database where stock price data should be written.
-        subreddit (str): The string that indicates the specific subreddit
-            that the data is to be scraped from.
+        subreddit_name (str|list): The string that indicates the specific subreddit
+            that the data is to be scraped from or a list of subreddit names.
+
+        MAX_WORKERS (int, optional): The number of threads used to extract subreddits and 
+            post authors concurrently. Defaults to 8.
+
+        REDDIT_REQUESTS_PER_MINUTE (int, optional): The request budget shared by all threads. 
+            Defaults to 60, Reddit's rate limit for OAuth clients.
+
+        LOAD_BATCH_SIZE (int, optional): The maximum number of posts written to the Web API 
+            in a single POST request. Defaults to 500.
+
+        STREAM (bool|str, optional): Runs the pipeline in continuous streaming mode. Strings such 
+            as "true" or "false" are parsed as booleans. Defaults to False.
+
+        STREAM_BATCH_SIZE (int, optional): The number of new posts that triggers a micro-batch 
+            to be passed on to the transform method. Defaults to 100.
+
+        STREAM_BATCH_SECONDS (int|float, optional): The maximum number of seconds a post waits 
+            in the stream before its micro-batch is passed on. Defaults to 60.
+
+        STREAM_CURSOR_PATH (str, optional): The path to the JSON file that stores the resume 
+            cursor. Defaults to "reddit_stream_cursor.json".
     """
     def __init__(self, subreddit_name, **kwargs):
 
@@ -46,6 +85,29 @@ class RedditContentPipeline(Pipeline):
    
         # Reddit pipeline configuration objects:
         self.subreddit_name = subreddit_name
+        self.subreddit_names = [subreddit_name] if isinstance(subreddit_name, str) else list(subreddit_name)
+
+        if not self.subreddit_names:
+            raise ValueError("RedditContentPipeline requires at least one subreddit name")
+
+        # Concurrency and rate limit configuration:
+        self.max_workers = int(kwargs.get("MAX_WORKERS", 8))
+        self.load_batch_size = int(kwargs.get("LOAD_BATCH_SIZE", 500))
+        self.reddit_rate_limiter = TokenBucket(
+            rate=int(kwargs.get("REDDIT_REQUESTS_PER_MINUTE", 60)), 
+            per=60)
+
+        # Streaming mode configuration:
+        self.stream = _parse_bool(kwargs.get("STREAM", False))
+        self.stream_batch_size = int(kwargs.get("STREAM_BATCH_SIZE", 100))
+        self.stream_batch_seconds = float(kwargs.get("STREAM_BATCH_SECONDS", 60))
+        self.stream_cursor = JSONStateStore(kwargs.get("STREAM_CURSOR_PATH", "reddit_stream_cursor.json"))
+
+        # The cursor key identifies the set of subreddits the stream is built from:
+        self.stream_cursor_key = "+".join(sorted(self.subreddit_names))
+
+        # Set once a micro-batch fails to load, the cursor must not move past its posts:
+        self.stream_cursor_frozen = False
 
         self.token = kwargs.get("token")
 
@@ -62,13 +124,16 @@ class RedditContentPipeline(Pipeline):
         self.query_con = VelkozzAPI(token=self.token, url=web_api_url)
 
         # Creating a reddit praw instance based on specified subreddit:
+        import praw
         self.reddit = praw.Reddit(
             client_id = client_id,
             client_secret= client_secret,
             user_agent = user_agent
         )
 
-        self.subreddit = self.reddit.subreddit(self.subreddit_name)
+        # Subreddit objects are lazy, no requests are made until a listing is iterated: 
+        self.subreddits = [self.reddit.subreddit(name) for name in self.subreddit_names]
+        self.subreddit = self.subreddits[0]
 
         self.logger.info(f"Reddit Instance Initalized with Read Status: {self.reddit.read_only}", "reddit", "pipeline", 200)
 
@@ -76,7 +141,7 @@ class RedditContentPipeline(Pipeline):
         self.execute_pipeline()
 
     def extract_daily_top_posts(self):
-        """Method extracts the daily top reddit submissions from a subreddit
+        """Method extracts the daily top reddit submissions from each subreddit
         via the praw API wrapper.
 
         The generator yields a dictionary containing relevant information extracted from each post generated
@@ -85,6 +150,9 @@ class RedditContentPipeline(Pipeline):
         converted into a dataframe in the data transformation method. All seaching and transformation of raw 
         data is done prior to it being converted to a dataframe.
 
+        If the pipeline was configured with multiple subreddits the listings are extracted concurrently 
+        by the _extract_subreddit_top_posts method and the resulting dicts are merged into a single dict.
+
         Yields: Dict
             A dictionary containing all the relevant information for each reddit post
                 necessary to compile a dataframe:
@@ -97,31 +165,99 @@ class RedditContentPipeline(Pipeline):
         """
         posts_dict = {}
 
-        # Iterating through the rising posts constructing and generating dicts:
-        for post in self.subreddit.top("day"):
-
-            # Building the single dict key-value pair:
-            post_content_dict = {
-                "subreddit": self.subreddit.display_name,
-                "title": post.title,
-                "content":post.selftext,
-                "upvote_ratio":post.upvote_ratio,
-                "score":post.score,
-                "num_comments":post.num_comments,
-                "created_on": self._format_datetime(post.created_utc), 
-                "stickied":post.stickied,
-                "over_18":post.over_18,
-                "spoiler":post.spoiler,
-                "link":post.permalink,
-                "author":post.author
-            }
+        if len(self.subreddits) == 1:
+            posts_dict.update(self._extract_subreddit_top_posts(self.subreddit))
 
-            posts_dict[post.id] = post_content_dict
-        
-        self.logger.info(f"Extracted Daily top {len(post_content_dict)} posts from {self.subreddit}", "reddit", "pipeline", 200)
+        else:
+            # Extracting each subreddit listing concurrently w/ the shared praw instance:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.subreddits))) as executor:
+                for subreddit_posts in executor.map(self._extract_subreddit_top_posts, self.subreddits):
+                    posts_dict.update(subreddit_posts)
+
+        self.logger.info(f"Extracted Daily top {len(posts_dict)} posts from {len(self.subreddits)} subreddits", "reddit", "pipeline", 200)
                 
         yield posts_dict
 
+    def _extract_subreddit_top_posts(self, subreddit):
+        """Method extracts the daily top posts from a single subreddit. It is the unit 
+        of work that is distributed across the thread pool in multi-subreddit mode.
+
+        A token is acquired from the shared rate limiter before the listing is requested
+        so that concurrent extraction stays within Reddit's rate limit budget.
+
+        Args:
+            subreddit (praw.models.Subreddit): The praw subreddit object to extract posts from.
+
+        Returns:
+            dict: The dict of post content dicts keyed by post id for the subreddit.
+
+        """
+        posts_dict = {}
+
+        try:
+            self.reddit_rate_limiter.acquire()
+
+            # Iterating through the top posts constructing and generating dicts:
+            for post in subreddit.top("day"):
+                posts_dict[post.id] = self._build_post_content_dict(post, subreddit.display_name)
+
+            self.logger.info(f"Extracted Daily top {len(posts_dict)} posts from {subreddit}", "reddit", "pipeline", 200)
+
+        except Exception as e:
+            self.logger.error(f"Error extracting Daily top posts from {subreddit}. Skipping subreddit w/ Error: {e}", "reddit", "pipeline", 400)
+
+        return posts_dict
+
+    def stream_submissions(self):
+        """Generator continuously ingests new submissions from the praw submission stream
+        of every configured subreddit and yields them in micro-batches.
+
+        A single stream is built over all subreddits via reddit's multi-subreddit syntax 
+        ("sub1+sub2+sub3"). Posts are accumulated into a dict in the same format as the dict
+        yielded by the extract_daily_top_posts method. The dict is yielded to the transform 
+        method once it contains STREAM_BATCH_SIZE posts or once the oldest post in it has waited 
+        STREAM_BATCH_SECONDS. The stream is created with pause_after=0 so that it periodically 
+        yields None when no new posts are avaliable which allows the time window to be checked
+        on quiet subreddits.
+
+        When the stream starts praw returns up to 100 historical submissions. Any submission
+        that is not newer than the persisted resume cursor is skipped so restarts don't replay
+        posts that have already been loaded.
+
+        Yields: Dict
+            A micro-batch dict of post content dicts keyed by post id.
+
+        """
+        stream_subreddit = self.reddit.subreddit(self.stream_cursor_key)
+        cursor = self.stream_cursor.get(self.stream_cursor_key, {"created_utc": 0.0, "ids": []})
+
+        self.logger.info(f"Starting submission stream for {self.stream_cursor_key} from cursor {cursor['created_utc']}", "reddit", "pipeline", 200)
+
+        posts_dict = {}
+        batch_started = None
+
+        for post in stream_subreddit.stream.submissions(pause_after=0):
+
+            if post is not None:
+                # Skipping posts that were loaded before the cursor was persisted: 
+                if post.created_utc < cursor["created_utc"] or (
+                    post.created_utc == cursor["created_utc"] and post.id in cursor["ids"]):
+                    continue
+
+                posts_dict[post.id] = self._build_post_content_dict(post, post.subreddit.display_name)
+                batch_started = batch_started or time.monotonic()
+
+            # Determining if the micro-batch is full or if its time window has expired:
+            batch_full = len(posts_dict) >= self.stream_batch_size
+            window_expired = batch_started is not None and (time.monotonic() - batch_started) >= self.stream_batch_seconds
+
+            if posts_dict and (batch_full or window_expired):
+                self.logger.info(f"Streamed micro-batch of {len(posts_dict)} posts from {self.stream_cursor_key}", "reddit", "pipeline", 200)
+                yield posts_dict
+
+                posts_dict = {}
+                batch_started = None
+
     def transform_posts(self, *args):
         """The method recieves a length 1 tuple containing a dict of reddit posts generated from
         the extraction methods and performs transformation on the dict to convert it into a list of
@@ -132,15 +268,13 @@ class RedditContentPipeline(Pipeline):
              {idn, subreddit, title, content, upvote_ratio, score, num_comments, created_on, stickied, over_18, spoiler, permalink, author}
         ]
                     
-        The transformation method queries the main web api for existing posts posted on the day that the pipeline
-        is executed using the python query api. It compares the index of the database data and the index of the 
-        data recieved from the extraction methods. Only unique elements not already in the database are passed 
-        into the load method.
+        The transformation method compares the ids of the posts recieved from the extraction methods
+        against the local seen-ID index of posts that have already been written to the Web API (if
+        one is configured). Only unique elements not already in the database are passed into the load 
+        method, without making a round-trip query to the Web API.
 
         When converting a dictionary to a unique elements Dataframe the method unpacks
         the information and converts all data to the correct data types. 
-                
-        TODO: Remove Web API Querying, deal with that on the back end.
 
         Yields:
             List: A list of dictionaires where each dict is a unique subreddit post.
@@ -149,43 +283,21 @@ class RedditContentPipeline(Pipeline):
         # Unpacking Args Tuple:
         posts_dict = args[0]
         
-        # Remove for next version:
-        """
-        # Querying existing posts from the database during current day:
-        start_date = date.today() - timedelta(days=1) # Today's date range for API.
-        end_date = start_date + timedelta(days=2)
-
-        existing_posts_id = []
-        try:
-            existing_posts = self.query_con.get_subreddit_data(
-                self.subreddit_name, 
-                start_date=start_date, 
-                end_date=end_date)
-                
-            existing_posts_id = existing_posts.index
-        except:
-            pass
-
-        # Extracting unqiue keys from the posts_dict.keys() that are not present in the existing_post_id:
-        unique_id_keys = list(set(posts_dict.keys()) - set(existing_posts_id))
-        
-        # Unpacking the "Author" parameter and extending Author derived params to the end of the content
-        #  list for each dict key-value pair that is unique (not in the database):
-
-        # Creating the list of unique post dicts to be passed to the load function:
-        unique_posts = [
+        # Dropping posts that have already been written to the Web API before any author requests are made:
+        posts_dict = self.filter_unseen("reddit_posts", posts_dict, None)
 
-            # Unpacking list for faster appending:
-            self._transform_post_content_lst(post_id, content_lst) for post_id, content_lst 
-            in posts_dict.items() if post_id in unique_id_keys
-            
-        ]
-        """
+        # Transforming the unique post data. Author data is lazily requested from reddit so when 
+        # several subreddits share the budget the transformation is performed concurrently within it:
+        if len(self.subreddits) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                unique_posts = list(executor.map(
+                    lambda post_item: self._transform_rate_limited_post(*post_item), 
+                    posts_dict.items()))
 
-        # Transforming post data external of unique post ID filtering:
-        unique_posts = [
-            self._transform_post_content_lst(post_id, content_lst) for post_id, content_lst in
-            posts_dict.items()]
+        else:
+            unique_posts = [
+                self._transform_post_content_lst(post_id, post_dict) 
+                for post_id, post_dict in posts_dict.items()]
 
         self.logger.info(f"Raw Post Data Transformed. Formatted posts ({len(unique_posts)}) data being passed to Loading method", "reddit", "pipeline", 200)
         yield unique_posts
@@ -203,8 +315,8 @@ class RedditContentPipeline(Pipeline):
             {postn}
         ]
 
-        This list of dicts is then packaged as a json object, attaced to a POST request and
-        sent to the Web API.
+        This list of dicts is split into batches of at most LOAD_BATCH_SIZE posts. Each batch 
+        is then packaged as a json object, attaced to a POST request and sent to the Web API.
 
         Arguments:
             args (tuple): The arguments passed into the load method by the transform method
@@ -224,26 +336,40 @@ class RedditContentPipeline(Pipeline):
         # Building the API endpoint for the specific subreddit:
         subreddit_endpoint = f"{self.query_con.reddit_endpoint}/top_posts/"
 
-        # Making the post Request:
-        try:
-            response = requests.post(
-                subreddit_endpoint, 
-                headers={"Authorization":f"Token {self.token}"},
-                json=posts_dict)
+        # Making the post Requests in batches to limit the size of each payload:
+        all_batches_loaded = True
+        for posts_batch in chunk_list(posts_dict, self.load_batch_size):
+            try:
+                response = requests.post(
+                    subreddit_endpoint, 
+                    headers={"Authorization":f"Token {self.token}"},
+                    json=posts_batch)
+
+                if response.status_code > 300:
+                    all_batches_loaded = False
+                    self.logger.warning(f"POST Request of {len(posts_batch)} reddit posts failed w/ Status Code {response.status_code}", "reddit", "pipeline", 301)
+                    
+                else:
+                    self.mark_seen("reddit_posts", posts_batch, "id")
+                    self.logger.info(f"Made POST request to Velkozz REST API {subreddit_endpoint} with Status Code {response.status_code}", "reddit", "pipeline", 200)
 
-            if response.status_code > 300:
-                self.logger.warning(f"POST Request of {len(posts_dict)} reddit posts failed w/ Status Code {response.status_code}", "reddit", "pipeline", 301)
-                
-            else:
-                self.logger.info(f"Made POST request to Velkozz REST API {subreddit_endpoint} with Status Code {response.status_code}", "reddit", "pipeline", 200)
+            except Exception as e:
+                all_batches_loaded = False
+                self.logger.error(f"Error in Making POST Request to the API. Exited w/ Error: {e}", "reddit", "pipeline", 400)
 
-        except Exception as e:
-            self.logger.error(f"Error in Making POST Request to the API. Exited w/ Error: {e}", "reddit", "pipeline", 400)
+        # Advancing the stream resume cursor only while every micro-batch has been written. Moving
+        # it past the posts of a failed micro-batch would prevent them being retried on restart:
+        if self.stream and not all_batches_loaded and not self.stream_cursor_frozen:
+            self.stream_cursor_frozen = True
+            self.logger.warning(f"Micro-batch failed to load. Stream cursor for {self.stream_cursor_key} will not advance until restart", "reddit", "pipeline", 301)
+
+        if self.stream and not self.stream_cursor_frozen:
+            self._update_stream_cursor(posts_dict)
 
     def build_graph(self, **options):
         """The method that is used to construct a Bonobo ETL pipeline
         DAG that schedules the following ETL methods:
-        - Extraction: extract_daily_top_posts, extract_rising_posts
+        - Extraction: extract_daily_top_posts or stream_submissions in streaming mode
         - Transformation: transform_posts
         - Loading: load_posts
         Returns: 
@@ -251,18 +377,93 @@ class RedditContentPipeline(Pipeline):
                 parameter and that will be executed by the self.execute_pipeline method.
         
         """
+        import bonobo
+
         # Building the Graph:
         self.graph = bonobo.Graph()    
 
+        # Streaming mode replaces the daily snapshot extraction w/ the submission stream:
+        extraction_method = self.stream_submissions if self.stream else self.extract_daily_top_posts
+
         # Creating the main method chain for the graph:
         self.graph.add_chain(
-            self.extract_daily_top_posts,
+            extraction_method,
             self.transform_posts,
             self.load_posts)
             
 
         return self.graph
 
+    def _build_post_content_dict(self, post, subreddit_name):
+        """Method extracts the relevant information from a praw submission into the 
+        post content dict used by the extraction methods.
+
+        Arguments:
+            post (praw.models.Submission): The reddit submission.
+
+            subreddit_name (str): The display name of the subreddit the post was made in.
+
+        Returns:
+            Dict: The post content dict (without the post id).
+
+        """
+        return {
+            "subreddit": subreddit_name,
+            "title": post.title,
+            "content":post.selftext,
+            "upvote_ratio":post.upvote_ratio,
+            "score":post.score,
+            "num_comments":post.num_comments,
+            "created_on": self._format_datetime(post.created_utc), 
+            "stickied":post.stickied,
+            "over_18":post.over_18,
+            "spoiler":post.spoiler,
+            "link":post.permalink,
+            "author":post.author
+        }
+
+    def _update_stream_cursor(self, posts):
+        """Method advances the persisted stream resume cursor to the newest post in
+        a list of loaded posts.
+
+        The cursor stores the newest created_utc timestamp as well as the ids of all posts
+        created at that exact timestamp, so that posts sharing the cursor timestamp are not 
+        dropped or replayed on restart.
+
+        Arguments:
+            posts (list): The list of transformed post dicts that were written to the Web API.
+
+        """
+        cursor = self.stream_cursor.get(self.stream_cursor_key, {"created_utc": 0.0, "ids": []})
+
+        for post in posts:
+            created_utc = datetime.strptime(post["created_on"], "%Y-%m-%dT%H:%M:%S.%f%z").timestamp()
+
+            if created_utc > cursor["created_utc"]:
+                cursor = {"created_utc": created_utc, "ids": [post["id"]]}
+            elif created_utc == cursor["created_utc"] and post["id"] not in cursor["ids"]:
+                cursor["ids"].append(post["id"])
+
+        self.stream_cursor.set(self.stream_cursor_key, cursor)
+
+    def _transform_rate_limited_post(self, post_id, post_dict):
+        """Method acquires a token from the shared reddit rate limiter before calling
+        the _transform_post_content_lst method. Accessing the "author" attributes of a post 
+        triggers a request to reddit, so every transformation is counted against the budget.
+
+        Arguments:
+            post_id (str): The id string of the post.
+
+            post_dict (dict): A dict contaiing all the extracted reddit data in key value pairs
+
+        Returns:
+            Dict: The transformed dict returned by the _transform_post_content_lst method.
+
+        """
+        self.reddit_rate_limiter.acquire()
+
+        return self._transform_post_content_lst(post_id, post_dict)
+
     def _transform_post_content_lst(self, post_id, post_dict):
         """The method that ingests a post id and dictionary of post content and 
         combines them into a post dictionary of full post content.
@@ -308,7 +509,7 @@ class RedditContentPipeline(Pipeline):
                 "author": post_dict["author"].name
             }
 
-            self.logger.info(f"Author Data Extracted Sucessfully from Post Dict", "reddit", "pipeline", 200)
+            self.logger.info("Author Data Extracted Sucessfully from Post Dict", "reddit", "pipeline", 200)
 
         except Exception as e:
             # Post dict autor dicts:
@@ -1,20 +1,58 @@
-# Importing Data Manipulation packages:
-import pandas as pd
-import bonobo
-import os
-from datetime import date, timedelta, datetime
-import pytz
-import requests
-import bs4
-import time
-import re
+# Importing native packages:
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# Importing Youtube API packages:
-from googleapiclient.discovery import build
+# Importing external packages:
+import requests
 
 # Importing internal modules:
 from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline
 from vdeveloper_api.velkozz_pipelines.utils import logger
+from vdeveloper_api.velkozz_pipelines.utils.batching import chunk_list
+from vdeveloper_api.velkozz_pipelines.utils.quota import QuotaAccountant
+
+# Process-wide cache of built youtube clients keyed by (api key, discovery document path):
+_youtube_clients = {}
+_youtube_clients_lock = threading.Lock()
+
+def get_youtube_client(google_api_key, discovery_document_path=None):
+    """Function returns a youtube v3 API client that is built once per process and reused
+    by every pipeline instance and run.
+
+    The client is built from a static discovery document instead of fetching the document
+    from Google's discovery service. If a path to a saved discovery document is provided it is
+    used, otherwise the discovery document bundled w/ google-api-python-client is used. No 
+    network requests are made to build the client, so pipelines can be built and run without
+    network access in tests.
+
+    Args:
+        google_api_key (str): The Google developer API key.
+
+        discovery_document_path (str|None, optional): The path to a saved youtube v3 discovery
+            document JSON file.
+
+    Returns:
+        googleapiclient.discovery.Resource: The youtube v3 API client.
+
+    """
+    from googleapiclient.discovery import build, build_from_document
+
+    client_key = (google_api_key, discovery_document_path)
+
+    with _youtube_clients_lock:
+        if client_key not in _youtube_clients:
+            if discovery_document_path is not None:
+                with open(discovery_document_path, "r") as discovery_file:
+                    _youtube_clients[client_key] = build_from_document(json.load(discovery_file), developerKey=google_api_key)
+            else:
+                _youtube_clients[client_key] = build(
+                    "youtube", "v3", 
+                    developerKey=google_api_key, 
+                    static_discovery=True, 
+                    cache_discovery=False)
+
+        return _youtube_clients[client_key]
 
 class DailyYoutubeChannelStatsPipeline(Pipeline):
     """The pipeline object that contains all the logic to construct an ETL pipeline
@@ -24,6 +62,21 @@ class DailyYoutubeChannelStatsPipeline(Pipeline):
     based on the channel name or channel ID. The daily channel statistics are then 
     extracted from the Youtube API response and written to the Velkozz API.
 
+    The CHANNEL_ID param can be a list of channel ids. The ids are requested in chunks
+    of up to 50 ids (the maximum the channels().list method accepts in a single call) 
+    which are fetched concurrently. Every channel returned by the API is transformed into
+    its own payload row and all rows are written to the Velkozz API in a single POST request.
+
+    If a seen-ID index is configured (SEEN_INDEX_PATH) the ETag of every chunk response and 
+    the last seen statistics of every channel are stored in the index. Subsequent runs make
+    conditional requests w/ an If-None-Match header and a 304 Not Modified response is
+    served from the stored statistics, so unchanged channels are re-polled without 
+    re-downloading their stats.
+
+    The quota units spent per run are tracked against YOUTUBE_QUOTA_BUDGET. Channels are 
+    requested in order of their CHANNEL_PRIORITY and the chunks that no longer fit within 
+    the budget are deferred to the next run.
+
     Example:
         test_pipeline = DailyYoutubeChannelStatsPipeline(
             CHANNEL_ID="UCmEu9Y8nodUV0jvsR9NYLJA",
@@ -35,6 +88,32 @@ class DailyYoutubeChannelStatsPipeline(Pipeline):
             VELKOZZ_API_URL="http://127.0.0.1:8000"
         )
 
+    Arguments:
+        CHANNEL_ID (str|list): The youtube channel id or a list of channel ids.
+
+        CHANNEL_NAME (str|dict, optional): The name of the channel or a dict mapping each
+            channel id to its name.
+
+        GOOGLE_API_KEY (str): The Google developer API key.
+
+        YOUTUBE_MAX_WORKERS (int, optional): The number of id chunks requested concurrently. 
+            Defaults to 4.
+
+        YOUTUBE_DISCOVERY_PATH (str, optional): The path to a saved youtube v3 discovery document. 
+            Defaults to the discovery document bundled w/ google-api-python-client.
+
+        CHANNEL_PRIORITY (dict, optional): A dict mapping channel ids to a priority. Channels w/ a 
+            higher priority are requested first. Channels not in the dict have a priority of 0.
+
+        YOUTUBE_QUOTA_BUDGET (int, optional): The number of quota units a single run may spend. 
+            Defaults to no limit.
+
+        YOUTUBE_QUOTA_COST (int, optional): The quota units charged per channels().list call. 
+            Defaults to 1.
+
+        YOUTUBE_NOT_MODIFIED_COST (int, optional): The quota units counted for a call answered w/ 
+            304 Not Modified. Defaults to 0.
+
     """
     def __init__(self, **kwargs):
 
@@ -44,13 +123,21 @@ class DailyYoutubeChannelStatsPipeline(Pipeline):
         # Extracting channel configuration params: 
         self.channel_id = kwargs.get("CHANNEL_ID", None)         
         self.channel_name = kwargs.get("CHANNEL_NAME", None)
+        self.max_workers = int(kwargs.get("YOUTUBE_MAX_WORKERS", 4))
+        self.channel_priority = kwargs.get("CHANNEL_PRIORITY", {})
+
+        # Quota accounting params:
+        quota_budget = kwargs.get("YOUTUBE_QUOTA_BUDGET", None)
+        self.quota = QuotaAccountant(int(quota_budget) if quota_budget is not None else None)
+        self.quota_cost = int(kwargs.get("YOUTUBE_QUOTA_COST", 1))
+        self.not_modified_cost = int(kwargs.get("YOUTUBE_NOT_MODIFIED_COST", 0))
 
         # Extracting Google-Youtube Developer API:
         self.google_api_key = kwargs.get("GOOGLE_API_KEY", None)
 
-        # Building the Google API service:
+        # Retrieving the process-wide Google API service built from a static discovery document:
         try:
-            self.youtube_api_obj = build("youtube", "v3", developerKey=self.google_api_key)
+            self.youtube_api_obj = get_youtube_client(self.google_api_key, kwargs.get("YOUTUBE_DISCOVERY_PATH", None))
             self.logger.info(f"Google API service initialized as youtube v3 service: {self.youtube_api_obj}", "youtube_daily", "pipeline", 200)
         
         except Exception as e:
@@ -60,129 +147,224 @@ class DailyYoutubeChannelStatsPipeline(Pipeline):
         # Building Velkozz Channel Data Endpoint:
         self.youtube_endpoint = f"{self.web_api_url}/social_media_api/youtube/channel_daily/"
 
-        self.logger.info(f"Executing Daily Youtube Channel Stats Pipeline", "youtube_daily", "pipeline", 200)
+        self.logger.info("Executing Daily Youtube Channel Stats Pipeline", "youtube_daily", "pipeline", 200)
         self.execute_pipeline()
 
     def extract_channel_stats(self):
         """The method uses the Google-Youtube-API to query daily channel statistics for the specific
-        youtube channel given by the channel ID or the channel name. 
+        youtube channels given by the channel IDs. 
 
-        This data is passed on in its raw format to the transform method where specific channel stats 
-        are extracted.
+        The channel ids are ordered by priority and split into chunks of at most 50 ids. Each 
+        chunk is requested via a single channels().list call. The chunks are requested 
+        concurrently, each on its own http object as the underlying httplib2 connection is not 
+        thread-safe. Quota units are reserved for each chunk before it is requested and the 
+        chunks that do not fit within the quota budget of the run are deferred. The channel items
+        of every response are passed on in their raw format to the transform method where specific 
+        channel stats are extracted.
 
         Yields:
-            Dict: The dict containing the raw response data extracted from the Google-Youtube-API.
+            List: The list of raw channel items extracted from every Google-Youtube-API response.
 
         """
-        # Making the response to the Google API:
-        try:
-            if self.channel_id is not None: # Make request for youtube channel based on ID over channel name.
-                
-                #  If the CHANNEL_ID is a lists, iterate through the lists and generate response objects:
-                if isinstance(self.channel_id, list):
-                    for id in self.channel_id:
-                        response = self.youtube_api_obj.channels().list(
-                            part="statistics",
-                            id=self.channel_id)
-                        self.logger.info(f"Built Youtube API response object with Channel ID {self.channel_id}. Response: {response}", "youtube_daily", "pipeline", 200)
+        if self.channel_id is None: 
+            self.logger.error("No CHANNEL_ID found. Exiting the Pipeline w/o making a request to the Google API.",  "youtube_daily", "pipeline", 400)
+            return
 
-                        self.logger.info(f"Successfully Created Google-Youtube Channel Response Object: {response}", "youtube_daily", "pipeline", 200)
+        channel_ids = [self.channel_id] if isinstance(self.channel_id, str) else list(self.channel_id)
+        channel_ids = sorted(channel_ids, key=lambda channel_id: -self.channel_priority.get(channel_id, 0))
+        pending_chunks = chunk_list(channel_ids, 50)
 
-                        response = response.execute()
-                        self.logger.info(f"Executed response object, querying the Youtube-API",  "youtube_daily", "pipeline", 200)
+        # Requesting the chunks in priority order in waves that fit the remaining quota budget:
+        responses = []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending_chunks)))) as executor:
+            while pending_chunks:
+                wave = []
+                while pending_chunks and self.quota.reserve(self.quota_cost):
+                    wave.append(pending_chunks.pop(0))
 
-                        yield response
-                
-                else:
-                    response = self.youtube_api_obj.channels().list(
-                        part="statistics",
-                        id=self.channel_id)
-                    self.logger.info(f"Built Youtube API response object with Channel ID {self.channel_id}. Response: {response}", "youtube_daily", "pipeline", 200)
-            
-                    self.logger.info(f"Successfully Created Google-Youtube Channel Response Object: {response}", "youtube_daily", "pipeline", 200)
-                    
-                    response = response.execute()
-                    
-                    self.logger.info(f"Executed response object, querying the Youtube-API",  "youtube_daily", "pipeline", 200)
+                if len(wave) < 1:
+                    break
 
-                    yield response
+                responses.extend(executor.map(self._request_channel_stats, wave))
 
-            else:
-                self.logger.error(f"No CHANNEL_ID found. Exiting the Pipeline w/o making a request to the Google API.",  "youtube_daily", "pipeline", 400)
-                return                
+        if len(pending_chunks) > 0:
+            deferred_ids = [channel_id for chunk in pending_chunks for channel_id in chunk]
+            self.logger.warning(f"Quota budget of {self.quota.budget} units exhausted. Deferred {len(deferred_ids)} channels to the next run: {deferred_ids}", "youtube_daily", "pipeline", 301)
+
+        channel_items = [item for response in responses if response is not None for item in response.get("items", [])]
+        self.logger.info(f"Extracted statistics for {len(channel_items)} of {len(channel_ids)} channels in {len(responses)} requests using {self.quota.spent} quota units",  "youtube_daily", "pipeline", 200)
+
+        yield channel_items
+
+    def _request_channel_stats(self, channel_ids):
+        """The method makes a single channels().list request to the Google-Youtube-API for a 
+        chunk of up to 50 channel ids.
+
+        If the ETag of the last response for the chunk and the last seen stats of every channel
+        in the chunk are stored in the seen-ID index the request is made conditional. A 304 Not 
+        Modified response is served from the stored stats and the units reserved for the request
+        in excess of YOUTUBE_NOT_MODIFIED_COST are refunded to the quota budget.
+
+        Args:
+            channel_ids (list): The chunk of channel ids.
+
+        Returns:
+            Dict|None: The raw response dict or None if the request failed.
+
+        """
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import build_http
+
+        chunk_key = ",".join(sorted(channel_ids))
+        etag, cached_items = self._get_cached_channel_stats(chunk_key, channel_ids)
+
+        try:
+            request = self.youtube_api_obj.channels().list(
+                part="statistics",
+                id=",".join(channel_ids),
+                maxResults=len(channel_ids))
             
+            if etag is not None:
+                request.headers["If-None-Match"] = etag
+
+            # Capturing the http headers of the response as execute() only returns the body:
+            response_headers = {}
+            def postproc(resp, content, _postproc=request.postproc):
+                response_headers.update(resp)
+                return _postproc(resp, content)
+            request.postproc = postproc
+
+            self.logger.info(f"Built Youtube API request object for {len(channel_ids)} Channel IDs. Request: {request}", "youtube_daily", "pipeline", 200)
+
+            # Executing the request on a dedicated http object for thread-safety:
+            response = request.execute(http=build_http())
+            self.logger.info("Executed request object, querying the Youtube-API",  "youtube_daily", "pipeline", 200)
+
+            self._store_channel_stats(chunk_key, response_headers.get("etag", response.get("etag")), response)
+
+            return response
+
+        except HttpError as e:
+            if e.resp.status == 304 and cached_items is not None:
+                self.quota.refund(self.quota_cost - self.not_modified_cost)
+                self.logger.info(f"Statistics of {len(channel_ids)} Channel IDs not modified. Using the last seen statistics", "youtube_daily", "pipeline", 200)
+                return {"items": cached_items}
+
+            self.logger.warning(f"Unable to query the Google-Youtube API for Channel IDs {channel_ids}. Exited w/ Error {e}",  "youtube_daily", "pipeline", 400)
+            return None
+
         except Exception as e:
-            self.logger.warning(f"Unable to build Google-Youtube Response object. Exited w/ Error {e}",  "youtube_daily", "pipeline", 400)
+            self.logger.warning(f"Unable to query the Google-Youtube API for Channel IDs {channel_ids}. Exited w/ Error {e}",  "youtube_daily", "pipeline", 400)
+            return None
+
+    def _get_cached_channel_stats(self, chunk_key, channel_ids):
+        """The method reads the ETag of a chunk and the last seen stats of its channels from the
+        seen-ID index.
+
+        Returns:
+            tuple: The ETag and the list of stored channel items, or (None, None) if the index is not
+                configured or the stats of any channel in the chunk are missing.
+
+        """
+        if self.seen_index is None:
+            return None, None
+
+        etag = self.seen_index.get_values("youtube_etags", [chunk_key]).get(chunk_key)
+        channel_stats = self.seen_index.get_values("youtube_channel_stats", channel_ids)
+
+        # A conditional request is only made if every channel can be served from the index:
+        if etag is None or any(channel_id not in channel_stats for channel_id in channel_ids):
+            return None, None
+
+        return etag, [json.loads(channel_stats[channel_id]) for channel_id in channel_ids]
+
+    def _store_channel_stats(self, chunk_key, etag, response):
+        """The method writes the ETag of a chunk response and the stats of every channel in the 
+        response to the seen-ID index.
+        """
+        if self.seen_index is None or etag is None:
             return
-   
+
+        self.seen_index.mark_seen(
+            "youtube_channel_stats", 
+            {channel_item["id"]: json.dumps(channel_item) for channel_item in response.get("items", [])})
+        self.seen_index.mark_seen("youtube_etags", {chunk_key: etag})
+
     def transform_channel_stats(self, *args):
-        """The method recieves the response dict from the extraction method and unpacks the
-        key params from said response dict. 
+        """The method recieves the list of channel items from the extraction method and unpacks the
+        key params from each channel item. 
 
-        It re-builds the dict into a formatted request payload to be sent to the Velkozz REST API.
+        It re-builds each item into a formatted request payload row to be sent to the Velkozz REST API.
         The method constrcuts the following request payload:
 
-        {
-            "channel_id": "specific_channel_id",
-            "channel_name": "Specific Channel name or None",
-            "viewCount": 2124343,
-            "subscriberCount": 3423523,
-            "videoCount": 223
-        }
+        [
+            {
+                "channel_id": "specific_channel_id",
+                "channel_name": "Specific Channel name or None",
+                "viewCount": 2124343,
+                "subscriberCount": 3423523,
+                "videoCount": 223
+            },
+            ...
+        ]
 
         Yields:
-            A length one list containing a dictionary as a fully formatted request payload.
+            A list containing a dictionary as a fully formatted request payload row for every channel.
         """
-        # Unpacking the response tuple:
-        response = args[0]
-        channel_items = response["items"][0]
-        channel_stats = channel_items["statistics"]
+        # Unpacking the channel items tuple:
+        channel_items = args[0]
+
+        self.logger.info(f"Unpacking channel data from {len(channel_items)} channel items", "youtube_daily", "pipeline", 200)
+        payload = [self._build_channel_payload_row(channel_item) for channel_item in channel_items]
+
+        yield payload
+
+    def _build_channel_payload_row(self, channel_item):
+        """The method extracts the key variables from a single channel item of the
+        Google-Youtube-API response and builds the payload row for the channel.
+
+        Args:
+            channel_item (dict): The channel item containing the channel id and statistics.
+
+        Returns:
+            Dict: The payload row of the channel.
+
+        """
+        channel_stats = channel_item.get("statistics", {})
 
         # Extracting key variables:
-        self.logger.info(f"Unpacking channel data from response object dict", "youtube_daily", "pipeline", 200)
-        channel_id = channel_items.get("id", None)
+        channel_id = channel_item.get("id", None)
         viewCount = channel_stats.get("viewCount", None)
         subscriberCount = channel_stats.get("subscriberCount", None)
         videoCount = channel_stats.get("videoCount")
 
-        # Building Payload Dict if all variables are correctly extracted from response dict:
-        if None not in {channel_id, viewCount, subscriberCount, videoCount}: # Only if all values are not none.
-
-            # Building request payload:
-            self.logger.info(f"Building payload json dict. All data point sucessfully extracted and are not None.",  "youtube_daily", "pipeline", 200)
-            payload = [{
-                "channel_id":channel_id,
-                "channel_name": self.channel_name,
-                "viewCount": viewCount,
-                "subscriberCount": subscriberCount,
-                "videoCount": videoCount
-            }]
-        
-        else: # Some of the values are none.
-            self.logger.info(f"Building payload json dict. Not all data points have been found. Some are None. Channel ID: {channel_id}, Channel Name: {self.channel_name}, viewCounts: {viewCount}, subscriberCount: {subscriberCount}, videoCount: {videoCount}", "youtube_daily", "pipeline", 200)
-            payload = [{
-                "channel_id":channel_id,
-                "channel_name": self.channel_name,
-                "viewCount": viewCount,
-                "subscriberCount": subscriberCount,
-                "videoCount": videoCount
-            }]
+        # Mapping the channel id to its name if a dict of channel names is provided:
+        channel_name = self.channel_name.get(channel_id) if isinstance(self.channel_name, dict) else self.channel_name
 
-        yield payload
+        if None in {channel_id, viewCount, subscriberCount, videoCount}: # Some of the values are none.
+            self.logger.info(f"Building payload json dict. Not all data points have been found. Some are None. Channel ID: {channel_id}, Channel Name: {channel_name}, viewCounts: {viewCount}, subscriberCount: {subscriberCount}, videoCount: {videoCount}", "youtube_daily", "pipeline", 200)
+
+        return {
+            "channel_id":channel_id,
+            "channel_name": channel_name,
+            "viewCount": viewCount,
+            "subscriberCount": subscriberCount,
+            "videoCount": videoCount
+        }
 
     def load_channel_stats(self, *args):
-        """The method recieves the built payload dict from the transformation method and
-        writes the youtube chanel data to the Velkozz REST API.
+        """The method recieves the built payload rows of every channel from the transformation 
+        method and writes the youtube chanel data to the Velkozz REST API in a single POST request.
         """
         # Unpacking Channel Payload data:
         channel_data_payload = args[0]
 
         if len(channel_data_payload) < 1:
-            self.logger.warning(f"Only {len(posts_dict)} data points found. Existing w/o making a POST request to the API", "youtube_daily", "pipeline", 301)
+            self.logger.warning(f"Only {len(channel_data_payload)} data points found. Existing w/o making a POST request to the API", "youtube_daily", "pipeline", 301)
             return
         
         else:
-            self.logger.info(f"Making POST request to the Web API to write daily channel data", "youtube_daily", "pipeline", 200)
+            self.logger.info(f"Making POST request to the Web API to write daily channel data for {len(channel_data_payload)} channels", "youtube_daily", "pipeline", 200)
             
         # Making POST request to the API:
         try:
@@ -213,6 +395,8 @@ class DailyYoutubeChannelStatsPipeline(Pipeline):
                 parameter and that will be executed by the self.execute_pipeline method.
         
         """
+        import bonobo
+
         # Building the Graph:
         self.graph = bonobo.Graph()    
 
@@ -1,21 +1,16 @@
-# Importing Data Manipulation packages:
-import pandas as pd
-import bonobo
-import os
-from datetime import date, timedelta, datetime
-import pytz
-import requests
-import json
-import itertools
+# Importing native packages:
 from datetime import datetime
+import itertools
 import collections
 
+# Importing external packages:
+import requests
+
 # Importing internal modules:
 from vdeveloper_api.velkozz_pipelines.core_objects import Pipeline
 from vdeveloper_api.velkozz_pipelines.utils import logger
 
 # Python API Wrappers:
-from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
 #from vdeveloper_api.velkozz_pywrapper.api_utils.quant_data_utils.social_media_utils import build_wsb_ticker_freq
 
 class WSBTickerFrequencyPipeline(Pipeline):
@@ -40,7 +35,9 @@ class WSBTickerFrequencyPipeline(Pipeline):
         # Initalizing the parent Pipeline object:
         super(WSBTickerFrequencyPipeline, self).__init__(**kwargs)
 
-        # Creating connection to the REST API:
+        # Creating connection to the REST API, the wrapper pulls in pandas so it is imported on use:
+        from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
+
         if self.web_api_url is None:
             self.velkozz_con = VelkozzAPI(token=self.token)
         else:
@@ -203,6 +200,8 @@ class WSBTickerFrequencyPipeline(Pipeline):
         Returns: 
             dict: The dictionary containing ticker frequency counts.
         """
+        import pandas as pd
+
         # Nested function to extract tickers from abody of text:
         def get_ticker(text):
         
@@ -224,7 +223,7 @@ class WSBTickerFrequencyPipeline(Pipeline):
             return tickers 
         
         # Slicing dataframe to contain only relevant data:
-        post_content_df = wsb_posts_df[["title", "content", "created_on"]]
+        post_content_df = wsb_posts_df[["title", "content", "created_on"]].copy()
         post_content_df.set_index("created_on", inplace=True)
         
         # Resetting Index to a datetime object:
@@ -247,7 +246,7 @@ class WSBTickerFrequencyPipeline(Pipeline):
             date = datetime.strftime(day,'%Y-%m-%d')
             
             # Daily df slice:
-            dayslice_df = post_content_df[date]
+            dayslice_df = post_content_df.loc[date]
             
             # Extracing list of ticker variables:
             unique_title_tickers = [item for items in dayslice_df["title_tickers"].values for item in items]
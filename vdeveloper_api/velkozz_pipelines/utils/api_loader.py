@@ -0,0 +1,153 @@
+# Importing native packages:
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing external packages:
+import requests
+from requests.adapters import HTTPAdapter
+
+# Importing internal modules:
+from vdeveloper_api.velkozz_pipelines.utils.rate_limiter import TokenBucket
+
+class AsyncAPILoader(object):
+    """An object that writes payloads to the Velkozz REST API asynchronously so that
+    a pipeline's load step does not block its extraction and transformation steps.
+
+    POST requests are submitted to a small thread pool that shares a single pooled
+    requests.Session (keep-alive connections are reused between requests). The request
+    rate is controlled by a TokenBucket that adapts to the responses of the API using
+    additive-increase/multiplicative-decrease: every sucessful response raises the rate
+    by one request per second up to max_rate, while every 429 or 5xx response halves it
+    down to min_rate and the request is retried after the Retry-After delay of the response.
+
+    Example:
+        loader = AsyncAPILoader(token="api token")
+        loader.submit("http://localhost:8000/news_api/news_articles/", [{...}, {...}])
+        loader.close() # Blocks until every submitted payload has been written.
+
+    Arguments:
+        token (str): The Velkozz REST API token.
+
+        max_workers (int, optional): The number of concurrent POST requests. Defaults to 4.
+
+        requests_per_second (int|float, optional): The inital request rate. Defaults to 5.
+
+        min_rate (int|float, optional): The lowest rate the loader backs off to. Defaults to 0.5.
+
+        max_rate (int|float, optional): The highest rate the loader ramps up to. Defaults to 50.
+
+        max_retries (int, optional): The number of times a throttled or failed request is retried.
+            Defaults to 3.
+
+        logger (function, optional): The function called w/ a string to log request outcomes.
+
+    """
+    # Response status codes that indicate the API is overloaded and the request should be retried:
+    _retry_status_codes = {429, 500, 502, 503, 504}
+
+    def __init__(self, token, max_workers=4, requests_per_second=5, min_rate=0.5, max_rate=50, max_retries=3, logger=print):
+
+        self.token = token
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_retries = max_retries
+        self.logger = logger
+
+        # Pooled HTTP session sized to the number of concurrent requests:
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.session.headers.update({"Authorization": f"Token {self.token}"})
+
+        self.rate = float(requests_per_second)
+        self.rate_limiter = TokenBucket(rate=self.rate, per=1, capacity=max(1, max_workers))
+        self._rate_lock = threading.Lock()
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = []
+
+    def submit(self, endpoint, payload, on_success=None):
+        """Method submits a payload to be written to an API endpoint and returns immediately.
+
+        Args:
+            endpoint (str): The url of the REST API endpoint.
+
+            payload (list|dict): The JSON serializable payload of the POST request.
+
+            on_success (function|None, optional): A function called w/ the response once the
+                payload has been sucessfully written. Exceptions raised by it are logged, not raised.
+
+        Returns:
+            concurrent.futures.Future: The future that resolves to the final response or None.
+
+        """
+        future = self.executor.submit(self._post, endpoint, payload, on_success)
+        self.futures.append(future)
+
+        return future
+
+    def close(self):
+        """Method blocks until every submitted payload has been written and shuts the
+        thread pool and session down.
+
+        Returns:
+            int: The number of payloads that were sucessfully written.
+        """
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+        return sum(1 for future in self.futures if future.result() is not None)
+
+    def _post(self, endpoint, payload, on_success):
+        """Method makes the rate limited POST request, adapting the rate and retrying
+        throttled requests.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+
+            try:
+                response = self.session.post(endpoint, json=payload)
+            except Exception as e:
+                self.logger(f"Error in Making POST Request to {endpoint} (attempt {attempt + 1}) w/ Error: {e}")
+                self._decrease_rate()
+                time.sleep(2 ** attempt)
+                continue
+
+            if response.status_code in self._retry_status_codes:
+                self._decrease_rate()
+                retry_after = response.headers.get("Retry-After")
+                retry_delay = float(retry_after) if retry_after is not None and retry_after.isdigit() else 2 ** attempt
+
+                self.logger(f"POST request to {endpoint} throttled w/ Status Code {response.status_code}. Retrying in {retry_delay}s at {self.rate:.2f} requests/s")
+                time.sleep(retry_delay)
+                continue
+
+            if response.status_code > 301:
+                self.logger(f"POST request to {endpoint} failed w/ Status Code {response.status_code}. Response: {response.text}")
+                return None
+
+            self._increase_rate()
+            self.logger(f"Made POST request to {endpoint} <Length {len(payload)}> w/ Status Code: {response.status_code}")
+
+            # The payload is already written, a failing callback must not surface from close():
+            if on_success is not None:
+                try:
+                    on_success(response)
+                except Exception as e:
+                    self.logger(f"on_success callback for POST request to {endpoint} failed w/ Error: {e}")
+
+            return response
+
+        self.logger(f"POST request to {endpoint} failed after {self.max_retries + 1} attempts. Payload of length {len(payload)} dropped")
+        return None
+
+    def _increase_rate(self):
+        with self._rate_lock:
+            self.rate = min(self.max_rate, self.rate + 1)
+            self.rate_limiter.set_rate(self.rate)
+
+    def _decrease_rate(self):
+        with self._rate_lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.rate_limiter.set_rate(self.rate)
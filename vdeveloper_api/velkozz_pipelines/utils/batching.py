@@ -0,0 +1,24 @@
+# Batching helpers shared by pipeline extraction and loading methods:
+def chunk_list(items, chunk_size):
+    """Method splits a list into consecutive chunks of at most chunk_size
+    elements. It is used to split large extracted datasets into batched
+    API requests and batched POST payloads.
+
+    Example:
+        chunk_list([1, 2, 3, 4, 5], 2) = [[1, 2], [3, 4], [5]]
+
+    Args:
+        items (list): The list of elements to be split into chunks.
+
+        chunk_size (int): The maximum number of elements in each chunk.
+
+    Returns:
+        list: A list of lists where each nested list is a chunk of the input list.
+
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be a positive integer. Recieved: {chunk_size}")
+
+    items = list(items)
+
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
@@ -0,0 +1,262 @@
+# Importing native packages:
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Importing external packages:
+import requests
+
+class CachedResponse(object):
+    """A minimal stand-in for a requests.Response object returned by the HTTPCache.
+
+    It exposes the attributes of a response that are used by the pipelines (status_code,
+    headers, content, text, json()) as well as flags indicating if the body was served
+    from the cache.
+
+    Arguments:
+        url (str): The url that was requested.
+
+        status_code (int): The status code of the original (non 304) response.
+
+        headers (dict): The headers of the original response.
+
+        content (bytes): The body of the response.
+
+        encoding (str|None): The text encoding of the body.
+
+        from_cache (bool): True if the body was read from the cache instead of the network.
+
+        not_modified (bool): True if the server confirmed the cached body w/ a 304 response.
+
+    """
+    def __init__(self, url, status_code, headers, content, encoding, from_cache=False, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+class HTTPCache(object):
+    """A content-addressed on-disk HTTP response cache shared by the scraping pipelines.
+
+    Response bodies are gzip compressed and stored under the sha256 hash of their content
+    so identical bodies served from different urls are only stored once. A small JSON entry
+    keyed by the sha256 hash of the url records the ETag, Last-Modified header and body hash
+    of the most recent response for that url:
+
+        cache_dir/
+            entries/<url hash>.json
+            bodies/<content hash>.gz
+
+    When a cached url is requested again a conditional GET is made w/ If-None-Match and
+    If-Modified-Since headers. If the server responds w/ 304 Not Modified the cached body
+    is served without being re-downloaded. The cache is bounded to max_bytes of compressed
+    bodies by evicting the least recently used entries.
+
+    In offline mode no requests are made and only cached responses are served, which lets
+    the cache double as a record/replay fixture store for offline benchmarks.
+
+    Example:
+        cache = HTTPCache("~/.velkozz/http_cache", max_bytes=256*1024*1024)
+        response = cache.get("https://restcountries.com/v3/all")
+        response.not_modified # True if the server returned 304.
+
+    Arguments:
+        cache_dir (str): The directory the cache is stored in.
+
+        max_bytes (int, optional): The maximum total size of the compressed bodies. Defaults to 512MB.
+
+        offline (bool, optional): Serve only cached responses w/o making requests. Defaults to False.
+
+        session (requests.Session|None, optional): The default session used to make requests.
+
+    """
+    def __init__(self, cache_dir, max_bytes=512*1024*1024, offline=False, session=None):
+
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.session = session if session is not None else requests.Session()
+
+        self._entries_dir = os.path.join(self.cache_dir, "entries")
+        self._bodies_dir = os.path.join(self.cache_dir, "bodies")
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._bodies_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, session=None, timeout=None):
+        """Method makes a cached GET request to a url.
+
+        Args:
+            url (str): The url being requested.
+
+            params (dict|None, optional): Query params that are added to the url.
+
+            headers (dict|None, optional): Additional request headers.
+
+            session (requests.Session|None, optional): The session used to make the request,
+                defaults to the session of the cache.
+
+            timeout (int|float|None, optional): The timeout of the request in seconds.
+
+        Returns:
+            CachedResponse: The response, either downloaded or served from the cache.
+
+        """
+        if params:
+            url = requests.Request("GET", url, params=params).prepare().url
+
+        entry = self._read_entry(url)
+
+        if self.offline:
+            if entry is None:
+                raise LookupError(f"No cached response for {url} in offline HTTPCache {self.cache_dir}")
+            return self._cached_response(url, entry, not_modified=False)
+
+        # Adding conditional GET headers if the url has been cached:
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = (session or self.session).get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            self._touch_entry(url)
+            return self._cached_response(url, entry, not_modified=True)
+
+        # Only sucessful responses are stored:
+        if response.status_code == 200:
+            self._store(url, response)
+
+        return CachedResponse(
+            url,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            response.encoding or response.apparent_encoding)
+
+    def _store(self, url, response):
+        """Method writes the body and entry of a sucessful response to the cache and
+        evicts old entries if the cache exceeds its size bound.
+        """
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        body_path = os.path.join(self._bodies_dir, f"{content_hash}.gz")
+
+        with self._lock:
+            if not os.path.exists(body_path):
+                self._atomic_write(body_path, gzip.compress(response.content))
+
+            entry = {
+                "url": url,
+                "status_code": response.status_code,
+                "headers": {key: value for key, value in response.headers.items() if key.lower() in ("content-type", "etag", "last-modified")},
+                "encoding": response.encoding or response.apparent_encoding,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": content_hash,
+                "stored_at": time.time()
+            }
+            self._atomic_write(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+
+            self._evict()
+
+    def _evict(self):
+        """Method deletes the least recently used entries until the compressed bodies
+        fit within max_bytes, then deletes bodies no longer referenced by an entry.
+        Must be called with the lock held.
+        """
+        body_sizes = {
+            body_file.name[:-3]: body_file.stat().st_size
+            for body_file in os.scandir(self._bodies_dir) if body_file.name.endswith(".gz")}
+
+        if sum(body_sizes.values()) <= self.max_bytes:
+            return
+
+        # Entries are ordered by access time, the mtime of the entry file is updated on every hit:
+        entries = sorted(
+            (entry_file for entry_file in os.scandir(self._entries_dir) if entry_file.name.endswith(".json")),
+            key=lambda entry_file: entry_file.stat().st_mtime)
+
+        referenced_bodies = {}
+        for entry_file in entries:
+            with open(entry_file.path, "r") as f:
+                content_hash = json.load(f)["content_hash"]
+            referenced_bodies.setdefault(content_hash, []).append(entry_file.path)
+
+        total_bytes = sum(body_sizes.values())
+        for entry_file in entries:
+            if total_bytes <= self.max_bytes:
+                break
+
+            with open(entry_file.path, "r") as f:
+                content_hash = json.load(f)["content_hash"]
+            os.remove(entry_file.path)
+
+            # Removing the body once no remaining entry references it:
+            referenced_bodies[content_hash].remove(entry_file.path)
+            if not referenced_bodies[content_hash] and content_hash in body_sizes:
+                os.remove(os.path.join(self._bodies_dir, f"{content_hash}.gz"))
+                total_bytes -= body_sizes.pop(content_hash)
+
+    def _cached_response(self, url, entry, not_modified):
+        """Method builds a CachedResponse from a stored entry and its body."""
+        with open(os.path.join(self._bodies_dir, f"{entry['content_hash']}.gz"), "rb") as body_file:
+            content = gzip.decompress(body_file.read())
+
+        return CachedResponse(
+            url,
+            entry["status_code"],
+            entry["headers"],
+            content,
+            entry["encoding"],
+            from_cache=True,
+            not_modified=not_modified)
+
+    def _read_entry(self, url):
+        """Method returns the stored entry for a url or None if the url is not cached or
+        the body of the entry has been evicted.
+        """
+        try:
+            with open(self._entry_path(url), "r") as entry_file:
+                entry = json.load(entry_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if not os.path.exists(os.path.join(self._bodies_dir, f"{entry['content_hash']}.gz")):
+            return None
+
+        return entry
+
+    def _touch_entry(self, url):
+        """Updates the access time of an entry used for least recently used eviction."""
+        try:
+            os.utime(self._entry_path(url))
+        except FileNotFoundError:
+            pass
+
+    def _entry_path(self, url):
+        return os.path.join(self._entries_dir, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json")
+
+    def _atomic_write(self, path, data):
+        """Writes bytes to a temporary file and renames it over the destination path."""
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
@@ -0,0 +1,263 @@
+# Importing native packages:
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Importing external packages:
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Query params whose values are redacted from recorded urls so api keys are not stored in cassettes:
+REDACTED_QUERY_PARAMS = {"key", "api_key", "apikey", "token", "access_token", "client_secret"}
+
+# Keys whose values are redacted from recorded JSON response bodies, eg: the api-token-auth and oauth responses:
+REDACTED_BODY_KEYS = {"token", "access_token", "refresh_token"}
+
+# Headers that are dropped from recorded responses as they carry credentials or session cookies:
+REDACTED_HEADERS = {"authorization", "cookie", "set-cookie"}
+
+class HTTPCassette(object):
+    """A context manager that records all of the outbound HTTP requests made while it is
+    active into a compressed cassette file, or replays a recorded cassette without making
+    any network requests.
+
+    Requests are intercepted at the transport level of the two HTTP clients used by the
+    pipelines: requests.adapters.HTTPAdapter.send (requests, praw, newspaper and the Velkozz
+    API clients) and httplib2.Http.request (the Google-Youtube-API client). Wrapping the
+    construction of a pipeline, which executes the pipeline, therefore records or replays its
+    extraction and load requests.
+
+    Recorded interactions are matched on the request method and url. If the same url was
+    requested more than once the recorded responses are replayed in order, preferring a
+    recording w/ an identical request body. The values of query params such as api keys are
+    redacted from the stored urls and request bodies are only stored as hashes. Auth and cookie 
+    headers are dropped and the values of token keys are redacted from JSON response bodies, so
+    replayed runs authenticate w/ a "REDACTED" token.
+
+    Example:
+        with HTTPCassette("reddit_run.cassette.json.gz", mode="record"):
+            RedditContentPipeline(**pipeline_kwargs)
+
+        with HTTPCassette("reddit_run.cassette.json.gz", mode="replay", latency="recorded"):
+            RedditContentPipeline(**pipeline_kwargs) # Runs offline w/ the recorded response times.
+
+    Arguments:
+        path (str): The path to the gzip compressed JSON cassette file.
+
+        mode (str, optional): Either "record" or "replay". Defaults to "replay".
+
+        latency (float|str|None, optional): The delay in seconds added to every replayed
+            response, or "recorded" to delay every response by the time the recorded request
+            took. Defaults to None, no delay.
+
+    """
+    def __init__(self, path, mode="replay", latency=None):
+
+        if mode not in ("record", "replay"):
+            raise ValueError(f"HTTPCassette mode must be 'record' or 'replay', not {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions = []
+
+        self._lock = threading.Lock()
+        self._replay_index = {}
+        self._originals = {}
+
+    def __enter__(self):
+        if self.mode == "replay":
+            self._load()
+        self._patch()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._unpatch()
+        if self.mode == "record":
+            self._save()
+
+    # <------ Transport patching ------>
+    def _patch(self):
+        cassette = self
+        self._originals["requests"] = HTTPAdapter.send
+
+        def send(adapter, request, **kwargs):
+            if cassette.mode == "replay":
+                return cassette._replay_requests_response(request)
+
+            start = time.perf_counter()
+            response = cassette._originals["requests"](adapter, request, **kwargs)
+            cassette._record(
+                request.method, request.url, request.body, response.status_code, response.reason,
+                dict(response.headers), response.content, time.perf_counter() - start)
+
+            return response
+
+        HTTPAdapter.send = send
+
+        try:
+            import httplib2
+        except ImportError:
+            return
+
+        self._originals["httplib2"] = httplib2.Http.request
+
+        def request(http, uri, method="GET", body=None, headers=None, *args, **kwargs):
+            if cassette.mode == "replay":
+                return cassette._replay_httplib2_response(uri, method, body)
+
+            start = time.perf_counter()
+            response, content = cassette._originals["httplib2"](http, uri, method, body, headers, *args, **kwargs)
+            cassette._record(
+                method, uri, body, response.status, response.reason,
+                {key: value for key, value in response.items() if key not in ("status", "content-location")},
+                content, time.perf_counter() - start)
+
+            return response, content
+
+        httplib2.Http.request = request
+
+    def _unpatch(self):
+        HTTPAdapter.send = self._originals.pop("requests")
+
+        if "httplib2" in self._originals:
+            import httplib2
+            httplib2.Http.request = self._originals.pop("httplib2")
+
+    # <------ Recording ------>
+    def _record(self, method, url, body, status_code, reason, headers, content, elapsed):
+        # Responses are stored decoded, so the content encoding header no longer applies:
+        headers = {
+            key: value for key, value in headers.items() 
+            if key.lower() not in ("content-encoding", "transfer-encoding", "content-length") and key.lower() not in REDACTED_HEADERS}
+
+        with self._lock:
+            self.interactions.append({
+                "method": method.upper(),
+                "url": _normalize_url(url),
+                "body_hash": _hash_body(body),
+                "status_code": int(status_code),
+                "reason": reason,
+                "headers": headers,
+                "content": base64.b64encode(_redact_content(content or b"")).decode("ascii"),
+                "elapsed": elapsed})
+
+    def _save(self):
+        """Atomically writes the recorded interactions to the gzip compressed cassette."""
+        cassette_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(cassette_dir, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=cassette_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(gzip.compress(json.dumps({"version": 1, "interactions": self.interactions}).encode("utf-8")))
+        os.replace(temp_path, self.path)
+
+    # <------ Replaying ------>
+    def _load(self):
+        with open(self.path, "rb") as cassette_file:
+            self.interactions = json.loads(gzip.decompress(cassette_file.read()))["interactions"]
+
+        for interaction in self.interactions:
+            interaction["used"] = False
+            self._replay_index.setdefault((interaction["method"], interaction["url"]), []).append(interaction)
+
+    def _find_interaction(self, method, url, body):
+        """Method returns the next unused recording of a request, preferring a recording
+        w/ the same body. Once every recording of a url has been used the last one is reused.
+        """
+        recordings = self._replay_index.get((method.upper(), _normalize_url(url)))
+        if not recordings:
+            raise requests.exceptions.ConnectionError(f"HTTPCassette {self.path} has no recorded response for {method} {url}")
+
+        body_hash = _hash_body(body)
+        with self._lock:
+            unused = [interaction for interaction in recordings if not interaction["used"]]
+            interaction = next(
+                (interaction for interaction in unused if interaction["body_hash"] == body_hash),
+                unused[0] if unused else recordings[-1])
+            interaction["used"] = True
+
+        if self.latency == "recorded":
+            time.sleep(interaction["elapsed"])
+        elif self.latency:
+            time.sleep(self.latency)
+
+        return interaction
+
+    def _replay_requests_response(self, request):
+        interaction = self._find_interaction(request.method, request.url, request.body)
+
+        response = requests.Response()
+        response.status_code = interaction["status_code"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        content = base64.b64decode(interaction["content"])
+
+        # Marking the body as read so iter_content() and stream=True requests serve the stored content:
+        response._content = content
+        response._content_consumed = True
+        response.raw = io.BytesIO(content)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def _replay_httplib2_response(self, uri, method, body):
+        import httplib2
+
+        interaction = self._find_interaction(method, uri, body)
+        response = httplib2.Response(dict(interaction["headers"], status=str(interaction["status_code"])))
+        response.reason = interaction["reason"]
+
+        return response, base64.b64decode(interaction["content"])
+
+def _normalize_url(url):
+    """Function sorts the query params of a url and redacts the values of sensitive params."""
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    params = sorted(
+        (name, "REDACTED" if name.lower() in REDACTED_QUERY_PARAMS else value)
+        for name, value in parse_qsl(query, keep_blank_values=True))
+
+    return urlunsplit((scheme, netloc, path, urlencode(params), ""))
+
+def _redact_content(content):
+    """Function redacts the values of token keys from a JSON response body. Bodies that are not 
+    JSON are returned unchanged. A gzip compressed JSON body is stored decompressed.
+    """
+    try:
+        decoded_content = gzip.decompress(content) if content[:2] == b"\x1f\x8b" else content
+        body = json.loads(decoded_content)
+    except (OSError, EOFError, ValueError):
+        return content
+
+    def redact(value):
+        if isinstance(value, dict):
+            return {key: "REDACTED" if key.lower() in REDACTED_BODY_KEYS else redact(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [redact(item) for item in value]
+        return value
+
+    redacted_body = redact(body)
+
+    # Bodies w/o any token keys are stored byte for byte:
+    return content if redacted_body == body else json.dumps(redacted_body).encode("utf-8")
+
+def _hash_body(body):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, bytes):
+        # Streamed or file bodies are matched on the url alone:
+        return None
+    return hashlib.sha256(body).hexdigest()
@@ -0,0 +1,49 @@
+# Importing native packages:
+import threading
+
+class QuotaAccountant(object):
+    """A thread-safe counter of the API quota units spent by a single pipeline run.
+
+    Units are reserved before a request is made and the request is skipped if the
+    reservation would exceed the budget of the run. Units can be refunded when a request
+    turns out to be cheaper than reserved (eg: a conditional request that was answered
+    w/ 304 Not Modified).
+
+    Example:
+        quota = QuotaAccountant(budget=100)
+        if quota.reserve(1):
+            ... # Make the request.
+        quota.remaining = 99
+
+    Arguments:
+        budget (int|float|None, optional): The number of units that can be spent. A None value
+            means the budget is unlimited. Defaults to None.
+
+    """
+    def __init__(self, budget=None):
+
+        self.budget = budget
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        return None if self.budget is None else self.budget - self.spent
+
+    def reserve(self, units=1):
+        """Method reserves units from the budget.
+
+        Returns:
+            bool: True if the units were reserved, False if the budget would be exceeded.
+        """
+        with self._lock:
+            if self.budget is not None and self.spent + units > self.budget:
+                return False
+
+            self.spent += units
+            return True
+
+    def refund(self, units=1):
+        """Method returns previously reserved units to the budget."""
+        with self._lock:
+            self.spent = max(0, self.spent - units)
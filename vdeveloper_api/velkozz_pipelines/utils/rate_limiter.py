@@ -0,0 +1,89 @@
+# Importing native packages:
+import threading
+import time
+
+class TokenBucket(object):
+    """A thread-safe token bucket used to keep pipeline requests within the
+    rate limit budget of an external service.
+
+    The bucket is refilled continuously at `rate` tokens per `per` seconds up to
+    a maximum of `capacity` tokens. Each request made to the rate limited service
+    calls the acquire() method which blocks until a token is avaliable. A single
+    bucket can be shared between any number of threads so that concurrent
+    extraction never exceeds the budget of the service.
+
+    Example:
+        reddit_bucket = TokenBucket(rate=60, per=60)
+        reddit_bucket.acquire() # Blocks if the 60 requests/min budget is spent.
+
+    Arguments:
+        rate (int|float): The number of tokens added to the bucket every `per` seconds.
+
+        per (int|float, optional): The period in seconds over which `rate` tokens are added.
+
+        capacity (int|float|None, optional): The maximum number of tokens the bucket can
+            hold. Defaults to `rate`, allowing a burst of one full period.
+
+    """
+    def __init__(self, rate, per=1.0, capacity=None):
+
+        if rate <= 0 or per <= 0:
+            raise ValueError(f"TokenBucket rate and period must be positive. Recieved rate: {rate}, per: {per}")
+
+        self.fill_rate = float(rate) / float(per)
+        self.capacity = float(capacity) if capacity is not None else float(rate)
+
+        # The bucket starts full so the first burst of requests is not delayed:
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Method removes `tokens` from the bucket, blocking the calling thread until
+        enough tokens have been refilled.
+
+        Args:
+            tokens (int|float, optional): The number of tokens the request costs.
+
+        Returns:
+            float: The number of seconds the calling thread spent waiting.
+
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket with capacity {self.capacity}")
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+
+                # Time until enough tokens are refilled for this request:
+                wait_time = (tokens - self._tokens) / self.fill_rate
+
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def set_rate(self, rate, per=1.0):
+        """Method changes the refill rate of the bucket in place. This allows
+        callers to adapt the budget to feedback from the rate limited service.
+
+        Args:
+            rate (int|float): The new number of tokens added every `per` seconds.
+
+            per (int|float, optional): The period in seconds over which `rate` tokens are added.
+
+        """
+        with self._lock:
+            self._refill()
+            self.fill_rate = float(rate) / float(per)
+
+    def _refill(self):
+        """Adds the tokens accumulated since the last refill. Must be called with
+        the lock held.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.fill_rate)
+        self._last_refill = now
@@ -0,0 +1,155 @@
+# Importing native packages:
+import os
+import sqlite3
+import threading
+import time
+
+class SeenIDIndex(object):
+    """A persistent local index of the ids of records that have already been written
+    to the Velkozz Web API by a pipeline.
+
+    The index is a single SQLite table keyed on (namespace, key). Each pipeline uses its
+    own namespace (eg: "reddit_posts", "indeed_listings", "news_articles") so that a single
+    index file can be shared by every pipeline on a machine. A key is only considered
+    seen if it was marked within the time-to-live of the index, which keeps the index
+    compact and allows records to be re-sent once they expire. An optional value can be
+    stored alongside each key (eg: a content hash) so that pipelines can detect changed
+    records as well as new ones.
+
+    The SQLite connection is shared between threads behind a lock as the bonobo graph
+    executes each node in its own thread.
+
+    Example:
+        seen_index = SeenIDIndex("velkozz_seen_ids.sqlite", ttl=60*60*24*30)
+        unseen_ids = seen_index.filter_unseen("reddit_posts", ["post_id_1", "post_id_2"])
+        seen_index.mark_seen("reddit_posts", unseen_ids)
+
+    Arguments:
+        path (str): The relative or absoloute path to the SQLite database file.
+
+        ttl (int|float|None, optional): The number of seconds a key is considered seen after it
+            was marked. A None value means that keys never expire. Defaults to 30 days.
+
+    """
+    # SQLite limits the number of parameters in a single query:
+    _max_query_params = 500
+
+    def __init__(self, path, ttl=60*60*24*30):
+
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        index_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(index_dir, exist_ok=True)
+
+        self._con = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._con:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute(
+                """CREATE TABLE IF NOT EXISTS seen_ids (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    seen_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID""")
+
+    def filter_unseen(self, namespace, keys, max_age=None):
+        """Method returns the keys that have not been marked as seen within the ttl
+        of the index. The order of the input keys is preserved.
+
+        Args:
+            namespace (str): The namespace of the pipeline that is querying the index.
+
+            keys (list): The list of record ids to check against the index.
+
+            max_age (int|float|None, optional): Only keys marked within the last max_age seconds
+                are considered seen. Defaults to the ttl of the index.
+
+        Returns:
+            list: The keys that have not been seen.
+
+        """
+        keys = [str(key) for key in keys]
+        seen_keys = set(self.get_values(namespace, keys, max_age).keys())
+
+        return [key for key in keys if key not in seen_keys]
+
+    def get_values(self, namespace, keys, max_age=None):
+        """Method returns the stored values for every key in the list that has been
+        marked as seen within the ttl of the index.
+
+        Args:
+            namespace (str): The namespace of the pipeline that is querying the index.
+
+            keys (list): The list of record ids to look up.
+
+            max_age (int|float|None, optional): Only keys marked within the last max_age seconds
+                are returned. Defaults to the ttl of the index.
+
+        Returns:
+            dict: A dict of {key: value} for each seen key. Keys marked w/o a value map to None.
+
+        """
+        keys = list(dict.fromkeys(str(key) for key in keys))
+
+        max_ages = [age for age in (self.ttl, max_age) if age is not None]
+        min_seen_at = time.time() - min(max_ages) if max_ages else 0
+
+        values = {}
+        with self._lock:
+            for i in range(0, len(keys), self._max_query_params):
+                keys_chunk = keys[i:i + self._max_query_params]
+                rows = self._con.execute(
+                    f"""SELECT key, value FROM seen_ids
+                    WHERE namespace = ? AND seen_at >= ? AND key IN ({",".join("?" * len(keys_chunk))})""",
+                    [namespace, min_seen_at, *keys_chunk])
+
+                values.update(rows.fetchall())
+
+        return values
+
+    def mark_seen(self, namespace, keys):
+        """Method marks keys as seen at the current time.
+
+        Args:
+            namespace (str): The namespace of the pipeline that is writing to the index.
+
+            keys (list|dict): Either a list of record ids or a dict of {key: value} when a
+                value such as a content hash is to be stored alongside each key.
+
+        """
+        key_values = keys.items() if isinstance(keys, dict) else ((key, None) for key in keys)
+        seen_at = time.time()
+
+        with self._lock, self._con:
+            self._con.executemany(
+                "INSERT OR REPLACE INTO seen_ids (namespace, key, value, seen_at) VALUES (?, ?, ?, ?)",
+                [(namespace, str(key), value, seen_at) for key, value in key_values])
+
+    def prune(self, max_age=None):
+        """Method deletes all keys older than max_age seconds from the index.
+
+        Args:
+            max_age (int|float|None, optional): The age in seconds after which keys are deleted.
+                Defaults to the ttl of the index.
+
+        Returns:
+            int: The number of keys that were deleted.
+
+        """
+        max_age = self.ttl if max_age is None else max_age
+        if max_age is None:
+            return 0
+
+        with self._lock, self._con:
+            cursor = self._con.execute(
+                "DELETE FROM seen_ids WHERE seen_at < ?", (time.time() - max_age,))
+
+        return cursor.rowcount
+
+    def close(self):
+        """Closes the connection to the SQLite database."""
+        with self._lock:
+            self._con.close()
@@ -0,0 +1,66 @@
+# Importing native packages:
+import json
+import os
+import tempfile
+import threading
+
+class JSONStateStore(object):
+    """A small persistent key-value store backed by a JSON file. It is used by
+    pipelines to persist state between runs, such as the resume cursor of a
+    streaming pipeline.
+
+    Every call to set() atomically rewrites the JSON file by writing to a temporary
+    file in the same directory and renaming it over the original. A pipeline that is
+    killed mid-write therefore never leaves a corrupted state file behind.
+
+    Example:
+        cursor_store = JSONStateStore("reddit_stream_cursor.json")
+        cursor_store.set("wallstreetbets", {"created_utc": 1618430400.0})
+        cursor_store.get("wallstreetbets") = {"created_utc": 1618430400.0}
+
+    Arguments:
+        path (str): The relative or absoloute path to the JSON file.
+
+    """
+    def __init__(self, path):
+
+        self.path = path
+        self._lock = threading.Lock()
+
+        # Loading existing state from the JSON file if it exists:
+        try:
+            with open(self.path, "r") as state_file:
+                self._state = json.load(state_file)
+        except (FileNotFoundError, ValueError):
+            self._state = {}
+
+    def get(self, key, default=None):
+        """Method returns the value stored for a key or the default if the key
+        has not been set.
+        """
+        with self._lock:
+            return self._state.get(key, default)
+
+    def set(self, key, value):
+        """Method stores a JSON serializable value for a key and persists the
+        whole state to disk.
+        """
+        with self._lock:
+            self._state[key] = value
+            self._write()
+
+    def _write(self):
+        """Atomically writes the state dict to the JSON file. Must be called with
+        the lock held.
+        """
+        state_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(state_dir, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=state_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w") as temp_file:
+                json.dump(self._state, temp_file)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.remove(temp_path)
+            raise
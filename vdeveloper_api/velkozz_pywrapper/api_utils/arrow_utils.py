@@ -0,0 +1,112 @@
+# Importing native packages:
+import uuid
+
+def _import_pyarrow():
+    """Function imports pyarrow, which is an optional dependency of the query API."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError("Arrow output requires pyarrow. Install it w/ pip install velkozz-developer-api[arrow]")
+
+    return pyarrow
+
+def records_to_arrow_table(records, drop_columns=()):
+    """Function builds an Arrow table directly from the list of JSON records returned by
+    the Velkozz REST API, without building an intermediate pandas dataframe.
+
+    Args:
+        records (list): The list of record dicts.
+
+        drop_columns (iterable, optional): The columns removed from the table (eg: "url").
+
+    Returns:
+        pyarrow.Table: The table w/ a column for every key of the records.
+    """
+    pa = _import_pyarrow()
+
+    table = pa.Table.from_pylist(records)
+    return table.drop_columns([column for column in drop_columns if column in table.column_names])
+
+def to_arrow_table(data):
+    """Function converts a pandas dataframe returned by the query API into an Arrow
+    table, keeping a named index as a column. Arrow tables are returned unchanged.
+    """
+    pa = _import_pyarrow()
+
+    if isinstance(data, pa.Table):
+        return data
+
+    return pa.Table.from_pandas(data, preserve_index=data.index.name is not None)
+
+def write_parquet_dataset(data, root_path, date_column, existing_data_behavior="overwrite_or_ignore"):
+    """Function writes a query API result to a Parquet dataset that is hive partitioned
+    by day:
+
+        root_path/
+            date=2021-06-01/part-<uuid>-0.parquet
+            date=2021-06-02/part-<uuid>-0.parquet
+
+    Every write adds new uniquely named files, so the results of successive queries can be
+    appended to the same dataset.
+
+    Args:
+        data (pyarrow.Table|pandas.DataFrame): The query API result.
+
+        root_path (str): The root directory of the dataset.
+
+        date_column (str): The date, datetime or ISO formatted date string column the dataset
+            is partitioned by (eg: "created_on", "date_posted", "day").
+
+        existing_data_behavior (str, optional): Passed to pyarrow.dataset.write_dataset. Defaults
+            to "overwrite_or_ignore".
+
+    """
+    pa = _import_pyarrow()
+    table = to_arrow_table(data)
+
+    date_values = table.column(date_column)
+    if pa.types.is_timestamp(date_values.type) or pa.types.is_date(date_values.type):
+        date_values = date_values.cast(pa.date32())
+    partition_values = pa.compute.utf8_slice_codeunits(date_values.cast(pa.string()), 0, 10)
+
+    pa.dataset.write_dataset(
+        table.append_column("date", partition_values),
+        root_path,
+        format="parquet",
+        partitioning=pa.dataset.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior=existing_data_behavior)
+
+def read_parquet_dataset(root_path, start_date=None, end_date=None, columns=None):
+    """Function reads a day partitioned Parquet dataset written by write_parquet_dataset.
+    Only the partitions between the start and end dates are read.
+
+    Args:
+        root_path (str): The root directory of the dataset.
+
+        start_date (str|None, optional): The first day (YYYY-MM-DD) that is read.
+
+        end_date (str|None, optional): The last day (YYYY-MM-DD) that is read.
+
+        columns (list|None, optional): The columns that are read. Defaults to every column.
+
+    Returns:
+        pyarrow.Table: The table of every record in the date range.
+    """
+    pa = _import_pyarrow()
+
+    dataset = pa.dataset.dataset(
+        root_path, 
+        format="parquet", 
+        partitioning=pa.dataset.partitioning(pa.schema([("date", pa.string())]), flavor="hive"))
+
+    date_filter = None
+    if start_date is not None:
+        date_filter = pa.dataset.field("date") >= start_date
+    if end_date is not None:
+        end_filter = pa.dataset.field("date") <= end_date
+        date_filter = end_filter if date_filter is None else date_filter & end_filter
+
+    return dataset.to_table(columns=columns, filter=date_filter)
@@ -53,7 +53,7 @@ def build_wsb_ticker_freq(wsb_posts_df, *args):
         return tickers 
     
     # Slicing dataframe to contain only relevant data:
-    post_content_df = wsb_posts_df[["title", "content", "created_on"]]
+    post_content_df = wsb_posts_df[["title", "content", "created_on"]].copy()
     post_content_df.set_index("created_on", inplace=True)
     
     # Resetting Index to a datetime object:
@@ -73,7 +73,7 @@ def build_wsb_ticker_freq(wsb_posts_df, *args):
         date = datetime.strftime(day,'%Y-%m-%d')
         
         # Daily df slice:
-        dayslice_df = post_content_df[date]
+        dayslice_df = post_content_df.loc[date]
         
         # Extracing list of ticker variables:
         unique_title_tickers = [item for items in dayslice_df["title_tickers"].values for item in items]
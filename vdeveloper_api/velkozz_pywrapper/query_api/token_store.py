@@ -0,0 +1,169 @@
+# Importing native packages:
+import json
+import os
+import tempfile
+import threading
+
+class TokenStore(object):
+    """A thread-safe cache of Velkozz Web API auth tokens keyed by the base url of the
+    API and the username the token was issued to.
+
+    Tokens are always cached in memory for the life of the process. If a path is provided
+    the tokens are also persisted to a JSON file that is only readable and writable by the
+    owner of the file (mode 0600) so that separate processes on the same machine can
+    share a token instead of each requesting one from the token auth endpoint.
+
+    Fetching and refreshing a token is serialized per (base url, username) key: if several
+    threads need a token for the same user at the same time only one of them requests it
+    and the others wait for and reuse its result.
+
+    Example:
+        token_store = TokenStore("~/.velkozz/tokens.json")
+        token = token_store.get_or_fetch("http://localhost:8000", "user", fetch_token)
+        token = token_store.refresh("http://localhost:8000", "user", token, fetch_token) # After a 401.
+
+    Arguments:
+        path (str|None, optional): The path to the JSON file tokens are persisted to. Defaults
+            to None, which only caches tokens in memory.
+
+    """
+    def __init__(self, path=None):
+
+        self.path = os.path.expanduser(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._tokens = self._read() if self.path is not None else {}
+
+    def get(self, base_url, username):
+        """Method returns the cached token for a user or None if no token is cached."""
+        with self._lock:
+            if self.path is not None:
+                self._tokens.update(self._read())
+            return self._tokens.get(self._key(base_url, username))
+
+    def set(self, base_url, username, token):
+        """Method caches the token of a user and persists it if the store has a path."""
+        with self._lock:
+            self._tokens[self._key(base_url, username)] = token
+            if self.path is not None:
+                self._write()
+
+    def invalidate(self, base_url, username, token=None):
+        """Method removes the cached token of a user. If a token is provided it is only
+        removed if it is still the cached token, so a token that has already been refreshed
+        by another caller is kept.
+        """
+        key = self._key(base_url, username)
+        with self._lock:
+            if token is None or self._tokens.get(key) == token:
+                self._tokens.pop(key, None)
+                if self.path is not None:
+                    self._write()
+
+    def get_or_fetch(self, base_url, username, fetch_token):
+        """Method returns the cached token of a user, calling fetch_token() to request
+        and cache a new token if none is cached. Concurrent callers share a single fetch.
+
+        Args:
+            base_url (str): The base url of the Velkozz Web API.
+
+            username (str): The username the token is issued to.
+
+            fetch_token (function): A function called w/o arguments that returns a new token.
+
+        Returns:
+            str: The auth token.
+
+        """
+        token = self.get(base_url, username)
+        if token is not None:
+            return token
+
+        with self._get_key_lock(base_url, username):
+            # Another caller may have fetched the token while this one was waiting:
+            token = self.get(base_url, username)
+            if token is None:
+                token = fetch_token()
+                self.set(base_url, username, token)
+
+            return token
+
+    def refresh(self, base_url, username, stale_token, fetch_token):
+        """Method replaces a token that was rejected by the API. If the cached token has
+        already been replaced by another caller that token is returned instead of requesting
+        a new one, so a burst of 401 responses results in a single re-authentication.
+
+        Args:
+            base_url (str): The base url of the Velkozz Web API.
+
+            username (str): The username the token is issued to.
+
+            stale_token (str): The token that was rejected.
+
+            fetch_token (function): A function called w/o arguments that returns a new token.
+
+        Returns:
+            str: The new auth token.
+
+        """
+        with self._get_key_lock(base_url, username):
+            token = self.get(base_url, username)
+            if token is None or token == stale_token:
+                token = fetch_token()
+                self.set(base_url, username, token)
+
+            return token
+
+    def _get_key_lock(self, base_url, username):
+        with self._lock:
+            return self._key_locks.setdefault(self._key(base_url, username), threading.Lock())
+
+    def _key(self, base_url, username):
+        return f"{base_url.rstrip('/')}|{username}"
+
+    def _read(self):
+        """Method reads the persisted tokens, returning an empty dict if the file does not exist."""
+        try:
+            with open(self.path, "r") as token_file:
+                return json.load(token_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self):
+        """Atomically writes the tokens to the JSON file w/ owner only permissions. Must be
+        called with the lock held.
+        """
+        token_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(token_dir, mode=0o700, exist_ok=True)
+
+        # mkstemp creates the temporary file w/ mode 0600 so the tokens are never world readable:
+        file_descriptor, temp_path = tempfile.mkstemp(dir=token_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w") as temp_file:
+                json.dump(self._tokens, temp_file)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+# Process-wide token stores keyed by their path (None for the in-memory store):
+_token_stores = {}
+_token_stores_lock = threading.Lock()
+
+def get_token_store(path=None):
+    """Function returns the process-wide TokenStore for a path, creating it on first use.
+
+    Args:
+        path (str|None, optional): The path tokens are persisted to. None returns the
+            in-memory store.
+
+    Returns:
+        TokenStore: The shared token store.
+    """
+    path = os.path.abspath(os.path.expanduser(path)) if path is not None else None
+
+    with _token_stores_lock:
+        if path not in _token_stores:
+            _token_stores[path] = TokenStore(path)
+
+        return _token_stores[path]
@@ -1,13 +1,50 @@
 # Importing external packages:
-import pandas as pd
 import requests
 import collections
 import json
 import ast
 import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Importing internal modules:
+from vdeveloper_api.velkozz_pywrapper.query_api.token_store import get_token_store
+from vdeveloper_api.velkozz_pywrapper.api_utils.arrow_utils import records_to_arrow_table
 
 class VelkozzAPI(object):
     """A python object representing a connection to the Velkozz Web API.  
+
+    If no token is provided the token of the username is requested from the token auth 
+    endpoint. Tokens are cached per base url and username in a process-wide token store, 
+    so every connection created for the same user reuses a single token. If a 
+    token_cache_path (or the VELKOZZ_TOKEN_CACHE environment variable) is provided the 
+    tokens are also persisted to an owner-only JSON file and shared between processes.
+    When a cached token is rejected w/ a 401 response it is invalidated, a new token is 
+    requested once for all concurrent callers and the query is retried.
+
+    Every query method returns a pandas dataframe by default. If output_format="arrow" is 
+    passed to the connection or to a query method a pyarrow.Table is built directly from 
+    the JSON records instead (requires the optional pyarrow dependency).
+
+    Paginated endpoints (Django REST Framework {"count", "next", "previous", "results"} 
+    responses) are followed transparently. The next page is requested in the background 
+    while the current page is being converted, and the query methods return the 
+    concatenated records of every page. Passing iter_pages=True to a query method instead 
+    returns an iterator of one dataframe (or Arrow table) per page. A page_size kwarg 
+    requests pages of that size, sent as the page_size_param query param (defaults to 
+    "page_size", use "limit" for limit/offset pagination).
+
+    Requests are made over a pooled HTTP session. The bulk query methods (eg: 
+    get_subreddits_data) query every key concurrently on a thread pool shared by the 
+    connection, sized by the max_workers kwarg (defaults to 8).
+
+    The query methods take a columns argument that limits the fields of the returned 
+    records. The requested fields are sent to the server in the fields_param query param 
+    (defaults to "fields") and any other fields the server returns are dropped as each page 
+    is parsed. Heavy fields can then be loaded on demand for a subset of records, eg: 
+    get_subreddit_post_content(post_ids).
     """
     def __init__(self, **kwargs):
         
@@ -21,22 +58,48 @@ class VelkozzAPI(object):
         self.finance_endpoint = f"{self.base_url}/finance_api"
         self.news_endpoint = f"{self.base_url}/news_api"
 
+        # The default output format of the query methods, "pandas" or "arrow":
+        self.output_format = kwargs.get("output_format", "pandas")
+
+        # The size of the pages requested from paginated endpoints, None uses the server default:
+        self.page_size = kwargs.get("page_size", None)
+        self.page_size_param = kwargs.get("page_size_param", "page_size")
+
+        # The query param the requested columns are sent to the server in, None disables server side filtering:
+        self.fields_param = kwargs.get("fields_param", "fields")
+
+        # HTTP session w/ a connection pool large enough for every concurrent bulk query:
+        self.max_workers = kwargs.get("max_workers", 8)
+        self.session = requests.Session()
+        self.session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers))
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers))
+
+        # The thread pool of the bulk query methods, created on first use:
+        self._query_pool = None
+        self._query_pool_lock = threading.Lock()
+
         # Extracting necessary params from kwargs: 
         self.username = kwargs.get("username", None)
         self.password = kwargs.get("password", None)
         
-        # If token not provided calls the token retrieval function:
-        self.token = kwargs['token'] if "token" in kwargs else self._get_user_token()
+        # Process-wide token cache, optionally persisted to disk:
+        self.token_store = get_token_store(kwargs.get("token_cache_path", os.environ.get("VELKOZZ_TOKEN_CACHE")))
+
+        # If token not provided retrieves the cached token or calls the token retrieval function:
+        if "token" in kwargs:
+            self.token = kwargs["token"]
+        elif self.username is not None and self.password is not None:
+            self.token = self.token_store.get_or_fetch(self.base_url, self.username, self._get_user_token)
+        else:
+            self.token = self._get_user_token()
         
         # Building base authentication HTPP header:
-        self.auth_header = {
-            "Content-Type": "application/json",
-            "Authorization":f"Token {self.token}"}
+        self._build_auth_header()
 
         # TODO: Once API that return remaining requests/access status is written include that.
 
     # Social Media Query Methods:
-    def get_subreddit_data(self, subreddit_name, start_date=None, end_date=None):
+    def get_subreddit_data(self, subreddit_name, start_date=None, end_date=None, output_format=None, iter_pages=False, columns=None):
         """Method queries the velkozz api for posts in a given subreddit according
         to the specified start and end dates. 
 
@@ -52,8 +115,18 @@ class VelkozzAPI(object):
             end_date (str|None, optional):  The day that will serve as the end of the
                 dataset.
         
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            iter_pages (bool, optional): Return an iterator of the formatted records of each page
+                of the response instead of the concatenated records. Defaults to False.
+
+            columns (list|None, optional): The fields that are returned. Unrequested fields are
+                dropped from the records as they are parsed and requested from the server w/
+                the fields query param. Defaults to None, every field.
+
         Returns:
-            pd.DataFrame: The dataframe containing all of the formatted subreddit data.
+            pd.DataFrame|pyarrow.Table: The dataframe containing all of the formatted subreddit data.
 
         """
         # Building subreddit enpoint:
@@ -74,23 +147,17 @@ class VelkozzAPI(object):
             params["Subreddit"] = subreddit_name
 
         # Making the query to the API:
-        response = requests.get(
-            reddit_top_posts_endpoint,
-            headers=self.auth_header,
-            params=params
-        )
+        columns = _with_index_column(columns, "id")
+        response = self._get(reddit_top_posts_endpoint, params=params, columns=columns)
 
         # Converting the json response to formatted dataframe:
         try:
             if response.status_code <= 302:
-                raw_json = response.json()
-
-                # Converting the JSON resposne to pandas dataframe:
-                subreddit_df = pd.DataFrame.from_dict(raw_json, orient="columns")
-                subreddit_df.set_index("id", inplace=True)
-                subreddit_df.drop(["url"], axis=1, inplace=True)
+                # Converting the JSON records of every page to a formatted dataframe:
+                if iter_pages:
+                    return (self._build_frame(records, output_format, index_column="id") for records in self._iter_pages(response, columns))
 
-                return subreddit_df
+                return self._build_frame(self._get_records(response, columns), output_format, index_column="id")
 
             else:
                 raise ValueError(f"Request to subreddit {subreddit} api failed with status code {response.status_code}")
@@ -98,7 +165,7 @@ class VelkozzAPI(object):
         except Exception as e:
             return f"Error w/ Constructing Dataframe with Error: {e}" 
     
-    def get_indeed_job_listings(self, job_type=None, location=None, company=None, start_date=None, end_date=None):
+    def get_indeed_job_listings(self, job_type=None, location=None, company=None, start_date=None, end_date=None, output_format=None, iter_pages=False, columns=None):
         """The method queries the velkozz api for all of the job postings from 
             the indeed job posts database. 
             
@@ -120,8 +187,18 @@ class VelkozzAPI(object):
             company (str|None, optional): The search string that filter the companies being
                 queried from the api.
         
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            iter_pages (bool, optional): Return an iterator of the formatted records of each page
+                of the response instead of the concatenated records. Defaults to False.
+
+            columns (list|None, optional): The fields that are returned. Unrequested fields are
+                dropped from the records as they are parsed and requested from the server w/
+                the fields query param. Defaults to None, every field.
+
             Returns:
-                pd.DataFrame: The dataframe containing all of the formatted indeed listings data.
+                pd.DataFrame|pyarrow.Table: The dataframe containing all of the formatted indeed listings data.
 
         """
         # Building indeed.com endpoint:
@@ -155,19 +232,17 @@ class VelkozzAPI(object):
             payload["company"] = company
 
         # Making GET request to the velkozz api once the query params have been built:
-        response = requests.get(indeed_jobs_endpoint, headers=self.auth_header, params=payload)
+        columns = _with_index_column(columns, "id")
+        response = self._get(indeed_jobs_endpoint, params=payload, columns=columns)
 
         # Extracting JSON response and converting to pandas dataframe:
         try:
             if response.status_code <= 302:
-                raw_json = response.json()
+                # Converting the JSON records of every page to a formatted dataframe:
+                if iter_pages:
+                    return (self._build_frame(records, output_format, index_column="id") for records in self._iter_pages(response, columns))
 
-                # JSON -> DataFrame:
-                indeed_jobs_df = pd.DataFrame.from_dict(raw_json, orient="columns")
-                indeed_jobs_df.set_index("id", inplace=True)
-                indeed_jobs_df.drop(["url"], axis=1, inplace=True)
-
-                return indeed_jobs_df
+                return self._build_frame(self._get_records(response, columns), output_format, index_column="id")
             
             else:
                 return (f"Error with Response Object: {response}", response)
@@ -175,7 +250,7 @@ class VelkozzAPI(object):
         except Exception as e:
             return f"Error w/ Constructing Dataframe with Error: {e}"
 
-    def get_daily_youtube_channel_stats(self, start_date=None, end_date=None, channel_name=None, channel_id=None):
+    def get_daily_youtube_channel_stats(self, start_date=None, end_date=None, channel_name=None, channel_id=None, output_format=None, iter_pages=False, columns=None):
         """The method that queries the Velkozz REST API for data about Youtube Channel Daily Statistics.
 
         The method builds the specific API endpoint for daily youtube channel statistics and makes a POST
@@ -196,8 +271,18 @@ class VelkozzAPI(object):
             channel_id (str|None, optional): The google specific ID of the youtube channel that
                 will be used to filter the dataset (only data for this specific channel will be queried).
             
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            iter_pages (bool, optional): Return an iterator of the formatted records of each page
+                of the response instead of the concatenated records. Defaults to False.
+
+            columns (list|None, optional): The fields that are returned. Unrequested fields are
+                dropped from the records as they are parsed and requested from the server w/
+                the fields query param. Defaults to None, every field.
+
         Returns:
-            pd.Dataframe: The dataframe containing all formatted youtube channel datapoints.
+            pd.Dataframe|pyarrow.Table: The dataframe containing all formatted youtube channel datapoints.
 
         """
         # Building the specific daily youtube channel endpoint:
@@ -226,19 +311,17 @@ class VelkozzAPI(object):
             payload["Channel-ID"] = channel_id
 
         # Making GET request to the velkozz api once the query params have been built:
-        response = requests.get(daily_youtube_channel_endpoint, headers=self.auth_header, params=payload)
+        columns = _with_index_column(columns, "date_extracted")
+        response = self._get(daily_youtube_channel_endpoint, params=payload, columns=columns)
         
         # Extracting the response body from the API request:
         try:
             if response.status_code <= 302:
-                raw_json = response.json()
-
-                # JSON -> DataFrame:
-                youtube_channel_df = pd.DataFrame.from_dict(raw_json, orient="columns")
-                youtube_channel_df.set_index("date_extracted", inplace=True)
-                youtube_channel_df.drop(["url"], axis=1, inplace=True)
+                # Converting the JSON records of every page to a formatted dataframe:
+                if iter_pages:
+                    return (self._build_frame(records, output_format, index_column="date_extracted") for records in self._iter_pages(response, columns))
 
-                return youtube_channel_df
+                return self._build_frame(self._get_records(response, columns), output_format, index_column="date_extracted")
             
             else:
                 return (f"Error with Response Object: {response}", response.json)
@@ -247,7 +330,7 @@ class VelkozzAPI(object):
             return f"Error w/ Constructing Dataframe with Error: {e}"
 
     # Finance Data Query Methods:
-    def get_index_comp_data(self, market_index):
+    def get_index_comp_data(self, market_index, output_format=None, iter_pages=False, columns=None):
         """Method queries the velkozz api for market index composition.
 
         The method formats the API JSON response into a pandas dataframe.
@@ -256,8 +339,18 @@ class VelkozzAPI(object):
             market_index (str): The shortened name of the market being queried.
                 eg: spy, djia, nyse.
 
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            iter_pages (bool, optional): Return an iterator of the formatted records of each page
+                of the response instead of the concatenated records. Defaults to False.
+
+            columns (list|None, optional): The fields that are returned. Unrequested fields are
+                dropped from the records as they are parsed and requested from the server w/
+                the fields query param. Defaults to None, every field.
+
         Returns:
-            pd.DataFrame: The dataframe containing all of the formatted market index
+            pd.DataFrame|pyarrow.Table: The dataframe containing all of the formatted market index
                 composition.
 
         """
@@ -265,18 +358,16 @@ class VelkozzAPI(object):
         market_index_endpoint = f"{self.finance_endpoint}/market_index/{market_index}comp"
         
         # Making request to the API JSON data:
-        response = requests.get(market_index_endpoint, headers=self.auth_header)
+        response = self._get(market_index_endpoint, columns=columns)
 
         # Extracting response content in JSON format:
         try:
             if response.status_code < 302:
-                raw_json = response.json()
+                # Converting the JSON records of every page to a formatted dataframe:
+                if iter_pages:
+                    return (self._build_frame(records, output_format) for records in self._iter_pages(response, columns))
 
-                # Converting JSON data to pandas dataframe:
-                index_comp_df = pd.DataFrame.from_dict(raw_json, orient='columns')
-                index_comp_df.drop(['url'], axis=1, inplace=True)
-                
-                return index_comp_df
+                return self._build_frame(self._get_records(response, columns), output_format)
             
             else:
                 return (f"Error with Response Object: {response}", response)
@@ -285,7 +376,7 @@ class VelkozzAPI(object):
             return f"Error w/ Constructing Dataframe with Error: {e}"
 
     # Strucutred Finance Quant Data Query Methods:
-    def get_wsb_ticker_counts(self, start_date=None, end_date=None):
+    def get_wsb_ticker_counts(self, start_date=None, end_date=None, output_format=None, iter_pages=False):
         """Method queries the velkozz api for the frequency counts of ticker mentions
         from the wallstreetbets subreddit.
 
@@ -312,45 +403,40 @@ class VelkozzAPI(object):
             end_date (str|None, optional):  The day that will serve as the end of the
                 dataset.
 
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection. The Arrow table has a "day" column instead of an index.
+
+            iter_pages (bool, optional): Return an iterator of the formatted records of each page
+                of the response instead of the concatenated records. Defaults to False.
+
         Returns:
-            pd.DataFrame: The dataframe containing all of the ticker frequency counts.
+            pd.DataFrame|pyarrow.Table: The dataframe containing all of the ticker frequency counts.
 
         """
         # Building api endpoints:
         wsb_ticker_counts_endpoint = f"{self.finance_endpoint}/structured_quant/wsb_ticker_mentions"
 
+        # Conditionals dealing with the start and end data params:
+        params = {}
+        if start_date is not None:
+            params["Start-Date"] = start_date
+
+        if end_date is not None:
+            params["End-Date"] = end_date
+
         # Making the request to the REST API:
-        response = requests.get(wsb_ticker_counts_endpoint, headers=self.auth_header)
+        response = self._get(wsb_ticker_counts_endpoint, params=params)
 
         # Extracting response content in JSON format:
         if response.status_code < 302:
-            raw_json = response.json()
-
-            # Create a list of all unique ticker symbols present in dataset:
-            unique_tickers_lst = []
-            date_index = []
-
-            for ticker_freq_dict in raw_json:
-                unique_tickers_lst.append(ast.literal_eval(ticker_freq_dict["ticker_count"]).keys())
-                date_index.append(ticker_freq_dict['day'])
-
-            # Flattening list of dict keys into a list of ticker symbols:
-            unique_tickers_lst = set(itertools.chain(*unique_tickers_lst))
+            # Converting the JSON records of every page to a formatted dataframe:
+            if iter_pages:
+                return (self._build_ticker_counts_frame(records, output_format) for records in self._iter_pages(response))
 
-            # Building the ticker mentions DataFrame:
-            wsb_ticker_freq_df = pd.DataFrame(index=date_index, columns=unique_tickers_lst)
-
-            # Populating dataframe with data O(n^3):
-            for frequency_dict in raw_json:
-                for key, value in ast.literal_eval(frequency_dict["ticker_count"]).items():
-                    wsb_ticker_freq_df.loc[frequency_dict["day"]][key] = value
-
-            wsb_ticker_freq_df.fillna(0, inplace=True)
-
-            return wsb_ticker_freq_df
+            return self._build_ticker_counts_frame(self._get_records(response), output_format)
 
     # News Articles Query Methods 
-    def get_news_articles(self, start_date=None, end_date=None, source=None):
+    def get_news_articles(self, start_date=None, end_date=None, source=None, output_format=None, iter_pages=False, columns=None):
         """The method queries the REST API for newspaper articles. 
 
         It performs a GET request to the news_api/news_articles endpoint with
@@ -375,8 +461,18 @@ class VelkozzAPI(object):
             source (str|None, optional): The name of the source of articles being queried from the database.
                 Example: "CNN". 
 
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            iter_pages (bool, optional): Return an iterator of the formatted records of each page
+                of the response instead of the concatenated records. Defaults to False.
+
+            columns (list|None, optional): The fields that are returned. Unrequested fields are
+                dropped from the records as they are parsed and requested from the server w/
+                the fields query param. Defaults to None, every field.
+
         Return:
-            pd.DataFrame: The formatted dataframe containing news articles.
+            pd.DataFrame|pyarrow.Table: The formatted dataframe containing news articles.
         """
         # Building the news articles API endpoint:
         news_article_endpoints = f"{self.news_endpoint}/news_articles"
@@ -399,25 +495,312 @@ class VelkozzAPI(object):
             payload["Source"] = source
 
         # Creating the GET request to the API:
-        response = requests.get(news_article_endpoints, headers=self.auth_header, params=payload)
+        columns = _with_index_column(columns, "title")
+        response = self._get(news_article_endpoints, params=payload, columns=columns)
 
         # Extracting the JSON data from the response object if GET request was sucessful:
         try:
             if response.status_code <= 302:
-                raw_json = response.json()
-                
-                # JSON -> DataFrame:
-                news_articles_df = pd.DataFrame().from_dict(raw_json, orient="columns")
-                news_articles_df.set_index("title", inplace=True)
+                # Converting the JSON records of every page to a formatted dataframe:
+                if iter_pages:
+                    return (self._build_frame(records, output_format, index_column="title", drop_columns=()) for records in self._iter_pages(response, columns))
 
-                return news_articles_df
+                return self._build_frame(self._get_records(response, columns), output_format, index_column="title", drop_columns=())
             else:
                 return (f"Error with Response Object: {response}", response)
         
         except Exception as e:
             return f"Error w/ Constructing Dataframe with Error: {e}"
 
+    # Lazy Field Query Methods:
+    def get_subreddit_post_content(self, post_ids, columns=("content",), output_format=None):
+        """Method queries the heavy fields of a selected subset of reddit posts on demand. 
+
+        It is intended to be used w/ a subreddit query that requested only the metadata
+        fields, eg: get_subreddit_data("wallstreetbets", columns=["title", "created_on", "score"]).
+        Each post is requested concurrently from its top_posts/<id> detail endpoint.
+
+        Args:
+            post_ids (list): The ids of the posts whose fields are queried.
+
+            columns (list|tuple, optional): The fields of each post that are queried. Defaults 
+                to ("content",).
+
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+        Returns:
+            pd.DataFrame|pyarrow.Table: The dataframe of the queried fields indexed by post id.
+
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        columns = _with_index_column(list(columns), "id")
+
+        records = list(self._get_query_pool().map(
+            lambda post_id: self._get_page(f"{self.reddit_endpoint}/top_posts/{post_id}/", columns),
+            post_ids))
+
+        return self._build_frame(_project_records(records, columns), output_format, index_column="id")
+
+    # Bulk Query Methods:
+    def get_subreddits_data(self, subreddit_names, start_date=None, end_date=None, output_format=None, columns=None):
+        """Method concurrently queries the posts of several subreddits w/ get_subreddit_data and
+        combines them into a single dataframe w/ a (subreddit, id) MultiIndex.
+
+        Args:
+            subreddit_names (list): The names of the subreddits that will be queried.
+
+            start_date (str|None, optional): The day that will serve as the start of
+                the dataset. 
+
+            end_date (str|None, optional):  The day that will serve as the end of the
+                dataset.
+
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            columns (list|None, optional): The fields that are returned. Defaults to None, every field.
+
+        Returns:
+            pd.DataFrame|pyarrow.Table: The combined subreddit data.
+
+        """
+        return self._bulk_query(
+            self.get_subreddit_data, subreddit_names, "subreddit", output_format,
+            start_date=start_date, end_date=end_date, columns=columns)
+
+    def get_index_comps(self, market_indices, output_format=None, columns=None):
+        """Method concurrently queries the composition of several market indices w/ get_index_comp_data
+        and combines them into a single dataframe indexed by market_index.
+
+        Args:
+            market_indices (list): The shortened names of the markets being queried.
+                eg: ["spy", "djia", "nyse"].
+
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            columns (list|None, optional): The fields that are returned. Defaults to None, every field.
+
+        Returns:
+            pd.DataFrame|pyarrow.Table: The combined market index compositions.
+
+        """
+        return self._bulk_query(self.get_index_comp_data, market_indices, "market_index", output_format, columns=columns)
+
+    def get_youtube_channels_stats(self, channel_ids, start_date=None, end_date=None, output_format=None, columns=None):
+        """Method concurrently queries the daily statistics of several youtube channels w/
+        get_daily_youtube_channel_stats and combines them into a single dataframe w/ a
+        (channel_id, date_extracted) MultiIndex.
+
+        Args:
+            channel_ids (list): The google specific IDs of the youtube channels that will be queried.
+
+            start_date (str|None, optional): The day that will serve as the start of
+                the dataset. 
+
+            end_date (str|None, optional): The day that will serve as the end of the
+                dataset.
+
+            output_format (str|None, optional): "pandas" or "arrow". Defaults to the output
+                format of the connection.
+
+            columns (list|None, optional): The fields that are returned. Defaults to None, every field.
+
+        Returns:
+            pd.DataFrame|pyarrow.Table: The combined youtube channel datapoints.
+
+        """
+        return self._bulk_query(
+            lambda channel_id, **kwargs: self.get_daily_youtube_channel_stats(channel_id=channel_id, **kwargs),
+            channel_ids, "channel_id", output_format, start_date=start_date, end_date=end_date, columns=columns)
+
     #  <-- Internal assistance methods -- >
+    def _get_query_pool(self):
+        with self._query_pool_lock:
+            if self._query_pool is None:
+                self._query_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="velkozz-query")
+
+            return self._query_pool
+
+    def _bulk_query(self, query_method, keys, key_name, output_format=None, **kwargs):
+        """Method calls a query method for every key concurrently on the shared thread pool and
+        combines the results w/ a single concat.
+
+        Dataframes are combined w/ the key as the outer level of a MultiIndex. Arrow tables are
+        combined w/ a key_name column, which is added if the records do not already contain it.
+
+        Raises:
+            ValueError: If no keys are provided or the query of a key failed.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            raise ValueError(f"At least one {key_name} must be provided")
+
+        output_format = output_format or self.output_format
+        results = list(self._get_query_pool().map(
+            lambda key: query_method(key, output_format=output_format, **kwargs), keys))
+
+        # The query methods return the error message if a request failed:
+        for key, result in zip(keys, results):
+            if isinstance(result, (str, tuple)):
+                raise ValueError(f"Query for {key_name} {key} failed w/ {result[0] if isinstance(result, tuple) else result}")
+
+        if output_format == "arrow":
+            import pyarrow as pa
+
+            tables = [
+                table if key_name in table.column_names else table.append_column(key_name, pa.array([key] * table.num_rows, pa.string()))
+                for key, table in zip(keys, results)]
+
+            return pa.concat_tables(tables, promote_options="default")
+
+        import pandas as pd
+
+        # A key column returned by the API is replaced by the key level of the index:
+        frames = [frame.drop(columns=key_name) if key_name in frame.columns else frame for frame in results]
+
+        return pd.concat(frames, keys=keys, names=[key_name, frames[0].index.name])
+
+    def _build_frame(self, records, output_format=None, index_column=None, drop_columns=("url",)):
+        """Method converts a list of JSON records into a pandas dataframe indexed by the index
+        column, or into an Arrow table if the output format is "arrow".
+        """
+        # Building an Arrow table directly from the JSON records:
+        if (output_format or self.output_format) == "arrow":
+            return records_to_arrow_table(records, drop_columns=drop_columns)
+
+        import pandas as pd
+
+        # JSON -> DataFrame:
+        records_df = pd.DataFrame.from_dict(records, orient="columns")
+
+        # An empty response has no columns to index, an empty frame w/ the index column is returned:
+        if len(records) < 1:
+            return records_df if index_column is None else pd.DataFrame(columns=[index_column]).set_index(index_column)
+
+        if index_column is not None:
+            records_df.set_index(index_column, inplace=True)
+        records_df.drop([column for column in drop_columns if column in records_df.columns], axis=1, inplace=True)
+
+        return records_df
+
+    def _build_ticker_counts_frame(self, records, output_format=None):
+        """Method converts the JSON records of the wsb ticker mentions endpoint into a dataframe
+        of ticker counts indexed by day, or an Arrow table w/ a "day" column.
+        """
+        # Building an Arrow table of ticker counts per day directly from the JSON records:
+        if (output_format or self.output_format) == "arrow":
+            ticker_counts = [ast.literal_eval(frequency_dict["ticker_count"]) for frequency_dict in records]
+            ticker_columns = dict.fromkeys(sorted(set(itertools.chain(*ticker_counts))), 0)
+
+            return records_to_arrow_table([
+                {"day": frequency_dict["day"], **ticker_columns, **counts}
+                for frequency_dict, counts in zip(records, ticker_counts)])
+
+        import pandas as pd
+
+        # Create a list of all unique ticker symbols present in dataset:
+        unique_tickers_lst = []
+        date_index = []
+
+        for ticker_freq_dict in records:
+            unique_tickers_lst.append(ast.literal_eval(ticker_freq_dict["ticker_count"]).keys())
+            date_index.append(ticker_freq_dict['day'])
+
+        # Flattening list of dict keys into a list of ticker symbols:
+        unique_tickers_lst = set(itertools.chain(*unique_tickers_lst))
+
+        # Building the ticker mentions DataFrame:
+        wsb_ticker_freq_df = pd.DataFrame(index=date_index, columns=sorted(unique_tickers_lst))
+
+        # Populating dataframe with data O(n^3):
+        for frequency_dict in records:
+            for key, value in ast.literal_eval(frequency_dict["ticker_count"]).items():
+                wsb_ticker_freq_df.loc[frequency_dict["day"], key] = value
+
+        wsb_ticker_freq_df.fillna(0, inplace=True)
+
+        return wsb_ticker_freq_df
+
+    def _iter_pages(self, response, columns=None):
+        """Method iterates over the JSON records of every page of a response.
+
+        A response that is a flat JSON array is a single page. For a paginated response the
+        next link is requested on a background thread before the records of the current page
+        are returned, so the next page is downloaded and decoded while the current page is
+        being converted into a dataframe. If columns are provided every other field is dropped 
+        from the records of each page, so the unrequested fields of only one page are held 
+        in memory at a time.
+
+        Yields:
+            list: The JSON records of each page.
+        """
+        page = response.json()
+        if not isinstance(page, dict) or "results" not in page:
+            yield _project_records(page, columns)
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                next_page = executor.submit(self._get_page, page["next"]) if page.get("next") else None
+
+                yield _project_records(page["results"], columns)
+
+                if next_page is None:
+                    return
+                page = next_page.result()
+
+    def _get_page(self, page_url, columns=None):
+        """Method requests the next page of a paginated response (or a detail endpoint) and 
+        returns its decoded JSON."""
+        response = self._get(page_url, columns=columns)
+        if response.status_code >= 302:
+            raise ValueError(f"Request to {page_url} failed with status code {response.status_code}")
+
+        return response.json()
+
+    def _get_records(self, response, columns=None):
+        """Method returns the concatenated JSON records of every page of a response."""
+        pages = self._iter_pages(response, columns)
+        records = next(pages)
+        for page_records in pages:
+            records.extend(page_records)
+
+        return records
+
+    def _get(self, endpoint, params=None, columns=None):
+        """Method makes an authenticated GET request to the API. If the request is
+        rejected w/ a 401 response and the connection was created w/ a username and
+        password, the cached token is refreshed and the request is retried once.
+
+        If a page size or columns are provided they are added to the query params, unless the 
+        endpoint is a next page link that already contains them.
+
+        Returns:
+            requests.Response: The response of the API.
+        """
+        if self.page_size is not None and f"{self.page_size_param}=" not in urlsplit(endpoint).query:
+            params = dict(params or {}, **{self.page_size_param: self.page_size})
+
+        if columns is not None and self.fields_param is not None and f"{self.fields_param}=" not in urlsplit(endpoint).query:
+            params = dict(params or {}, **{self.fields_param: ",".join(columns)})
+
+        response = self.session.get(endpoint, headers=self.auth_header, params=params)
+
+        if response.status_code == 401 and self.username is not None and self.password is not None:
+            self.token = self.token_store.refresh(self.base_url, self.username, self.token, self._get_user_token)
+            self._build_auth_header()
+            response = self.session.get(endpoint, headers=self.auth_header, params=params)
+
+        return response
+
+    def _build_auth_header(self):
+        """Method builds the authentication HTTP header from the current token."""
+        self.auth_header = {
+            "Content-Type": "application/json",
+            "Authorization":f"Token {self.token}"}
+
     def _get_user_token(self):
         """Method makes a POST request to the velkozz authentication
         endpoint to extract an auth token for the user if the user
@@ -439,3 +822,17 @@ class VelkozzAPI(object):
 
         else:
             raise ValueError("No Account auth provided to interact with web api. Check config params") 
+
+def _with_index_column(columns, index_column):
+    """Function adds the index column of a query to the requested columns."""
+    if columns is None or index_column in columns:
+        return columns
+
+    return [index_column, *columns]
+
+def _project_records(records, columns):
+    """Function drops every field of the JSON records that is not in the requested columns."""
+    if columns is None:
+        return records
+
+    return [{column: record[column] for column in columns if column in record} for record in records]
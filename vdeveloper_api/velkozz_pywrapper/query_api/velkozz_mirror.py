@@ -0,0 +1,322 @@
+# Importing native packages:
+import argparse
+import os
+import threading
+import time
+
+# Importing internal modules:
+from vdeveloper_api.velkozz_pywrapper.query_api.velkozz_api import VelkozzAPI
+
+# The Velkozz datasets that can be mirrored. Each dataset is mirrored into a table of the same name:
+#   method: The VelkozzAPI query method the dataset is extracted with.
+#   key_columns: The columns that uniquely identify a record. Re-extracted records replace the mirrored ones.
+#   date_column: The column the date watermark of an incremental sync is taken from. Datasets w/o a
+#       date column are fully refreshed on every sync.
+#   partition_arg: The argument of the query method that each partition of the dataset is queried w/.
+#   partition_column: The column holding the partition, added to the table if the API does not return it.
+MIRROR_DATASETS = {
+    "reddit_posts": {
+        "method": "get_subreddit_data",
+        "key_columns": ["id"],
+        "date_column": "created_on",
+        "partition_arg": "subreddit_name",
+        "partition_column": "subreddit"},
+    "indeed_listings": {
+        "method": "get_indeed_job_listings",
+        "key_columns": ["id"],
+        "date_column": "date_posted"},
+    "youtube_channel_stats": {
+        "method": "get_daily_youtube_channel_stats",
+        "key_columns": ["channel_id", "date_extracted"],
+        "date_column": "date_extracted"},
+    "wsb_ticker_mentions": {
+        "method": "get_wsb_ticker_counts",
+        "key_columns": ["day", "ticker"],
+        "date_column": "day"},
+    "news_articles": {
+        "method": "get_news_articles",
+        "key_columns": ["article_url"],
+        "date_column": "published_date"},
+    "index_composition": {
+        "method": "get_index_comp_data",
+        "key_columns": ["market_index", "symbol"],
+        "date_column": None,
+        "partition_arg": "market_index",
+        "partition_column": "market_index"}
+}
+
+def _import_duckdb():
+    """Function imports duckdb, which is an optional dependency of the local mirror."""
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("The local mirror requires duckdb. Install it w/ pip install velkozz-developer-api[mirror]")
+
+    return duckdb
+
+class VelkozzMirror(object):
+    """A local analytical mirror of the Velkozz Web API datasets stored in an embedded
+    DuckDB database.
+
+    Each dataset in MIRROR_DATASETS is mirrored into its own columnar table. A sync only
+    queries the API for records on or after the date watermark of the previous sync, the
+    latest day that was mirrored. Records of the watermark day are queried again and replace
+    the mirrored records w/ the same key columns, so a sync never duplicates records and picks
+    up records that were added to the API later on that day. Synced records are inserted in date
+    order so that the min/max zone maps DuckDB keeps for every column chunk skip the chunks
+    outside of the date range of a query.
+
+    Repeated aggregations are then run locally w/ SQL instead of pulling full dataframes over
+    HTTP and grouping them in pandas.
+
+    Example:
+        mirror = VelkozzMirror("velkozz_mirror.duckdb", url="https://velkozz.com", username="user", password="pass")
+        mirror.sync(["reddit_posts"], partitions={"reddit_posts": ["wallstreetbets"]})
+
+        daily_activity_df = mirror.query(
+            '''SELECT CAST(created_on AS DATE) AS day, count(*) AS posts, sum(num_comments) AS comments
+            FROM reddit_posts WHERE subreddit = ? GROUP BY day ORDER BY day''', ["wallstreetbets"])
+
+    Arguments:
+        path (str): The relative or absoloute path to the DuckDB database file.
+
+        api (VelkozzAPI|None, optional): The connection the datasets are synced from. If not
+            provided a VelkozzAPI is created from the remaining kwargs.
+
+    """
+    def __init__(self, path, api=None, **kwargs):
+
+        duckdb = _import_duckdb()
+
+        self.path = path
+        self.api = api if api is not None else VelkozzAPI(**kwargs)
+        self._lock = threading.Lock()
+
+        mirror_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(mirror_dir, exist_ok=True)
+
+        self._con = duckdb.connect(self.path)
+        with self._lock:
+            self._con.execute(
+                """CREATE TABLE IF NOT EXISTS _mirror_sync_state (
+                    dataset VARCHAR NOT NULL,
+                    partition VARCHAR NOT NULL,
+                    watermark VARCHAR,
+                    synced_at DOUBLE NOT NULL,
+                    num_records BIGINT NOT NULL,
+                    PRIMARY KEY (dataset, partition)
+                )""")
+
+    def sync(self, datasets=None, partitions=None, full_refresh=False):
+        """Method brings the mirrored datasets up to date w/ the Velkozz Web API.
+
+        Args:
+            datasets (list|None, optional): The names of the datasets in MIRROR_DATASETS that
+                are synced. Defaults to every dataset that does not need partitions, plus every
+                dataset partitions are provided for.
+
+            partitions (dict|None, optional): A dict of {dataset: [partitions]} for the datasets that
+                are queried per partition (eg: {"reddit_posts": ["wallstreetbets"], "index_composition": ["spy"]}).
+
+            full_refresh (bool, optional): Ignore the stored watermarks and re-query every record.
+
+        Returns:
+            dict: The number of records synced for every {dataset: {partition: num_records}}.
+
+        """
+        partitions = partitions or {}
+        if datasets is None:
+            datasets = [
+                dataset for dataset, config in MIRROR_DATASETS.items()
+                if "partition_arg" not in config or dataset in partitions]
+
+        sync_counts = {}
+        for dataset in datasets:
+            config = MIRROR_DATASETS[dataset]
+
+            if "partition_arg" in config:
+                if not partitions.get(dataset):
+                    raise ValueError(f"The {dataset} dataset is synced per {config['partition_arg']}, no partitions were provided")
+                dataset_partitions = partitions[dataset]
+            else:
+                dataset_partitions = [""]
+
+            sync_counts[dataset] = {
+                partition: self._sync_partition(dataset, config, partition, full_refresh)
+                for partition in dataset_partitions}
+
+        return sync_counts
+
+    def _sync_partition(self, dataset, config, partition, full_refresh):
+        """Method queries the API for the records of a dataset partition on or after its watermark
+        and upserts them into the mirror table. Returns the number of records synced.
+        """
+        watermark = None if full_refresh or config["date_column"] is None else self.get_watermark(dataset, partition)
+
+        query_kwargs = {"output_format": "arrow"}
+        if watermark is not None:
+            query_kwargs["start_date"] = watermark
+        if "partition_arg" in config:
+            query_kwargs[config["partition_arg"]] = partition
+
+        import pyarrow
+
+        records_table = getattr(self.api, config["method"])(**query_kwargs)
+
+        # The query methods return an error message or None instead of a table if the request failed:
+        if not isinstance(records_table, pyarrow.Table):
+            raise ValueError(f"Syncing the {dataset} dataset failed, the query returned {records_table!r} instead of a table")
+
+        if records_table.num_rows == 0:
+            self._set_watermark(dataset, partition, self.get_watermark(dataset, partition), 0)
+            return 0
+
+        if "partition_column" in config and config["partition_column"] not in records_table.column_names:
+            records_table = records_table.append_column(
+                config["partition_column"],
+                _constant_column(partition, records_table.num_rows))
+
+        with self._lock:
+            self._con.register("_mirror_records", records_table)
+            try:
+                staged_query = "SELECT * FROM _mirror_records"
+
+                # The ticker counts are mirrored in long format as their ticker columns change daily:
+                if dataset == "wsb_ticker_mentions":
+                    staged_query = """SELECT * FROM (
+                        UNPIVOT _mirror_records ON COLUMNS(* EXCLUDE (day)) INTO NAME ticker VALUE mentions)
+                        WHERE mentions > 0"""
+
+                if config["date_column"] is not None:
+                    staged_query = f"{staged_query} ORDER BY {config['date_column']}"
+
+                self._con.execute("BEGIN TRANSACTION")
+                try:
+                    self._upsert(dataset, config, partition, staged_query)
+                    self._con.execute("COMMIT")
+                except Exception:
+                    self._con.execute("ROLLBACK")
+                    raise
+
+                new_watermark = watermark
+                if config["date_column"] is not None:
+                    new_watermark = self._con.execute(
+                        f"SELECT max(substr(CAST({config['date_column']} AS VARCHAR), 1, 10)) FROM _mirror_records").fetchone()[0]
+
+            finally:
+                self._con.unregister("_mirror_records")
+
+        self._set_watermark(dataset, partition, new_watermark, records_table.num_rows)
+
+        return records_table.num_rows
+
+    def _upsert(self, dataset, config, partition, staged_query):
+        """Method replaces the mirrored records w/ the same keys as the staged records, adding any
+        new columns returned by the API to the mirror table. Must be called w/ the lock held.
+        """
+        self._con.execute(f"CREATE OR REPLACE TEMP TABLE _mirror_staged AS {staged_query}")
+
+        table_exists = self._con.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = ? AND table_schema = 'main'",
+            [dataset]).fetchone()[0]
+
+        if not table_exists:
+            self._con.execute(f"CREATE TABLE {dataset} AS SELECT * FROM _mirror_staged")
+            return
+
+        mirrored_columns = {row[0] for row in self._con.execute(f"DESCRIBE {dataset}").fetchall()}
+        for column_name, column_type, *_ in self._con.execute("DESCRIBE _mirror_staged").fetchall():
+            if column_name not in mirrored_columns:
+                self._con.execute(f'ALTER TABLE {dataset} ADD COLUMN "{column_name}" {column_type}')
+
+        # Datasets w/o a date watermark are replaced in full:
+        if config["date_column"] is None:
+            self._con.execute(f"DELETE FROM {dataset} WHERE {config['partition_column']} = ?", [partition])
+        else:
+            key_match = " AND ".join(f"{dataset}.{column} = _mirror_staged.{column}" for column in config["key_columns"])
+            self._con.execute(f"DELETE FROM {dataset} USING _mirror_staged WHERE {key_match}")
+
+        self._con.execute(f"INSERT INTO {dataset} BY NAME SELECT * FROM _mirror_staged")
+
+    def get_watermark(self, dataset, partition=""):
+        """Method returns the latest day (YYYY-MM-DD) of a dataset partition that has been mirrored,
+        or None if the partition has not been synced.
+        """
+        with self._lock:
+            row = self._con.execute(
+                "SELECT watermark FROM _mirror_sync_state WHERE dataset = ? AND partition = ?",
+                [dataset, partition]).fetchone()
+
+        return row[0] if row is not None else None
+
+    def _set_watermark(self, dataset, partition, watermark, num_records):
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO _mirror_sync_state VALUES (?, ?, ?, ?, ?)",
+                [dataset, partition, watermark, time.time(), num_records])
+
+    def sync_state(self):
+        """Method returns the watermark, last sync time and number of records of the last sync of
+        every mirrored dataset partition as a pandas dataframe.
+        """
+        return self.query("SELECT * FROM _mirror_sync_state ORDER BY dataset, partition")
+
+    def query(self, sql, params=None, output_format="pandas"):
+        """Method runs a SQL query against the mirrored datasets.
+
+        Args:
+            sql (str): The DuckDB SQL query. Every mirrored dataset is a table of the same name.
+
+            params (list|None, optional): The values of the ? placeholders in the query.
+
+            output_format (str, optional): "pandas" or "arrow". Defaults to "pandas".
+
+        Returns:
+            pd.DataFrame|pyarrow.Table: The result of the query.
+
+        """
+        with self._lock:
+            result = self._con.execute(sql, params or [])
+            return result.fetch_arrow_table() if output_format == "arrow" else result.df()
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _constant_column(value, num_rows):
+    import pyarrow
+
+    return pyarrow.array([value] * num_rows, pyarrow.string())
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Sync the Velkozz Web API datasets into a local DuckDB mirror.")
+    arg_parser.add_argument("path", help="Path of the .duckdb mirror file.")
+    arg_parser.add_argument("datasets", nargs="*", default=None, help=f"Datasets to sync: {', '.join(MIRROR_DATASETS)}.")
+    arg_parser.add_argument("--url", default=os.environ.get("VELKOZZ_URL", "http://localhost:8000"))
+    arg_parser.add_argument("--username", default=os.environ.get("VELKOZZ_USERNAME"))
+    arg_parser.add_argument("--password", default=os.environ.get("VELKOZZ_PASSWORD"))
+    arg_parser.add_argument("--subreddits", nargs="+", default=[], help="Subreddits of the reddit_posts dataset.")
+    arg_parser.add_argument("--market-indices", nargs="+", default=[], help="Indices of the index_composition dataset (eg: spy djia).")
+    arg_parser.add_argument("--full-refresh", action="store_true", help="Ignore the stored watermarks and re-query every record.")
+    args = arg_parser.parse_args()
+
+    partitions = {
+        dataset: dataset_partitions for dataset, dataset_partitions in
+        (("reddit_posts", args.subreddits), ("index_composition", args.market_indices)) if dataset_partitions}
+
+    with VelkozzMirror(args.path, url=args.url, username=args.username, password=args.password) as mirror:
+        sync_counts = mirror.sync(args.datasets or None, partitions, args.full_refresh)
+
+        for dataset, partition_counts in sync_counts.items():
+            for partition, num_records in partition_counts.items():
+                label = f"{dataset}[{partition}]" if partition else dataset
+                print(f"{label:<40} {num_records:>9} records synced, watermark {mirror.get_watermark(dataset, partition)}")
+
+if __name__ == "__main__":
+    main()